@@ -1,11 +1,16 @@
 import psycopg2
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import Dict, List
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from typing import Callable, Dict, Iterator, List, Optional
+import json
 import logging
+import multiprocessing
 import os
 
+from streaming_stats import ReservoirSample, RunningCorrelation
+from metrics import DB_QUERY_SECONDS, timed
+
 # Database connection configuration
 DB_CONFIG = {
     'host': 'localhost',
@@ -21,38 +26,126 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Inputs of each analysis, summarised as (row count, max GameID, max UpdatedAt)
+FINGERPRINT_QUERIES = {
+    'sales_trends': """
+        SELECT COUNT(*), MAX(GameID), MAX(UpdatedAt) FROM Games
+        WHERE ReleaseYear IS NOT NULL
+    """,
+    'genre_popularity': """
+        SELECT COUNT(*), MAX(GameID), MAX(UpdatedAt) FROM Games
+        WHERE ReleaseYear IS NOT NULL
+    """,
+    'score_correlation': """
+        SELECT COUNT(*), MAX(GameID), MAX(UpdatedAt) FROM Games
+        WHERE MetacriticScore IS NOT NULL AND UserScore IS NOT NULL
+    """
+}
+MANIFEST_FILENAME = 'manifest.json'
+
+# Rows per server-side cursor round trip when streaming query results
+ANALYSIS_ITERSIZE = int(os.getenv('ANALYSIS_ITERSIZE', '20000'))
+# Points drawn on the score correlation scatter plot
+SCATTER_SAMPLE_SIZE = int(os.getenv('SCATTER_SAMPLE_SIZE', '5000'))
+
+SCORE_CORRELATION_QUERY = """
+SELECT 
+    Title AS "Title",
+    MetacriticScore AS "MetacriticScore",
+    UserScore AS "UserScore",
+    GlobalSales AS "GlobalSales"
+FROM Games
+WHERE MetacriticScore IS NOT NULL 
+AND UserScore IS NOT NULL
+"""
+
+# Correlation and means computed by Postgres, plus a random sample of rows
+SCORE_STATS_QUERY = """
+SELECT
+    corr(MetacriticScore, UserScore),
+    COUNT(*),
+    AVG(MetacriticScore),
+    AVG(UserScore)
+FROM Games
+WHERE MetacriticScore IS NOT NULL
+AND UserScore IS NOT NULL
+"""
+SCORE_SAMPLE_QUERY = SCORE_CORRELATION_QUERY + "ORDER BY random() LIMIT %(limit)s"
+
+def _plotting():
+    """Import matplotlib/seaborn on first use, so data-only callers never load them"""
+    import matplotlib
+    # Render to files only; also safe in worker processes without a display
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    return plt, sns
+
 class GameDataAnalyzer:
-    def __init__(self):
-        self.conn = psycopg2.connect(**DB_CONFIG)
+    def __init__(self, conn=None):
+        """Use conn when given (e.g. borrowed from a pool), else open a connection.
+
+        A borrowed connection is left open; its owner closes or returns it.
+        """
+        self._owns_conn = conn is None
+        self.conn = conn if conn is not None else psycopg2.connect(**DB_CONFIG)
         
     def __del__(self):
-        if hasattr(self, 'conn'):
+        if getattr(self, '_owns_conn', False) and hasattr(self, 'conn'):
             self.conn.close()
 
-    def query_to_dataframe(self, query: str) -> pd.DataFrame:
-        """Execute SQL query and return results as DataFrame"""
+    def query_to_dataframe(self, query: str, params=None) -> pd.DataFrame:
+        """Execute SQL query with bound parameters and return results as DataFrame"""
         try:
-            return pd.read_sql(query, self.conn)
+            return pd.read_sql(query, self.conn, params=params)
         except Exception as e:
             logger.error(f"Database query error: {e}")
             raise
 
-    def analyze_sales_trends(self) -> Dict:
-        """Analyze sales trends by platform and year"""
+    def iter_query(self, query: str, params=None, itersize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Stream query results as DataFrame chunks of at most itersize rows.
+
+        Rows come from a named (server-side) cursor, so only one chunk is
+        held in memory at a time regardless of the result size.
+        """
+        itersize = itersize or ANALYSIS_ITERSIZE
+        try:
+            with self.conn.cursor(name='analysis_stream') as cursor:
+                cursor.itersize = itersize
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(itersize)
+                    if not rows:
+                        break
+                    columns = [column[0] for column in cursor.description]
+                    yield pd.DataFrame.from_records(rows, columns=columns)
+        except Exception as e:
+            logger.error(f"Database query error: {e}")
+            raise
+        finally:
+            # Ends the transaction holding the cursor, also when the caller stops early
+            self.conn.rollback()
+
+    @timed(DB_QUERY_SECONDS, statement='sales_trends')
+    def sales_trends_frame(self) -> pd.DataFrame:
+        """Total sales per platform and year"""
+        # Reads the pre-aggregated GameRollups (migrations/004) instead of
+        # scanning Games; SalesCount keeps SUM's NULL-when-empty semantics
         query = """
         SELECT 
-            p.PlatformName,
-            EXTRACT(YEAR FROM DATE_TRUNC('year', 
-                   MAKE_DATE(g.ReleaseYear, 1, 1))) AS Year,
-            SUM(g.GlobalSales) AS TotalSales
-        FROM Games g
-        JOIN Platforms p ON g.PlatformID = p.PlatformID
-        WHERE g.ReleaseYear IS NOT NULL
-        GROUP BY p.PlatformName, Year
-        ORDER BY Year, TotalSales DESC
+            p.PlatformName AS "PlatformName",
+            r.ReleaseYear AS "Year",
+            CASE WHEN SUM(r.SalesCount) > 0 THEN SUM(r.SalesSum) END AS "TotalSales"
+        FROM GameRollups r
+        JOIN Platforms p ON r.PlatformID = p.PlatformID
+        GROUP BY p.PlatformName, r.ReleaseYear
+        ORDER BY "Year", "TotalSales" DESC
         """
-        df = self.query_to_dataframe(query)
-        
+        return self.query_to_dataframe(query)
+
+    def plot_sales_trends(self, df: pd.DataFrame, output_dir: str = '') -> str:
+        """Render the sales trends line chart and return its path"""
+        plt, sns = _plotting()
         # Generate visualization
         plt.figure(figsize=(12, 6))
         sns.lineplot(
@@ -66,32 +159,39 @@ class GameDataAnalyzer:
         plt.ylabel('Global Sales (Millions)')
         plt.xticks(rotation=45)
         plt.tight_layout()
-        plt.savefig('sales_trends.png')
+        visualization = os.path.join(output_dir, 'sales_trends.png')
+        plt.savefig(visualization)
         plt.close()
-        
+        return visualization
+
+    def analyze_sales_trends(self, output_dir: str = '') -> Dict:
+        """Analyze sales trends by platform and year"""
+        df = self.sales_trends_frame()
         return {
             'data': df.to_dict('records'),
-            'visualization': 'sales_trends.png'
+            'visualization': self.plot_sales_trends(df, output_dir)
         }
 
-    def analyze_genre_popularity(self) -> Dict:
-        """Analyze genre popularity over time"""
+    @timed(DB_QUERY_SECONDS, statement='genre_popularity')
+    def genre_popularity_frame(self) -> pd.DataFrame:
+        """Game counts and average critic score per genre and year"""
         query = """
         SELECT 
-            gn.GenreName,
-            EXTRACT(YEAR FROM DATE_TRUNC('year', 
-                   MAKE_DATE(g.ReleaseYear, 1, 1))) AS Year,
-            COUNT(*) AS GameCount,
-            AVG(g.MetacriticScore) AS AvgScore
-        FROM Games g
-        JOIN Genres gn ON g.GenreID = gn.GenreID
-        WHERE g.ReleaseYear IS NOT NULL
-        GROUP BY gn.GenreName, Year
-        HAVING COUNT(*) > 3
-        ORDER BY Year, GameCount DESC
+            gn.GenreName AS "GenreName",
+            r.ReleaseYear AS "Year",
+            SUM(r.GameCount) AS "GameCount",
+            SUM(r.CriticSum) / NULLIF(SUM(r.CriticCount), 0) AS "AvgScore"
+        FROM GameRollups r
+        JOIN Genres gn ON r.GenreID = gn.GenreID
+        GROUP BY gn.GenreName, r.ReleaseYear
+        HAVING SUM(r.GameCount) > 3
+        ORDER BY "Year", "GameCount" DESC
         """
-        df = self.query_to_dataframe(query)
-        
+        return self.query_to_dataframe(query)
+
+    def plot_genre_popularity(self, df: pd.DataFrame, output_dir: str = '') -> str:
+        """Render the genre popularity heatmap and return its path"""
+        plt, sns = _plotting()
         # Pivot for heatmap
         pivot_df = df.pivot_table(
             index='GenreName',
@@ -110,30 +210,84 @@ class GameDataAnalyzer:
         )
         plt.title('Genre Popularity Over Time (Game Counts)')
         plt.tight_layout()
-        plt.savefig('genre_popularity.png')
+        visualization = os.path.join(output_dir, 'genre_popularity.png')
+        plt.savefig(visualization)
         plt.close()
-        
+        return visualization
+
+    def analyze_genre_popularity(self, output_dir: str = '') -> Dict:
+        """Analyze genre popularity over time"""
+        df = self.genre_popularity_frame()
         return {
             'data': df.to_dict('records'),
-            'visualization': 'genre_popularity.png'
+            'visualization': self.plot_genre_popularity(df, output_dir)
         }
 
-    def analyze_score_correlation(self) -> Dict:
-        """Analyze correlation between critic and user scores"""
-        query = """
-        SELECT 
-            Title,
-            MetacriticScore,
-            UserScore,
-            GlobalSales
-        FROM Games
-        WHERE MetacriticScore IS NOT NULL 
-        AND UserScore IS NOT NULL
+    @timed(DB_QUERY_SECONDS, statement='score_correlation')
+    def score_correlation_frame(self) -> pd.DataFrame:
+        """Critic and user scores of every game that has both"""
+        return self.query_to_dataframe(SCORE_CORRELATION_QUERY)
+
+    @timed(DB_QUERY_SECONDS, statement='score_correlation_stream')
+    def score_correlation_summary(self, sample_size: Optional[int] = None,
+                                  on_chunk: Optional[Callable[[pd.DataFrame], None]] = None) -> Dict:
+        """Correlation between critic and user scores over all scored games.
+
+        Streams the rows once, keeping only the running correlation and a
+        reservoir sample of rows for plotting; on_chunk sees every chunk,
+        e.g. to write the full data out as it arrives.
         """
-        df = self.query_to_dataframe(query)
-        
-        # Calculate correlation
-        correlation = df[['MetacriticScore', 'UserScore']].corr().iloc[0,1]
+        running = RunningCorrelation()
+        sample = ReservoirSample(sample_size or SCATTER_SAMPLE_SIZE, seed=0)
+        for chunk in self.iter_query(SCORE_CORRELATION_QUERY):
+            chunk = chunk.astype({'MetacriticScore': float, 'UserScore': float, 'GlobalSales': float})
+            running.update(chunk['MetacriticScore'], chunk['UserScore'])
+            sample.update(chunk)
+            if on_chunk:
+                on_chunk(chunk)
+        return {
+            'correlation': running.correlation,
+            'count': running.count,
+            'critic_mean': running.x.mean,
+            'user_mean': running.y.mean,
+            'sample': sample.frame
+        }
+
+    @timed(DB_QUERY_SECONDS, statement='score_correlation_stats')
+    def score_correlation_stats(self, sample_size: Optional[int] = None) -> Dict:
+        """Same result as score_correlation_summary, computed by Postgres.
+
+        Only the aggregates and the sample rows leave the database, so
+        request-time callers don't stream every scored game through Python.
+        """
+        with self.conn.cursor() as cursor:
+            cursor.execute(SCORE_STATS_QUERY)
+            correlation, count, critic_mean, user_mean = cursor.fetchone()
+        sample = self.query_to_dataframe(SCORE_SAMPLE_QUERY, {'limit': sample_size or SCATTER_SAMPLE_SIZE})
+        self.conn.rollback()
+        return {
+            'correlation': correlation,
+            'count': count,
+            'critic_mean': critic_mean,
+            'user_mean': user_mean,
+            'sample': sample.astype({'MetacriticScore': float, 'UserScore': float, 'GlobalSales': float})
+        }
+
+    @staticmethod
+    def score_correlation(df: pd.DataFrame) -> float:
+        """Pearson correlation between critic and user scores"""
+        return df[['MetacriticScore', 'UserScore']].astype(float).corr().iloc[0,1]
+
+    def plot_score_correlation(self, df: pd.DataFrame, output_dir: str = '',
+                               correlation: Optional[float] = None) -> str:
+        """Render the critic vs user score scatter plot and return its path.
+
+        df may be a sample of the games; pass the correlation over all of
+        them to title the plot with it.
+        """
+        if correlation is None:
+            correlation = self.score_correlation(df)
+        plt, sns = _plotting()
         
         # Generate visualization
         plt.figure(figsize=(10, 6))
@@ -145,49 +299,219 @@ class GameDataAnalyzer:
         )
         plt.title(f'Critic vs User Scores (Correlation: {correlation:.2f})')
         plt.tight_layout()
-        plt.savefig('score_correlation.png')
+        visualization = os.path.join(output_dir, 'score_correlation.png')
+        plt.savefig(visualization)
         plt.close()
-        
+        return visualization
+
+    def analyze_score_correlation(self, output_dir: str = '') -> Dict:
+        """Analyze correlation between critic and user scores.
+
+        'data' holds a uniform sample of at most SCATTER_SAMPLE_SIZE games;
+        'count' is the number of games the correlation covers.
+        """
+        summary = self.score_correlation_summary()
         return {
-            'correlation': correlation,
-            'data': df.to_dict('records'),
-            'visualization': 'score_correlation.png'
+            'correlation': summary['correlation'],
+            'count': summary['count'],
+            'data': summary['sample'].to_dict('records'),
+            'visualization': self.plot_score_correlation(
+                summary['sample'], output_dir, summary['correlation'])
         }
 
-    def export_analysis_results(self, output_dir: str = 'analysis_results'):
-        """Run all analyses and export results"""
+    @timed(DB_QUERY_SECONDS, statement='data_fingerprint')
+    def data_fingerprint(self, name: str) -> str:
+        """Summary of an analysis's input rows; changes whenever they change"""
+        with self.conn.cursor() as cursor:
+            cursor.execute(FINGERPRINT_QUERIES[name])
+            count, max_id, max_updated = cursor.fetchone()
+        self.conn.rollback()
+        return f"{count}:{max_id}:{max_updated.isoformat() if max_updated else None}"
+
+    def export_analysis_results(self, output_dir: str = 'analysis_results',
+                                max_workers: Optional[int] = None, force: bool = False,
+                                data_format: str = 'parquet'):
+        """Run all analyses and export results.
+
+        Analyses whose input fingerprint matches the previous export are
+        skipped and keep their artifacts. The rest run concurrently in
+        separate processes, since matplotlib rendering is CPU-bound and
+        not thread-safe. Data is written in data_format (parquet, feather
+        or csv) straight from each query's DataFrame.
+        """
+        if data_format not in DATA_WRITERS:
+            raise ValueError(f"Unsupported data format: {data_format}")
         os.makedirs(output_dir, exist_ok=True)
-        
-        analyses = {
-            'sales_trends': self.analyze_sales_trends,
-            'genre_popularity': self.analyze_genre_popularity,
-            'score_correlation': self.analyze_score_correlation
-        }
+        manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+        try:
+            with open(manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            manifest = {}
         
         results = {}
-        for name, analysis_func in analyses.items():
-            try:
-                logger.info(f"Running analysis: {name}")
-                results[name] = analysis_func()
-                
-                # Save data to CSV
-                pd.DataFrame(results[name]['data']).to_csv(
-                    f"{output_dir}/{name}.csv",
-                    index=False
-                )
-                
-            except Exception as e:
-                logger.error(f"Error in {name} analysis: {e}")
-                continue
-                
+        pending = {}
+        for name in ANALYSES:
+            fingerprint = self.data_fingerprint(name)
+            previous = manifest.get(name, {})
+            artifacts = [previous.get('data_file'), previous.get('visualization')]
+            if (not force and previous.get('fingerprint') == fingerprint
+                    and previous.get('format') == data_format
+                    and all(path and os.path.exists(path) for path in artifacts)):
+                logger.info(f"Skipping analysis {name}: data unchanged")
+                results[name] = {**previous, 'skipped': True}
+            else:
+                pending[name] = fingerprint
+        
+        if pending:
+            # Spawned workers open their own connections instead of inheriting this one
+            with ProcessPoolExecutor(max_workers=max_workers or len(pending),
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                futures = {
+                    name: executor.submit(run_analysis, name, output_dir, data_format)
+                    for name in pending
+                }
+                for name, future in futures.items():
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        logger.error(f"Error in {name} analysis: {e}")
+                        manifest.pop(name, None)
+                        continue
+                    manifest[name] = {
+                        'fingerprint': pending[name],
+                        'format': data_format,
+                        'data_file': results[name]['data_file'],
+                        'visualization': results[name]['visualization']
+                    }
+        
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
         return results
 
+# Analyses run by export_analysis_results; each name has matching
+# <name>_frame and plot_<name> methods on GameDataAnalyzer
+ANALYSES = ['sales_trends', 'genre_popularity', 'score_correlation']
+
+def columnar_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Prepare a query result for columnar storage.
+
+    Columns of Decimal values (NUMERIC in Postgres) become floats and
+    repetitive string columns become categoricals, which Parquet/Feather
+    store dictionary-encoded. Strings that merely look numeric, like a
+    "1942" title, stay strings.
+    """
+    columns = {}
+    for column in df.columns[df.dtypes == object]:
+        values = df[column]
+        present = values.dropna()
+        if len(present) and all(isinstance(value, Decimal) for value in present):
+            columns[column] = values.astype(float)
+        elif values.nunique() <= len(values) // 2:
+            columns[column] = values.astype('category')
+    return df.assign(**columns)
+
+def columnar_json(df: pd.DataFrame) -> Dict:
+    """A frame as {'columns': [...], 'data': {column: [values]}} for JSON responses.
+
+    One array per column instead of one dict per row keeps key names out
+    of every row; decimals become floats and NaN becomes null.
+    """
+    df = columnar_frame(df)
+    return {
+        'columns': list(df.columns),
+        'data': {
+            column: df[column].astype(object).where(df[column].notna(), None).tolist()
+            for column in df.columns
+        }
+    }
+
+DATA_WRITERS = {
+    'parquet': lambda df, path: columnar_frame(df).to_parquet(path, index=False),
+    'feather': lambda df, path: columnar_frame(df).reset_index(drop=True).to_feather(path),
+    'csv': lambda df, path: df.to_csv(path, index=False)
+}
+
+class ChunkedDataWriter:
+    """Appends DataFrame chunks to a single Parquet, Feather or CSV file.
+
+    The schema is fixed by the first chunk; later chunks are cast to it.
+    """
+    def __init__(self, path: str, data_format: str):
+        if data_format not in DATA_WRITERS:
+            raise ValueError(f"Unsupported data format: {data_format}")
+        self.path = path
+        self.data_format = data_format
+        self.rows = 0
+        self._writer = None
+        self._schema = None
+
+    def write(self, chunk: pd.DataFrame):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        if self.data_format == 'csv':
+            chunk.to_csv(self.path, mode='a' if self.rows else 'w', header=not self.rows, index=False)
+        else:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._writer is None:
+                self._schema = table.schema
+                if self.data_format == 'parquet':
+                    self._writer = pq.ParquetWriter(self.path, self._schema)
+                else:
+                    # Feather v2 is the Arrow IPC file format
+                    self._writer = pa.ipc.new_file(self.path, self._schema)
+            self._writer.write_table(table.cast(self._schema))
+        self.rows += len(chunk)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        elif not self.rows:
+            DATA_WRITERS[self.data_format](pd.DataFrame(), self.path)
+
+def run_analysis(name: str, output_dir: str, data_format: str = 'parquet') -> Dict:
+    """Run one analysis in a worker process and save its data.
+
+    Only file paths and summary values are returned, so the frame is
+    never pickled back to the parent process.
+    """
+    logger.info(f"Running analysis: {name}")
+    analyzer = GameDataAnalyzer()
+    data_file = os.path.join(output_dir, f"{name}.{data_format}")
+    if name == 'score_correlation':
+        # One pass over every scored game: stream rows to disk while
+        # keeping only running statistics and a sample for the plot
+        writer = ChunkedDataWriter(data_file, data_format)
+        try:
+            summary = analyzer.score_correlation_summary(on_chunk=writer.write)
+        finally:
+            writer.close()
+        return {
+            'rows': summary['count'],
+            'correlation': summary['correlation'],
+            'visualization': analyzer.plot_score_correlation(
+                summary['sample'], output_dir, summary['correlation']),
+            'data_file': data_file
+        }
+
+    df = getattr(analyzer, f"{name}_frame")()
+    result = {
+        'rows': len(df),
+        'visualization': getattr(analyzer, f"plot_{name}")(df, output_dir),
+        'data_file': data_file
+    }
+    
+    # Write straight from the query DataFrame, no per-record dicts
+    DATA_WRITERS[data_format](df, data_file)
+    return result
+
 if __name__ == "__main__":
     analyzer = GameDataAnalyzer()
     analysis_results = analyzer.export_analysis_results()
     
     print("Analysis completed. Results saved to:")
     for analysis_name, result in analysis_results.items():
-        print(f"- {analysis_name}:")
-        print(f"  Data: analysis_results/{analysis_name}.csv")
+        status = " (unchanged, skipped)" if result.get('skipped') else ""
+        print(f"- {analysis_name}{status}:")
+        print(f"  Data: {result['data_file']}")
         print(f"  Visualization: {result['visualization']}")
\ No newline at end of file
@@ -1,12 +1,26 @@
-from flask import Flask, request, jsonify
+from flask import Flask, g, request, jsonify
 from flask_cors import CORS
+from flask_compress import Compress
 import psycopg2
-import pandas as pd
-import joblib
+from psycopg2.extras import execute_values
 import logging
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import os
 from dotenv import load_dotenv
+from db_pool import ConnectionPool, NotificationListener, create_pool
+from cache import TTLCache
+from micro_batch import MicroBatcher
+from model_registry import ModelRegistry
+from bulk_ingest import (GAME_COLUMNS, BulkFormatError, chunked, iter_records, until_format_error,
+                         validate_game_row)
+from game_listing import ListingQueryError, build_listing_query
+from title_search import TitleMatcher
+from metrics import DB_QUERY_SECONDS, REGISTRY, timed
+import hashlib
+import json
+import re
+import threading
+import time
 
 # Load environment variables
 load_dotenv()
@@ -14,6 +28,10 @@ load_dotenv()
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app)
+# Compress JSON responses with brotli or gzip, per Accept-Encoding
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+Compress(app)
 
 # Configure logging
 logging.basicConfig(
@@ -32,144 +50,773 @@ DB_CONFIG = {
 
 # ML Model configuration
 MODEL_PATH = os.path.join(os.path.dirname(__file__), 'models', 'sales_predictor.pkl')
+MODEL_REGISTRY_DIR = os.getenv('MODEL_REGISTRY_DIR', os.path.join(os.path.dirname(__file__), 'models', 'registry'))
+# Memory-map model arrays so worker processes share them
+MODEL_MMAP = os.getenv('MODEL_MMAP', '1') == '1'
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+
+# Prediction cache: results keyed on canonical features and model version
+PREDICTION_CACHE_SIZE = int(os.getenv('PREDICTION_CACHE_SIZE', 10000))
+PREDICTION_CACHE_TTL = float(os.getenv('PREDICTION_CACHE_TTL', 3600))
+MODEL_CHECK_INTERVAL = float(os.getenv('MODEL_CHECK_INTERVAL', 1))
+
+# Micro-batching of concurrent /api/predict calls
+PREDICT_BATCH_MAX = int(os.getenv('PREDICT_BATCH_MAX', 64))
+PREDICT_BATCH_WAIT_MS = float(os.getenv('PREDICT_BATCH_WAIT_MS', 5))
+PREDICT_BATCH_LIMIT = int(os.getenv('PREDICT_BATCH_LIMIT', 10000))
+
+# Lookup cache configuration
+LOOKUP_CACHE_TTL = float(os.getenv('LOOKUP_CACHE_TTL', 300))
+LOOKUP_CACHE_LISTEN = os.getenv('LOOKUP_CACHE_LISTEN', '1') == '1'
+
+# Warm the pool, model and title index in the background at import. Off
+# by default so importing app (tests, scripts, benchmarks) connects to
+# nothing; warmup then starts on the first request. Deployments opt in.
+WARMUP_ON_START = os.getenv('WARMUP_ON_START', '0') == '1'
+# Backoff bounds in seconds for retrying failed warmup steps
+WARMUP_RETRY_MIN = float(os.getenv('WARMUP_RETRY_MIN', 1))
+WARMUP_RETRY_MAX = float(os.getenv('WARMUP_RETRY_MAX', 60))
+
+# Analytics response cache, dropped whenever Games changes
+ANALYTICS_CACHE_TTL = float(os.getenv('ANALYTICS_CACHE_TTL', 3600))
+ANALYTICS_CACHE_LISTEN = os.getenv('ANALYTICS_CACHE_LISTEN', '1') == '1'
+
+# Bulk ingestion: rows per validation batch and per transaction
+BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', 5000))
+
+# Game listing page sizes
+LISTING_DEFAULT_LIMIT = int(os.getenv('LISTING_DEFAULT_LIMIT', 50))
+LISTING_MAX_LIMIT = int(os.getenv('LISTING_MAX_LIMIT', 500))
+
+# Title search: in-process typeahead index refreshed after TITLE_INDEX_TTL seconds
+TITLE_INDEX_TTL = float(os.getenv('TITLE_INDEX_TTL', 300))
+SEARCH_MAX_LIMIT = int(os.getenv('SEARCH_MAX_LIMIT', 100))
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    'http_request_duration_seconds', 'Request latency per route', ['route', 'method'])
+HTTP_RESPONSES = REGISTRY.counter(
+    'http_responses_total', 'Responses per route and status', ['route', 'method', 'status'])
+MODEL_INFERENCE_SECONDS = REGISTRY.histogram(
+    'model_inference_duration_seconds', 'Vectorized model call latency', ['version'])
+MODEL_BATCH_ROWS = REGISTRY.histogram(
+    'model_inference_batch_rows', 'Rows per model call, after cache hits',
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 1024, 4096))
+
+BULK_INSERT_SQL = (
+    f"INSERT INTO Games ({', '.join(column for column, _ in GAME_COLUMNS)}) "
+    "VALUES %s RETURNING GameID"
+)
 
 class DatabaseManager:
     """Handles all database operations"""
-    def __init__(self):
-        self.conn = psycopg2.connect(**DB_CONFIG)
-        self.cursor = self.conn.cursor()
+    def __init__(self, pool: Optional[ConnectionPool] = None):
+        self._pool = pool
+        self._pool_lock = threading.Lock()
+    
+    @property
+    def pool(self) -> ConnectionPool:
+        """The connection pool, connected on first use rather than at import"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = create_pool(DB_CONFIG)
+        return self._pool
+    
+    @property
+    def connected(self) -> bool:
+        return self._pool is not None
         
     def __del__(self):
-        if hasattr(self, 'conn'):
-            self.conn.close()
+        if getattr(self, '_pool', None) is not None:
+            self._pool.close()
+    
+    def _fetch_all(self, query: str, params: tuple = None) -> list:
+        """Run a read-only query on a pooled connection"""
+        def fetch(cursor):
+            cursor.execute(query, params)
+            return cursor.fetchall()
+        return self.pool.run(fetch)
     
+    @timed(DB_QUERY_SECONDS, statement='get_developers')
     def get_developers(self) -> list:
         """Fetch all developers from database"""
-        self.cursor.execute("SELECT DeveloperID, DeveloperName FROM Developers ORDER BY DeveloperName")
-        return [{'id': row[0], 'name': row[1]} for row in self.cursor.fetchall()]
+        rows = self._fetch_all("SELECT DeveloperID, DeveloperName FROM Developers ORDER BY DeveloperName")
+        return [{'id': row[0], 'name': row[1]} for row in rows]
     
+    @timed(DB_QUERY_SECONDS, statement='get_publishers')
     def get_publishers(self) -> list:
         """Fetch all publishers from database"""
-        self.cursor.execute("SELECT PublisherID, PublisherName FROM Publishers ORDER BY PublisherName")
-        return [{'id': row[0], 'name': row[1]} for row in self.cursor.fetchall()]
+        rows = self._fetch_all("SELECT PublisherID, PublisherName FROM Publishers ORDER BY PublisherName")
+        return [{'id': row[0], 'name': row[1]} for row in rows]
     
+    @timed(DB_QUERY_SECONDS, statement='get_platforms')
     def get_platforms(self) -> list:
         """Fetch all platforms from database"""
-        self.cursor.execute("SELECT PlatformID, PlatformName FROM Platforms ORDER BY PlatformName")
-        return [{'id': row[0], 'name': row[1]} for row in self.cursor.fetchall()]
+        rows = self._fetch_all("SELECT PlatformID, PlatformName FROM Platforms ORDER BY PlatformName")
+        return [{'id': row[0], 'name': row[1]} for row in rows]
     
+    @timed(DB_QUERY_SECONDS, statement='get_genres')
     def get_genres(self) -> list:
         """Fetch all genres from database"""
-        self.cursor.execute("SELECT GenreID, GenreName FROM Genres ORDER BY GenreName")
-        return [{'id': row[0], 'name': row[1]} for row in self.cursor.fetchall()]
+        rows = self._fetch_all("SELECT GenreID, GenreName FROM Genres ORDER BY GenreName")
+        return [{'id': row[0], 'name': row[1]} for row in rows]
+    
+    @timed(DB_QUERY_SECONDS, statement='list_games')
+    def list_games(self, args: Dict[str, str]) -> Dict:
+        """One keyset page of games matching the request's filters"""
+        query, params, fields, limit = build_listing_query(args, LISTING_DEFAULT_LIMIT, LISTING_MAX_LIMIT)
+        rows = self._fetch_all(query, tuple(params))
+        games = [dict(zip(fields, row)) for row in rows[:limit]]
+        return {
+            'games': games,
+            'next_cursor': games[-1]['game_id'] if len(rows) > limit else None
+        }
     
+    @timed(DB_QUERY_SECONDS, statement='insert_game')
     def insert_game(self, game_data: Dict) -> Optional[int]:
         """Insert new game record into database"""
         try:
-            self.cursor.execute("""
-                INSERT INTO Games (
-                    Title, ReleaseYear, DeveloperID, PublisherID, 
-                    PlatformID, GenreID, MetacriticScore, UserScore, GlobalSales
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING GameID
-            """, (
-                game_data['title'],
-                game_data['release_year'],
-                game_data.get('developer_id'),
-                game_data.get('publisher_id'),
-                game_data['platform_id'],
-                game_data['genre_id'],
-                game_data.get('metacritic_score'),
-                game_data.get('user_score'),
-                game_data.get('global_sales')
-            ))
-            game_id = self.cursor.fetchone()[0]
-            self.conn.commit()
-            return game_id
+            with self.pool.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO Games (
+                        Title, ReleaseYear, DeveloperID, PublisherID, 
+                        PlatformID, GenreID, MetacriticScore, UserScore, GlobalSales
+                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    RETURNING GameID
+                """, (
+                    game_data['title'],
+                    game_data['release_year'],
+                    game_data.get('developer_id'),
+                    game_data.get('publisher_id'),
+                    game_data['platform_id'],
+                    game_data['genre_id'],
+                    game_data.get('metacritic_score'),
+                    game_data.get('user_score'),
+                    game_data.get('global_sales')
+                ))
+                return cursor.fetchone()[0]
         except Exception as e:
             logger.error(f"Error inserting game: {e}")
-            self.conn.rollback()
             return None
 
+    @timed(DB_QUERY_SECONDS, statement='insert_games_bulk')
+    def insert_games_bulk(self, records, chunk_size: int = BULK_CHUNK_SIZE,
+                          on_insert: Optional[Callable[[List[Tuple[int, Dict]]], None]] = None) -> Dict:
+        """Insert many game records in chunked transactions.
+
+        Each chunk is validated, then written with a single multi-row
+        INSERT. If the database rejects a chunk, its rows are retried one by
+        one under savepoints so only the offending rows are reported. If the
+        body becomes unreadable part-way, earlier chunks stay committed and
+        the report ends with an error at the unreadable row. on_insert is
+        called once per chunk with the (GameID, fields) of its inserted games.
+        """
+        inserted, errors = [], []
+        offset = 0
+        for chunk in chunked(until_format_error(records, errors), chunk_size):
+            rows, indexes = [], []
+            for position, record in enumerate(chunk, start=offset):
+                row, error = validate_game_row(record)
+                if error:
+                    errors.append({'index': position, 'error': error})
+                else:
+                    rows.append(row)
+                    indexes.append(position)
+            offset += len(chunk)
+            if not rows:
+                continue
+            try:
+                with self.pool.cursor() as cursor:
+                    game_ids = execute_values(
+                        cursor, BULK_INSERT_SQL, rows,
+                        page_size=len(rows), fetch=True
+                    )
+                chunk_inserted = [
+                    (index, row, game_id[0]) for index, row, game_id in zip(indexes, rows, game_ids)
+                ]
+            except psycopg2.DatabaseError as e:
+                logger.warning(f"Bulk chunk rejected ({e}), retrying row by row")
+                chunk_inserted, chunk_errors = self._insert_rows_individually(rows, indexes)
+                errors.extend(chunk_errors)
+            inserted.extend({'index': index, 'game_id': game_id} for index, _, game_id in chunk_inserted)
+            if on_insert and chunk_inserted:
+                fields = [field for _, field in GAME_COLUMNS]
+                on_insert([(game_id, dict(zip(fields, row))) for _, row, game_id in chunk_inserted])
+        errors.sort(key=lambda error: error['index'])
+        return {'inserted': inserted, 'errors': errors}
+
+    def _insert_rows_individually(self, rows: list, indexes: list):
+        """Insert rows one at a time under savepoints, collecting failures.
+
+        Returns ([(index, row, game_id)], [error]).
+        """
+        inserted, errors = [], []
+        with self.pool.cursor() as cursor:
+            for index, row in zip(indexes, rows):
+                cursor.execute("SAVEPOINT bulk_row")
+                try:
+                    execute_values(cursor, BULK_INSERT_SQL, [row])
+                    inserted.append((index, row, cursor.fetchone()[0]))
+                    cursor.execute("RELEASE SAVEPOINT bulk_row")
+                except psycopg2.DatabaseError as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT bulk_row")
+                    errors.append({'index': index, 'error': str(e).strip()})
+        return inserted, errors
+
+# Model inputs in the column order the model was trained on
+FEATURE_COLUMNS = ['genre', 'platform', 'score']
+
 class PredictionModel:
-    """Handles sales predictions using ML model"""
-    def __init__(self, model_path: str):
+    """Handles sales predictions using ML model.
+
+    The model comes from the registry's active version, falling back to the
+    single file at model_path. A watcher thread notices when either source
+    changes, loads the new model in the background and swaps it in as one
+    (version, model) tuple, so in-flight requests keep the model they began
+    with and nothing waits on a load. Nothing is loaded until start() is
+    called, by the warmup hook or the first prediction.
+    """
+    def __init__(self, model_path: str, registry: Optional[ModelRegistry] = None):
+        self.model_path = model_path
+        self.registry = registry
+        self.cache = TTLCache(maxsize=PREDICTION_CACHE_SIZE, ttl=PREDICTION_CACHE_TTL)
+        self._active = (None, None)
+        self._failed_version = None
+        self._reload_lock = threading.Lock()
+        self._started = False
+        self._start_lock = threading.Lock()
+    
+    def start(self):
+        """Load the model and start the source watcher, once"""
+        if self._started:
+            return
+        with self._start_lock:
+            if self._started:
+                return
+            self.reload()
+            threading.Thread(target=self._watch, name='model-watcher', daemon=True).start()
+            self._started = True
+    
+    @property
+    def started(self) -> bool:
+        return self._started
+    
+    @property
+    def version(self) -> Optional[str]:
+        return self._active[0]
+    
+    @property
+    def model(self):
+        return self._active[1]
+    
+    def _source_version(self) -> Optional[str]:
+        """Version the model source currently points at"""
+        if self.registry:
+            version = self.registry.current_version()
+            if version:
+                return version
         try:
-            self.model = joblib.load(model_path)
-            logger.info("ML model loaded successfully")
-        except Exception as e:
-            logger.error(f"Failed to load ML model: {e}")
-            self.model = None
+            stat = os.stat(self.model_path)
+        except OSError:
+            return None
+        # Legacy single-file model: identify contents by mtime and size
+        return f"file:{stat.st_mtime_ns}-{stat.st_size}"
     
-    def predict_sales(self, features: Dict) -> Dict:
-        """Predict game sales based on input features"""
-        if not self.model:
-            return {'error': 'Model not available'}
+    def reload(self, force: bool = False) -> bool:
+        """Load the source's current model and swap it in; keep the old one on failure"""
+        with self._reload_lock:
+            version = self._source_version()
+            if version is None:
+                logger.error(f"Failed to load ML model: no model at {self.model_path} or in the registry")
+                return False
+            if not force and version in (self.version, self._failed_version):
+                return False
+            try:
+                mmap_mode = 'r' if MODEL_MMAP else None
+                if version.startswith('file:'):
+                    import joblib
+                    model = joblib.load(self.model_path, mmap_mode=mmap_mode)
+                else:
+                    model = self.registry.load(version, mmap=MODEL_MMAP)
+            except Exception as e:
+                logger.error(f"Failed to load ML model {version}: {e}")
+                self._failed_version = version
+                return False
+            self._active = (version, model)
+            self._failed_version = None
+            self.cache.invalidate()
+            logger.info(f"ML model {version} loaded successfully")
+            return True
+    
+    def reload_in_background(self, force: bool = False):
+        threading.Thread(target=self.reload, args=(force,), name='model-reload', daemon=True).start()
+    
+    def _watch(self):
+        while True:
+            time.sleep(MODEL_CHECK_INTERVAL)
+            try:
+                if self._source_version() not in (self.version, self._failed_version):
+                    logger.info("Model source changed, reloading")
+                    self.reload()
+            except Exception as e:
+                logger.error(f"Model watcher error: {e}")
+    
+    @staticmethod
+    def canonical_features(features: Dict) -> Optional[tuple]:
+        """Normalize features to a hashable tuple, or None if they cannot be"""
+        try:
+            return (
+                str(features['genre']).strip(),
+                str(features['platform']).strip(),
+                round(float(features['score']), 1)
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+    
+    @staticmethod
+    def _model_input(model, rows: List[Dict]):
+        """Build the feature matrix for a batch in FEATURE_COLUMNS order"""
+        import numpy as np
+        matrix = np.array([[row[column] for column in FEATURE_COLUMNS] for row in rows], dtype=object)
+        if hasattr(model, 'feature_names_in_'):
+            # Models fitted on a DataFrame check column names, so wrap the
+            # whole batch once instead of building a frame per row
+            import pandas as pd
+            return pd.DataFrame(matrix, columns=FEATURE_COLUMNS)
+        return matrix
+    
+    def predict_batch(self, rows: List[Dict]) -> List[Dict]:
+        """Predict sales for many feature rows, serving repeats from cache.
+
+        Rows are canonicalized and looked up in a cache keyed on the model
+        version; only the misses reach the model, in one vectorized call.
+        """
+        self.start()
+        # One snapshot per batch, so a concurrent swap cannot mix models
+        version, model = self._active
+        results = [None] * len(rows)
+        misses, miss_rows = [], []
+        for index, row in enumerate(rows):
+            key = self.canonical_features(row)
+            cached = self.cache.get((version, key)) if key is not None else None
+            if cached is not None:
+                results[index] = cached
+                continue
+            misses.append((index, key))
+            miss_rows.append(dict(zip(FEATURE_COLUMNS, key)) if key is not None else row)
+        if miss_rows:
+            MODEL_BATCH_ROWS.observe(len(miss_rows))
+            with MODEL_INFERENCE_SECONDS.time(version=version):
+                scored = self._score(model, miss_rows)
+            for (index, key), result in zip(misses, scored):
+                results[index] = result
+                if key is not None and 'error' not in result:
+                    self.cache.set((version, key), result)
+        return results
+    
+    def cache_stats(self) -> Dict:
+        """Prediction cache counters and the model version they apply to"""
+        return {**self.cache.stats(), 'model_version': self.version}
+    
+    def _score(self, model, rows: List[Dict]) -> List[Dict]:
+        """Run the model on a batch of feature rows with one vectorized call.
+
+        If the vectorized call fails, rows are retried one at a time so a
+        single bad row only fails itself.
+        """
+        if not model:
+            return [{'error': 'Model not available'} for _ in rows]
         
         try:
-            # Prepare feature vector
-            feature_df = pd.DataFrame([features])
-            
-            # Make prediction
-            prediction = self.model.predict(feature_df)[0]
-            confidence = self.model.predict_proba(feature_df)[0]
-            
-            return {
-                'prediction': float(prediction),
-                'confidence': float(max(confidence)),
-                'lower_bound': float(prediction * 0.85),
-                'upper_bound': float(prediction * 1.15)
-            }
+            features = self._model_input(model, rows)
+            if hasattr(model, 'predict_interval'):
+                # Trained SalesPredictor: calibrated intervals at its nominal coverage
+                predictions, lower, upper = model.predict_interval(features)
+                confidences = [model.coverage] * len(rows)
+            else:
+                # Legacy models without intervals keep the fixed +/-15% band
+                predictions = model.predict(features)
+                lower, upper = predictions * 0.85, predictions * 1.15
+                confidences = (
+                    model.predict_proba(features).max(axis=1)
+                    if hasattr(model, 'predict_proba') else [None] * len(rows)
+                )
+            return [
+                {
+                    'prediction': float(prediction),
+                    'confidence': float(confidence) if confidence is not None else None,
+                    'lower_bound': float(low),
+                    'upper_bound': float(high)
+                }
+                for prediction, confidence, low, high in zip(predictions, confidences, lower, upper)
+            ]
         except Exception as e:
+            if len(rows) > 1:
+                return [self._score(model, [row])[0] for row in rows]
             logger.error(f"Prediction failed: {e}")
-            return {'error': str(e)}
+            return [{'error': str(e)}]
+    
+    def predict_sales(self, features: Dict) -> Dict:
+        """Predict game sales based on input features"""
+        return self.predict_batch([features])[0]
 
 # Initialize services
 db_manager = DatabaseManager()
-prediction_model = PredictionModel(MODEL_PATH)
+prediction_model = PredictionModel(MODEL_PATH, ModelRegistry(MODEL_REGISTRY_DIR))
+prediction_batcher = MicroBatcher(
+    prediction_model.predict_batch,
+    max_batch=PREDICT_BATCH_MAX,
+    max_wait=PREDICT_BATCH_WAIT_MS / 1000
+)
+
+# Dimension tables change rarely, so their lists are served from memory
+LOOKUP_LOADERS = {
+    'developers': db_manager.get_developers,
+    'publishers': db_manager.get_publishers,
+    'platforms': db_manager.get_platforms,
+    'genres': db_manager.get_genres
+}
+lookup_cache = TTLCache(maxsize=len(LOOKUP_LOADERS), ttl=LOOKUP_CACHE_TTL)
+REGISTRY.register_cache('lookups', lookup_cache)
+REGISTRY.register_cache('predictions', prediction_model.cache)
+
+def invalidate_lookups(table: Optional[str] = None):
+    """Drop cached lookup lists for one dimension table, or all of them"""
+    if table in LOOKUP_LOADERS:
+        lookup_cache.invalidate(table)
+    else:
+        lookup_cache.invalidate()
+
+# Flask-Compress appends the encoding to the ETag of responses it compresses
+COMPRESSED_ETAG_SUFFIX = re.compile(r':(?:br|gzip|deflate)$')
+
+def _etag_requested(etag: str) -> bool:
+    """Whether If-None-Match names etag, also as a compressed response's ETag"""
+    if_none_match = request.if_none_match
+    if if_none_match.star_tag:
+        return True
+    return any(COMPRESSED_ETAG_SUFFIX.sub('', tag) == etag for tag in if_none_match.as_set(include_weak=True))
+
+def cached_json_response(cache: TTLCache, key, build):
+    """Serve a JSON body from cache with ETag / If-None-Match support"""
+    def encode():
+        body = json.dumps(build()).encode('utf-8')
+        return body, hashlib.sha1(body).hexdigest()
+    body, etag = cache.get_or_set(key, encode)
+    if _etag_requested(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def lookup_response(table: str):
+    """Serve a cached lookup list"""
+    return cached_json_response(lookup_cache, table, LOOKUP_LOADERS[table])
+
+def _json_number(value) -> Optional[float]:
+    """JSON has no NaN; statistics over no rows become null"""
+    return None if value is None or value != value else float(value)
+
+def compute_analytics(name: str) -> Dict:
+    """Compute one analysis on a pooled connection, without any plotting"""
+    # pandas and the analysis module load on the first analytics request
+    from analysis import GameDataAnalyzer, columnar_json
+    with db_manager.pool.connection() as conn:
+        analyzer = GameDataAnalyzer(conn)
+        if name == 'score-correlation':
+            summary = analyzer.score_correlation_stats()
+            return {
+                'correlation': _json_number(summary['correlation']),
+                'count': summary['count'],
+                'critic_mean': _json_number(summary['critic_mean']) if summary['count'] else None,
+                'user_mean': _json_number(summary['user_mean']) if summary['count'] else None,
+                'sample': columnar_json(summary['sample'])
+            }
+        if name == 'sales-trends':
+            return columnar_json(analyzer.sales_trends_frame())
+        return columnar_json(analyzer.genre_popularity_frame())
+
+ANALYTICS = ['sales-trends', 'genre-popularity', 'score-correlation']
+analytics_cache = TTLCache(maxsize=len(ANALYTICS), ttl=ANALYTICS_CACHE_TTL)
+REGISTRY.register_cache('analytics', analytics_cache)
+
+def invalidate_analytics(_operation: Optional[str] = None):
+    analytics_cache.invalidate()
+
+def on_games_changed(operation: Optional[str] = None):
+    invalidate_analytics(operation)
+    # Refreshes only pick up added and updated games; None means
+    # notifications may have been missed while reconnecting
+    if operation in (None, 'DELETE'):
+        title_matcher.invalidate()
+
+# Typeahead index over all titles, built off the request path
+title_matcher = TitleMatcher()
+
+def _load_titles(load):
+    with DB_QUERY_SECONDS.time(statement='load_titles'):
+        db_manager.pool.run(load)
+
+def complete_titles(prefix: str, limit: int) -> list:
+    """Prefix matches from the in-process index, refreshed in the background when stale"""
+    if time.time() - title_matcher.loaded_at > TITLE_INDEX_TTL:
+        title_matcher.load_in_background(_load_titles)
+    return title_matcher.complete(prefix, limit)
+
+def start_listeners():
+    """Subscribe to the change notifications that invalidate in-process caches"""
+    if LOOKUP_CACHE_LISTEN:
+        # Dimension tables notify 'dimension_changed' (migrations/001), so rows
+        # added by the loader or by hand invalidate this process immediately.
+        NotificationListener(DB_CONFIG, 'dimension_changed', invalidate_lookups).start()
+    if ANALYTICS_CACHE_LISTEN:
+        # Games notifies 'games_changed' (migrations/008) on every write,
+        # including the loader's and bulk imports from other processes
+        NotificationListener(DB_CONFIG, 'games_changed', on_games_changed).start()
+
+# Warmup progress per component: pending, ready or the error that stopped it
+warmup_status = {'database': 'pending', 'model': 'pending', 'title_index': 'pending'}
+_warmup_started = threading.Event()
+_warmup_done = threading.Event()
+
+def warmup():
+    """Do the work the first requests would otherwise wait for.
+
+    Every step also happens lazily on first use, so a failed step only
+    means that work is left to the request that needs it. Failed steps
+    are retried with exponential backoff until they succeed, so a
+    database that was down at startup doesn't leave the process unready.
+    """
+    pending = {
+        'database': lambda: db_manager.pool.run(lambda cursor: cursor.execute("SELECT 1")),
+        'model': prediction_model.start,
+        'title_index': lambda: _load_titles(title_matcher.load)
+    }
+    started = time.perf_counter()
+    delay = WARMUP_RETRY_MIN
+    while True:
+        for name, step in list(pending.items()):
+            try:
+                step()
+            except Exception as e:
+                logger.error(f"Warmup step {name} failed: {e}")
+                warmup_status[name] = f"failed: {e}"
+                continue
+            warmup_status[name] = 'ready'
+            del pending[name]
+            if name == 'database':
+                start_listeners()
+        if not _warmup_done.is_set():
+            # The model watcher picks up a model published later
+            if prediction_model.version is None and warmup_status['model'] == 'ready':
+                warmup_status['model'] = 'failed: no model available'
+            _warmup_done.set()
+            logger.info(f"Warmup finished in {time.perf_counter() - started:.2f}s: {warmup_status}")
+        if not pending:
+            return
+        logger.info(f"Retrying warmup of {', '.join(pending)} in {delay:.0f}s")
+        time.sleep(delay)
+        delay = min(delay * 2, WARMUP_RETRY_MAX)
+
+def start_warmup():
+    """Run warmup() once, on a background thread"""
+    if _warmup_started.is_set():
+        return
+    _warmup_started.set()
+    threading.Thread(target=warmup, name='warmup', daemon=True).start()
+
+if WARMUP_ON_START:
+    start_warmup()
+
+@app.before_request
+def _start_timer():
+    g.request_started = time.perf_counter()
+    start_warmup()
+
+@app.after_request
+def _record_request(response):
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    started = g.get('request_started')
+    if started is not None:
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, route=route, method=request.method)
+    HTTP_RESPONSES.inc(route=route, method=request.method, status=response.status_code)
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus text-format metrics for this process"""
+    return app.response_class(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/ready', methods=['GET'])
+def readiness():
+    """Readiness probe: 200 once warmup has run and the database has answered.
+
+    A database that was down during warmup turns ready once the retried
+    step gets through.
+    """
+    ready = _warmup_done.is_set() and warmup_status['database'] == 'ready'
+    return jsonify({'ready': ready, 'components': warmup_status}), 200 if ready else 503
 
 # API Endpoints
 @app.route('/api/developers', methods=['GET'])
 def get_developers():
-    return jsonify(db_manager.get_developers())
+    return lookup_response('developers')
 
 @app.route('/api/publishers', methods=['GET'])
 def get_publishers():
-    return jsonify(db_manager.get_publishers())
+    return lookup_response('publishers')
 
 @app.route('/api/platforms', methods=['GET'])
 def get_platforms():
-    return jsonify(db_manager.get_platforms())
+    return lookup_response('platforms')
 
 @app.route('/api/genres', methods=['GET'])
 def get_genres():
-    return jsonify(db_manager.get_genres())
+    return lookup_response('genres')
+
+@app.route('/api/games', methods=['GET'])
+def list_games():
+    """Browse games; pass next_cursor back as ?after= for the next page"""
+    try:
+        return jsonify(db_manager.list_games(request.args))
+    except ListingQueryError as e:
+        return jsonify({'error': str(e)}), 400
 
 @app.route('/api/games', methods=['POST'])
 def add_game():
-    data = request.get_json()
-    
-    required_fields = ['title', 'release_year', 'platform_id', 'genre_id']
-    if not all(field in data for field in required_fields):
-        return jsonify({'error': 'Missing required fields'}), 400
-    
+    # Same checks and coercion as bulk rows, so the title is a string
+    # before anything is written or indexed
+    row, error = validate_game_row(request.get_json(silent=True))
+    if error:
+        return jsonify({'error': error}), 400
+    data = dict(zip((field for _, field in GAME_COLUMNS), row))
+
     game_id = db_manager.insert_game(data)
     if game_id:
+        title_matcher.add(game_id, data)
+        invalidate_analytics()
         return jsonify({'game_id': game_id}), 201
     return jsonify({'error': 'Failed to add game'}), 500
 
+@app.route('/api/games/search', methods=['GET'])
+def search_games():
+    """Title search: ranked full-text/fuzzy matches, or typeahead with mode=prefix"""
+    q = request.args.get('q', '').strip()
+    if not q:
+        return jsonify({'error': 'Missing search query'}), 400
+    try:
+        limit = int(request.args.get('limit', 10 if request.args.get('mode') == 'prefix' else 20))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    if not 1 <= limit <= SEARCH_MAX_LIMIT:
+        return jsonify({'error': f'limit must be between 1 and {SEARCH_MAX_LIMIT}'}), 400
+    
+    # Until the index has loaded, typeahead falls back to the database search
+    if request.args.get('mode') == 'prefix':
+        if title_matcher.ready:
+            return jsonify({'games': complete_titles(q, limit)})
+        title_matcher.load_in_background(_load_titles)
+    with DB_QUERY_SECONDS.time(statement='search_games'):
+        games = db_manager.pool.run(lambda cursor: title_matcher.search(cursor, q, limit))
+    return jsonify({'games': games})
+
+@app.route('/api/games/bulk', methods=['POST'])
+def add_games_bulk():
+    """Insert games from a JSON array, NDJSON or CSV body"""
+    try:
+        records = iter_records(request.stream, request.content_type)
+        # New games show up in typeahead right away, not at the next index refresh
+        report = db_manager.insert_games_bulk(records, on_insert=title_matcher.add_many)
+    except BulkFormatError as e:
+        return jsonify({'error': str(e)}), 400
+    if report['inserted']:
+        invalidate_analytics()
+    
+    if not report['errors']:
+        status = 201
+    elif report['inserted']:
+        status = 207
+    else:
+        status = 400
+    report['inserted_count'] = len(report['inserted'])
+    report['error_count'] = len(report['errors'])
+    return jsonify(report), status
+
+@app.route('/api/analytics/<name>', methods=['GET'])
+def get_analytics(name: str):
+    """Sales trends, genre popularity or score correlation as columnar JSON"""
+    if name not in ANALYTICS:
+        return jsonify({'error': f"Unknown analysis: {name}"}), 404
+    return cached_json_response(analytics_cache, name, lambda: compute_analytics(name))
+
+PREDICT_REQUIRED_FIELDS = ['genre', 'platform', 'score']
+
 @app.route('/api/predict', methods=['POST'])
 def predict_sales():
     data = request.get_json()
     
-    required_fields = ['genre', 'platform', 'score']
-    if not all(field in data for field in required_fields):
+    if not all(field in data for field in PREDICT_REQUIRED_FIELDS):
         return jsonify({'error': 'Missing required fields'}), 400
     
-    prediction = prediction_model.predict_sales(data)
+    # Concurrent single predictions are merged into one model call
+    prediction = prediction_batcher(data)
     if 'error' in prediction:
         return jsonify(prediction), 500
     return jsonify(prediction)
 
+@app.route('/api/predict/batch', methods=['POST'])
+def predict_sales_batch():
+    """Score a list of feature rows with one vectorized model call"""
+    data = request.get_json()
+    rows = data.get('rows') if isinstance(data, dict) else data
+    if not isinstance(rows, list) or not rows:
+        return jsonify({'error': 'Expected a non-empty list of feature rows'}), 400
+    if len(rows) > PREDICT_BATCH_LIMIT:
+        return jsonify({'error': f'At most {PREDICT_BATCH_LIMIT} rows per request'}), 400
+    
+    invalid = [
+        index for index, row in enumerate(rows)
+        if not isinstance(row, dict) or not all(field in row for field in PREDICT_REQUIRED_FIELDS)
+    ]
+    if invalid:
+        return jsonify({'error': 'Missing required fields', 'rows': invalid}), 400
+    
+    return jsonify({'predictions': prediction_model.predict_batch(rows)})
+
+@app.route('/api/predict/cache-stats', methods=['GET'])
+def prediction_cache_stats():
+    return jsonify(prediction_model.cache_stats())
+
+def _is_admin() -> bool:
+    return ADMIN_TOKEN is not None and request.headers.get('X-Admin-Token') == ADMIN_TOKEN
+
+@app.route('/api/admin/model', methods=['GET'])
+def model_status():
+    if not _is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+    registry = prediction_model.registry
+    return jsonify({
+        'active_version': prediction_model.version,
+        'registry_version': registry.current_version(),
+        'versions': registry.versions()
+    })
+
+@app.route('/api/admin/model/reload', methods=['POST'])
+def reload_model():
+    """Activate a registry version (optional) and swap it in the background"""
+    if not _is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+    data = request.get_json(silent=True) or {}
+    if data.get('version'):
+        try:
+            prediction_model.registry.activate(data['version'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    prediction_model.reload_in_background(force=bool(data.get('force')))
+    return jsonify({'status': 'reloading', 'active_version': prediction_model.version}), 202
+
 if __name__ == '__main__':
+    start_warmup()
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,32 @@
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+from benchmarks.generate_data import GENRES, PLATFORMS
+from model_registry import ModelRegistry
+from sales_model import CategoryEncoder, SalesPredictor
+
+
+def build_dummy_model(rows: int = 5000, n_estimators: int = 50, max_depth: int = 10,
+                      seed: int = 42) -> SalesPredictor:
+    """A SalesPredictor fitted on random data over the generator's platforms and genres.
+
+    Its predictions are meaningless, but its size and inference cost are
+    close to a real model's, which is what the prediction benchmarks need.
+    """
+    rng = np.random.default_rng(seed)
+    encoders = {'genre': CategoryEncoder(GENRES), 'platform': CategoryEncoder(PLATFORMS)}
+    X = np.column_stack([
+        rng.integers(0, len(GENRES), rows),
+        rng.integers(0, len(PLATFORMS), rows),
+        rng.uniform(20, 99, rows)
+    ]).astype(np.float32)
+    y = np.clip(X[:, 2] / 20 + rng.lognormal(-1, 1, rows), 0, None).astype(np.float32)
+    regressor = RandomForestRegressor(n_estimators=n_estimators, max_depth=max_depth,
+                                      n_jobs=1, random_state=seed)
+    regressor.fit(X, y)
+    return SalesPredictor(regressor, encoders, residual_quantile=1.0, coverage=0.9)
+
+
+def publish_dummy_model(registry_dir: str) -> str:
+    """Publish and activate a dummy model in a registry directory"""
+    return ModelRegistry(registry_dir).publish(build_dummy_model(), metadata={'benchmark': True})
@@ -0,0 +1,154 @@
+import argparse
+import io
+import json
+import logging
+import os
+import random
+import time
+from typing import Dict, List
+
+import psycopg2
+from dotenv import load_dotenv
+from psycopg2.extras import execute_values
+
+load_dotenv()
+
+# Same settings as app.py, so the benchmarks hit the database the API uses
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'database': os.getenv('DB_NAME', 'gamedb'),
+    'user': os.getenv('DB_USER', 'postgres'),
+    'password': os.getenv('DB_PASSWORD', 'postgres')
+}
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SIZES = {'10k': 10_000, '1M': 1_000_000, '10M': 10_000_000}
+
+PLATFORMS = [
+    'PlayStation 5', 'PlayStation 4', 'PlayStation 3', 'PlayStation 2', 'PlayStation',
+    'Xbox Series X', 'Xbox One', 'Xbox 360', 'Xbox', 'Nintendo Switch', 'Wii U', 'Wii',
+    'GameCube', 'Nintendo 64', 'Nintendo DS', 'Nintendo 3DS', 'Game Boy Advance',
+    'PC', 'Mac', 'Linux', 'iOS', 'Android', 'Dreamcast', 'Saturn', 'Genesis'
+]
+GENRES = [
+    'Action', 'Action-Adventure', 'Adventure', 'Role-Playing', 'Platformer', 'Shooter',
+    'Strategy', 'Simulation', 'Sports', 'Racing', 'Puzzle', 'Fighting', 'Horror',
+    'Stealth', 'Rhythm', 'Sandbox', 'Survival', 'Roguelike', 'MMO', 'Visual Novel'
+]
+TITLE_WORDS = [
+    'Legend', 'Shadow', 'Dragon', 'Star', 'Dark', 'Lost', 'Eternal', 'Crystal', 'Iron',
+    'Kingdom', 'Quest', 'Chronicles', 'Hunter', 'Storm', 'Fallen', 'Rising', 'Empire',
+    'Knight', 'Galaxy', 'Souls', 'Racer', 'Tactics', 'Odyssey', 'Frontier', 'Horizon',
+    'Blade', 'Ghost', 'Neon', 'Wild', 'Last', 'Silent', 'Forgotten', 'Arcade', 'World'
+]
+GAME_COLUMNS = ['Title', 'ReleaseYear', 'DeveloperID', 'PublisherID', 'PlatformID', 'GenreID',
+                'MetacriticScore', 'UserScore', 'GlobalSales']
+
+
+def parse_size(value: str) -> int:
+    """Row count from 10k/1M/10M or a plain integer"""
+    if value in SIZES:
+        return SIZES[value]
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected one of {', '.join(SIZES)} or a row count")
+
+
+def _dimension_ids(cursor, table: str, id_column: str, name_column: str, names: List[str]) -> List[int]:
+    """Upsert dimension names and return their IDs"""
+    rows = execute_values(cursor, f"""
+        INSERT INTO {table} ({name_column}) VALUES %s
+        ON CONFLICT ({name_column}) DO UPDATE SET {name_column} = EXCLUDED.{name_column}
+        RETURNING {id_column}
+    """, [(name,) for name in names], page_size=len(names), fetch=True)
+    return [row[0] for row in rows]
+
+
+def _csv_value(value) -> str:
+    return '' if value is None else str(value)
+
+
+def _game_rows(rng: random.Random, start: int, count: int, ids: Dict[str, List[int]]):
+    for number in range(start, start + count):
+        words = rng.sample(TITLE_WORDS, rng.randint(1, 3))
+        # The number keeps (Title, Platform, Year) unique across runs
+        title = f"{' '.join(words)} {number}"
+        yield (
+            title,
+            rng.randint(1980, 2024) if rng.random() > 0.02 else None,
+            rng.choice(ids['developer']),
+            rng.choice(ids['publisher']),
+            rng.choice(ids['platform']),
+            rng.choice(ids['genre']),
+            round(rng.uniform(20, 99), 1) if rng.random() > 0.3 else None,
+            round(rng.uniform(1, 10), 1) if rng.random() > 0.4 else None,
+            round(min(rng.lognormvariate(-1, 1.2), 99999), 2) if rng.random() > 0.2 else None
+        )
+
+
+def generate(rows: int, seed: int = 42, chunk_size: int = 100_000, reset: bool = False) -> Dict:
+    """Seed the dimension tables and `rows` synthetic games.
+
+    Games are streamed with COPY in chunks, so each chunk is one statement
+    for the rollup and notify triggers. With reset, Games and the dimension
+    tables are truncated first.
+    """
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        with conn.cursor() as cursor:
+            if reset:
+                cursor.execute("TRUNCATE Games, Developers, Publishers, Platforms, Genres, GameRollups "
+                               "RESTART IDENTITY CASCADE")
+            cursor.execute("SELECT COALESCE(MAX(GameID), 0) FROM Games")
+            first_number = cursor.fetchone()[0] + 1
+            ids = {
+                'developer': _dimension_ids(cursor, 'Developers', 'DeveloperID', 'DeveloperName',
+                                            [f"Bench Developer {i:04d}" for i in range(max(50, rows // 5000))]),
+                'publisher': _dimension_ids(cursor, 'Publishers', 'PublisherID', 'PublisherName',
+                                            [f"Bench Publisher {i:04d}" for i in range(max(20, rows // 20000))]),
+                'platform': _dimension_ids(cursor, 'Platforms', 'PlatformID', 'PlatformName', PLATFORMS),
+                'genre': _dimension_ids(cursor, 'Genres', 'GenreID', 'GenreName', GENRES)
+            }
+            conn.commit()
+
+            copy_sql = f"COPY Games ({', '.join(GAME_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+            for start in range(0, rows, chunk_size):
+                count = min(chunk_size, rows - start)
+                buffer = io.StringIO()
+                for row in _game_rows(rng, first_number + start, count, ids):
+                    buffer.write(','.join(
+                        f'"{value}"' if isinstance(value, str) else _csv_value(value) for value in row
+                    ) + '\n')
+                buffer.seek(0)
+                cursor.copy_expert(copy_sql, buffer)
+                conn.commit()
+                logger.info(f"Loaded {start + count} of {rows} games")
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute("ANALYZE")
+    finally:
+        conn.close()
+    return {'rows': rows, 'seed': seed, 'seconds': round(time.perf_counter() - started, 3)}
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Seed Games and its dimensions with synthetic data")
+    parser.add_argument('--rows', type=parse_size, default=SIZES['10k'], help="10k, 1M, 10M or a row count")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-size', type=int, default=100_000, help="Rows per COPY statement")
+    parser.add_argument('--reset', action='store_true',
+                        help="Truncate Games and the dimension tables first (destroys existing data)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print(json.dumps(generate(args.rows, args.seed, args.chunk_size, args.reset), indent=2))
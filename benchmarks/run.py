@@ -0,0 +1,107 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.generate_data import DB_CONFIG, SIZES, generate, parse_size
+
+logger = logging.getLogger(__name__)
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _games_count() -> int:
+    import psycopg2
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM Games")
+            return cursor.fetchone()[0]
+    finally:
+        conn.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    from benchmarks.scenarios import SCENARIOS
+    parser = argparse.ArgumentParser(description="Run the benchmark scenarios and write JSON results")
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument('--generate', type=parse_size, metavar='ROWS',
+                        help=f"Seed this many synthetic games first ({', '.join(SIZES)} or a count)")
+    parser.add_argument('--reset', action='store_true', help="With --generate, truncate existing data first")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--requests', type=int, default=2000, help="Requests per API endpoint / predictions")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=5, help="Timed repetitions for latency scenarios")
+    parser.add_argument('--bulk-rows', type=int, default=20000)
+    parser.add_argument('--loader-titles', type=int, default=500)
+    parser.add_argument('--stub-latency', type=float, default=0.02, help="Seconds added by the stub servers")
+    parser.add_argument('--stub-error-rate', type=float, default=0.02, help="Fraction of stub 429 responses")
+    parser.add_argument('--output', help="Result file (default: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args(argv)
+    args.scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)}")
+    return args
+
+
+def run(args: argparse.Namespace) -> Dict:
+    report = {
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'git_commit': _git_commit(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'options': {key: value for key, value in vars(args).items() if key != 'output'}
+    }
+    if args.generate:
+        report['generate'] = generate(args.generate, args.seed, reset=args.reset)
+    report['games'] = _games_count()
+
+    # The API and prediction scenarios serve a dummy model from a throwaway
+    # registry; app.py reads MODEL_REGISTRY_DIR when first imported
+    from benchmarks.dummy_model import publish_dummy_model
+    args.registry_dir = tempfile.mkdtemp(prefix='bench-registry-')
+    publish_dummy_model(args.registry_dir)
+    os.environ['MODEL_REGISTRY_DIR'] = args.registry_dir
+    # No import-time warmup competing with the measured work; the api
+    # scenario's first request starts it and waits for the title index
+    os.environ['WARMUP_ON_START'] = '0'
+
+    from benchmarks.scenarios import SCENARIOS
+    report['scenarios'] = {}
+    for name in args.scenarios:
+        logger.info(f"Running scenario {name}")
+        started = time.perf_counter()
+        try:
+            report['scenarios'][name] = SCENARIOS[name](args)
+        except Exception as e:
+            logger.exception(f"Scenario {name} failed")
+            report['scenarios'][name] = {'error': str(e)}
+        logger.info(f"Scenario {name} took {time.perf_counter() - started:.1f}s")
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = parse_args()
+    results = run(args)
+    output = args.output or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, default=str)
+    print(f"Results written to {output}")
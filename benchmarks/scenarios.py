@@ -0,0 +1,320 @@
+import os
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from benchmarks.generate_data import GENRES, PLATFORMS
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def summarize(seconds: List[float]) -> Dict:
+    """Latency summary in milliseconds"""
+    if not seconds:
+        return {'count': 0}
+    ordered = sorted(seconds)
+    return {
+        'count': len(ordered),
+        'min_ms': round(ordered[0] * 1000, 3),
+        'median_ms': round(statistics.median(ordered) * 1000, 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3),
+        'mean_ms': round(statistics.fmean(ordered) * 1000, 3)
+    }
+
+
+def measure(func: Callable[[], object], repeat: int, warmup: int = 1) -> Dict:
+    """Call func warmup + repeat times and summarize the timed calls"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def run_concurrently(func: Callable[[int], bool], total: int, concurrency: int) -> Dict:
+    """Call func(i) total times from concurrency threads; func returns success"""
+    latencies, errors = [], 0
+    lock = threading.Lock()
+
+    def call(i):
+        nonlocal errors
+        started = time.perf_counter()
+        ok = func(i)
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(call, range(total)))
+    elapsed = time.perf_counter() - started
+    return {
+        'requests': total,
+        'concurrency': concurrency,
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        'per_second': round(total / elapsed, 1) if elapsed else None,
+        'latency': summarize(latencies)
+    }
+
+
+def feature_rows(count: int, seed: int = 0) -> List[Dict]:
+    """Deterministic prediction inputs over the generator's categories"""
+    return [
+        {
+            'genre': GENRES[(i * 7 + seed) % len(GENRES)],
+            'platform': PLATFORMS[(i * 13 + seed) % len(PLATFORMS)],
+            'score': 20 + (i * 31 + seed) % 800 / 10
+        }
+        for i in range(count)
+    ]
+
+
+def api_throughput(options) -> Dict:
+    """Requests per second for the read endpoints, through Flask's test client.
+
+    Measures handler, cache and database time in-process; there is no
+    HTTP server or network in the loop.
+    """
+    import app as api
+
+    with api.db_manager.pool.cursor() as cursor:
+        cursor.execute("SELECT MIN(GameID), MAX(GameID) FROM Games")
+        low, high = cursor.fetchone()
+    middle = ((low or 0) + (high or 0)) // 2
+    endpoints = {
+        'lookup_genres': '/api/genres',
+        'games_first_page': '/api/games?limit=50',
+        'games_deep_page': f'/api/games?limit=50&after={middle}',
+        'games_filtered': '/api/games?limit=50&platform_id=1&year_from=2000&score_min=70',
+        'games_multi_platform': '/api/games?limit=50&platform_id=1,2,3&genre_id=1,2',
+        'games_multi_platform_deep': f'/api/games?limit=50&platform_id=1,2,3&genre_id=1,2&after={middle}',
+        'search': '/api/games/search?q=dragon%20quest',
+        'search_prefix': '/api/games/search?q=dra&mode=prefix',
+        'analytics_sales_trends': '/api/analytics/sales-trends',
+        'metrics': '/metrics'
+    }
+    clients = threading.local()
+
+    def client():
+        if not hasattr(clients, 'client'):
+            clients.client = api.app.test_client()
+        return clients.client
+
+    # Let the background title index load so prefix search is measured warm
+    deadline = time.monotonic() + 300
+    while not api.title_matcher.ready and time.monotonic() < deadline:
+        time.sleep(0.1)
+
+    results = {}
+    for name, url in endpoints.items():
+        client().get(url)
+        results[name] = run_concurrently(
+            lambda i: client().get(url).status_code < 400, options.requests, options.concurrency)
+    return results
+
+
+def bulk_insert(options) -> Dict:
+    """Rows per second through DatabaseManager.insert_games_bulk at several chunk sizes"""
+    from app import DatabaseManager
+    from db_pool import create_pool
+    from benchmarks.generate_data import DB_CONFIG
+
+    manager = DatabaseManager(create_pool(DB_CONFIG))
+    with manager.pool.cursor() as cursor:
+        cursor.execute("SELECT (SELECT MIN(PlatformID) FROM Platforms), (SELECT MIN(GenreID) FROM Genres)")
+        platform_id, genre_id = cursor.fetchone()
+    run_id = uuid.uuid4().hex[:8]
+    results = {}
+    try:
+        for chunk_size in (1000, 5000):
+            records = [
+                {'title': f"bench-bulk-{run_id}-{chunk_size}-{i}", 'release_year': 2000 + i % 25,
+                 'platform_id': platform_id, 'genre_id': genre_id,
+                 'metacritic_score': 50 + i % 50, 'global_sales': (i % 1000) / 100}
+                for i in range(options.bulk_rows)
+            ]
+            started = time.perf_counter()
+            report = manager.insert_games_bulk(records, chunk_size=chunk_size)
+            elapsed = time.perf_counter() - started
+            results[f'chunk_{chunk_size}'] = {
+                'rows': len(records),
+                'inserted': len(report['inserted']),
+                'errors': len(report['errors']),
+                'seconds': round(elapsed, 3),
+                'rows_per_second': round(len(records) / elapsed, 1)
+            }
+    finally:
+        with manager.pool.cursor() as cursor:
+            cursor.execute("DELETE FROM Games WHERE Title LIKE %s", (f"bench-bulk-{run_id}-%",))
+    return results
+
+
+def loader_throughput(options) -> Dict:
+    """Titles per second through GameDataLoader.load_games against the stub servers"""
+    import data_loader
+    from benchmarks.stub_servers import StubServers
+    from http_client import HttpClient
+
+    run_id = uuid.uuid4().hex[:8]
+    # Every tenth title falls back to Metacritic and every fiftieth is not found
+    titles = [
+        f"Bench Loader {run_id} {'unknown ' if i % 50 == 0 else 'missing ' if i % 10 == 0 else ''}{i}"
+        for i in range(options.loader_titles)
+    ]
+    results = {}
+    with StubServers(latency=options.stub_latency, error_rate=options.stub_error_rate) as stubs:
+        data_loader.IGDB_API_URL = stubs.igdb_url
+        data_loader.IGDB_MULTIQUERY_URL = stubs.igdb_multiquery_url
+        data_loader.METACRITIC_BASE_URL = stubs.metacritic_url
+        started = time.perf_counter()
+        # No rate limits or response cache: measure the pipeline, not the politeness
+        loader = data_loader.GameDataLoader(
+            concurrency=options.concurrency,
+            http_client=HttpClient(pool_size=options.concurrency, backoff_base=0.01)
+        )
+        results['init_seconds'] = round(time.perf_counter() - started, 3)
+        try:
+            started = time.perf_counter()
+            stats = loader.load_games(titles)
+            elapsed = time.perf_counter() - started
+        finally:
+            loader.cursor.execute("DELETE FROM Games WHERE Title LIKE %s", (f"Bench Loader {run_id} %",))
+            loader.conn.commit()
+    results.update({
+        'titles': len(titles),
+        'stub_latency': options.stub_latency,
+        'stub_error_rate': options.stub_error_rate,
+        'stats': stats,
+        'seconds': round(elapsed, 3),
+        'titles_per_second': round(len(titles) / elapsed, 1)
+    })
+    return results
+
+
+def analysis_latency(options) -> Dict:
+    """Latency of each GameDataAnalyzer query, without plotting"""
+    from analysis import GameDataAnalyzer
+
+    analyzer = GameDataAnalyzer()
+    return {
+        'sales_trends': measure(analyzer.sales_trends_frame, options.repeat),
+        'genre_popularity': measure(analyzer.genre_popularity_frame, options.repeat),
+        'score_correlation_stream': measure(analyzer.score_correlation_summary, options.repeat),
+        'score_correlation_sql': measure(analyzer.score_correlation_stats, options.repeat),
+        'data_fingerprint': measure(lambda: analyzer.data_fingerprint('score_correlation'), options.repeat)
+    }
+
+
+def prediction_qps(options) -> Dict:
+    """PredictionModel throughput: batch sizes, cache hits and micro-batched single calls"""
+    import app as api
+    from micro_batch import MicroBatcher
+    from model_registry import ModelRegistry
+
+    model = api.PredictionModel(api.MODEL_PATH, ModelRegistry(options.registry_dir))
+    results = {}
+    for batch_size in (1, 64, 1024):
+        batches = max(1, options.requests // batch_size)
+        rows = feature_rows(batches * batch_size, seed=batch_size)
+        model.cache.invalidate()
+        started = time.perf_counter()
+        for start in range(0, len(rows), batch_size):
+            model.predict_batch(rows[start:start + batch_size])
+        elapsed = time.perf_counter() - started
+        results[f'batch_{batch_size}_uncached'] = {
+            'rows': len(rows),
+            'seconds': round(elapsed, 3),
+            'rows_per_second': round(len(rows) / elapsed, 1)
+        }
+
+    # The same rows again are all cache hits
+    rows = feature_rows(1024, seed=1024)
+    model.predict_batch(rows)
+    results['batch_1024_cached'] = measure(lambda: model.predict_batch(rows), options.repeat)
+
+    # Concurrent single predictions, merged by the micro-batcher like /api/predict
+    batcher = MicroBatcher(model.predict_batch, max_batch=api.PREDICT_BATCH_MAX,
+                           max_wait=api.PREDICT_BATCH_WAIT_MS / 1000)
+    rows = feature_rows(options.requests, seed=7)
+    model.cache.invalidate()
+    results['single_micro_batched'] = run_concurrently(
+        lambda i: 'error' not in batcher(rows[i]), options.requests, options.concurrency)
+    results['model_version'] = model.version
+    return results
+
+
+def _read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def _pages_per_second(parse: Callable[[], object], pages: int) -> Dict:
+    started = time.perf_counter()
+    for _ in range(pages):
+        parse()
+    elapsed = time.perf_counter() - started
+    return {'pages': pages, 'seconds': round(elapsed, 3), 'pages_per_second': round(pages / elapsed, 1)}
+
+
+def metacritic_parsing(options) -> Dict:
+    """Pages per second parsing the saved Metacritic fixtures.
+
+    Compares the streaming lxml parser inline and through ParserPool from
+    concurrent fetch threads with a full-tree lxml parse and, when bs4 is
+    installed, the previous BeautifulSoup html.parser extraction.
+    """
+    from lxml import html as lxml_html
+    from metacritic_parser import ParserPool, parse_game_page, parse_search_page
+
+    game, search = _read_fixture('metacritic_game.html'), _read_fixture('metacritic_search.html')
+    pages = max(1, options.requests // 4)
+    results = {
+        'fixture_bytes': {'game': len(game), 'search': len(search)},
+        'lxml_stream_game': _pages_per_second(lambda: parse_game_page(game), pages),
+        'lxml_stream_search': _pages_per_second(lambda: parse_search_page(search), pages),
+        'lxml_full_tree_game': _pages_per_second(lambda: (
+            lxml_html.fromstring(game).xpath('//h1//text()'),
+            lxml_html.fromstring(game).xpath('//div[contains(@class, "metascore_w")]//text()')
+        ), pages)
+    }
+    try:
+        from bs4 import BeautifulSoup
+    except ImportError:
+        results['bs4_html_parser_game'] = {'error': 'bs4 not installed'}
+    else:
+        def soup_parse():
+            soup = BeautifulSoup(game, 'html.parser')
+            for args in (('h1',), ('span', {'itemprop': 'ratingValue'}), ('div', {'class': 'metascore_w user'}),
+                         ('span', {'class': 'platform'}), ('span', {'class': 'release_date'})):
+                soup.find(*args)
+        results['bs4_html_parser_game'] = _pages_per_second(soup_parse, max(1, pages // 10))
+
+    for workers in sorted({0, options.concurrency // 2 or 1, options.concurrency}):
+        pool = ParserPool(workers)
+        try:
+            pool.game_page(game)
+            results[f'pool_{workers}_workers'] = run_concurrently(
+                lambda i: pool.game_page(game) is not None, options.requests, options.concurrency)
+        finally:
+            pool.close()
+    return results
+
+
+SCENARIOS = {
+    'api': api_throughput,
+    'bulk_insert': bulk_insert,
+    'loader': loader_throughput,
+    'analysis': analysis_latency,
+    'prediction': prediction_qps,
+    'metacritic_parsing': metacritic_parsing
+}
@@ -0,0 +1,181 @@
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, unquote
+
+from benchmarks.generate_data import GENRES, PLATFORMS
+
+_SEARCH = re.compile(r'search "(.*?)";')
+_SUBQUERY = re.compile(r'query games "([^"]+)" \{(.*?)\};')
+
+
+def _stable_int(text: str) -> int:
+    """Deterministic per-title number, so repeated runs see the same data"""
+    return int.from_bytes(hashlib.sha1(text.encode('utf-8')).digest()[:8], 'big')
+
+
+def igdb_record(title: str) -> dict:
+    value = _stable_int(title)
+    return {
+        'id': value % 10_000_000,
+        'name': title,
+        'first_release_date': 315532800 + value % (44 * 365 * 86400),
+        'platforms': [{'name': PLATFORMS[value % len(PLATFORMS)]}],
+        'genres': [{'name': GENRES[value % len(GENRES)]}],
+        'rating': 40 + value % 60,
+        'aggregated_rating': 30 + value % 70,
+        'involved_companies': [
+            {'company': {'name': f"Stub Developer {value % 200}"}, 'developer': True, 'publisher': False},
+            {'company': {'name': f"Stub Publisher {value % 50}"}, 'developer': False, 'publisher': True}
+        ]
+    }
+
+
+def metacritic_page(title: str) -> str:
+    """A game page with the elements GameDataLoader.scrape_metacritic reads"""
+    value = _stable_int(title)
+    return (
+        "<html><body>"
+        f"<h1>{title}</h1>"
+        f"<span itemprop=\"ratingValue\">{30 + value % 70}</span>"
+        f"<div class=\"metascore_w user\">{(value % 100) / 10:.1f}</div>"
+        f"<span class=\"platform\">{PLATFORMS[value % len(PLATFORMS)]}</span>"
+        f"<span class=\"release_date\">Jan 1, {1980 + value % 44}</span>"
+        "</body></html>"
+    )
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """IGDB (POST .../games and .../multiquery) and Metacritic (GET search and game pages) lookalike.
+
+    Titles containing "missing" are unknown to IGDB, so the loader falls
+    back to Metacritic; titles containing "unknown" are found nowhere.
+    The server's latency and error_rate settings simulate slow or
+    rate-limited upstreams.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: str, content_type: str, headers: dict = None):
+        payload = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _throttled(self) -> bool:
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.server.error_rate and self.server.rng.random() < self.server.error_rate:
+            self._send(429, 'rate limited', 'text/plain', {'Retry-After': '0'})
+            return True
+        return False
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0)).decode('utf-8')
+        if self._throttled():
+            return
+        if self.path.endswith('/multiquery'):
+            answers = [{'name': name, 'result': self._search(query)} for name, query in _SUBQUERY.findall(body)]
+            return self._send(200, json.dumps(answers), 'application/json')
+        if not self.path.endswith('/games'):
+            return self._send(404, 'not found', 'text/plain')
+        self._send(200, json.dumps(self._search(body)), 'application/json')
+
+    @staticmethod
+    def _search(query: str) -> list:
+        match = _SEARCH.search(query)
+        title = match.group(1) if match else ''
+        return [] if not title or 'missing' in title or 'unknown' in title else [igdb_record(title)]
+
+    def do_GET(self):
+        if self._throttled():
+            return
+        search = re.match(r'^/search/game/([^/]+)/results$', self.path)
+        if search:
+            title = unquote(search.group(1))
+            if 'unknown' in title:
+                return self._send(200, '<html><body></body></html>', 'text/html')
+            return self._send(200, (
+                f"<html><body><div class=\"result_wrap\"><a href=\"/game/{quote(title, safe='')}\">"
+                f"{title}</a></div></body></html>"
+            ), 'text/html')
+        game = re.match(r'^/game/([^/]+)$', self.path)
+        if game:
+            return self._send(200, metacritic_page(unquote(game.group(1))), 'text/html')
+        self._send(404, 'not found', 'text/plain')
+
+
+class StubServers:
+    """Runs stub IGDB and Metacritic servers on free local ports while in use"""
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, seed: int = 42,
+                 igdb_port: int = 0, metacritic_port: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.seed = seed
+        self.ports = {'igdb': igdb_port, 'metacritic': metacritic_port}
+        self.servers = {}
+
+    def start(self) -> 'StubServers':
+        for name, port in self.ports.items():
+            server = ThreadingHTTPServer(('127.0.0.1', port), StubHandler)
+            server.daemon_threads = True
+            server.latency = self.latency
+            server.error_rate = self.error_rate
+            server.rng = random.Random(self.seed)
+            threading.Thread(target=server.serve_forever, name=f"stub-{name}", daemon=True).start()
+            self.servers[name] = server
+        return self
+
+    def stop(self):
+        for server in self.servers.values():
+            server.shutdown()
+            server.server_close()
+        self.servers = {}
+
+    @property
+    def igdb_url(self) -> str:
+        return f"http://127.0.0.1:{self.servers['igdb'].server_port}/v4/games"
+
+    @property
+    def igdb_multiquery_url(self) -> str:
+        return f"http://127.0.0.1:{self.servers['igdb'].server_port}/v4/multiquery"
+
+    @property
+    def metacritic_url(self) -> str:
+        return f"http://127.0.0.1:{self.servers['metacritic'].server_port}"
+
+    def __enter__(self) -> 'StubServers':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run stub IGDB/Metacritic servers for manual loader runs")
+    parser.add_argument('--igdb-port', type=int, default=8081)
+    parser.add_argument('--metacritic-port', type=int, default=8082)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 429")
+    args = parser.parse_args()
+    stubs = StubServers(args.latency, args.error_rate, igdb_port=args.igdb_port,
+                        metacritic_port=args.metacritic_port).start()
+    print(f"IGDB_API_URL={stubs.igdb_url}")
+    print(f"IGDB_MULTIQUERY_URL={stubs.igdb_multiquery_url}")
+    print(f"METACRITIC_BASE_URL={stubs.metacritic_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        stubs.stop()
@@ -0,0 +1,145 @@
+import csv
+import io
+import json
+import math
+from decimal import ROUND_HALF_UP, Decimal
+from itertools import islice
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+# Games columns in insert order, with the request field that feeds each one
+GAME_COLUMNS = [
+    ('Title', 'title'),
+    ('ReleaseYear', 'release_year'),
+    ('DeveloperID', 'developer_id'),
+    ('PublisherID', 'publisher_id'),
+    ('PlatformID', 'platform_id'),
+    ('GenreID', 'genre_id'),
+    ('MetacriticScore', 'metacritic_score'),
+    ('UserScore', 'user_score'),
+    ('GlobalSales', 'global_sales')
+]
+
+REQUIRED_FIELDS = ['title', 'release_year', 'platform_id', 'genre_id']
+INT_FIELDS = {'release_year', 'developer_id', 'publisher_id', 'platform_id', 'genre_id'}
+# DECIMAL(3,1) scores and DECIMAL(10,2) sales, as (exclusive limit, scale)
+NUMERIC_LIMITS = {
+    'metacritic_score': (100, 1),
+    'user_score': (100, 1),
+    'global_sales': (10 ** 8, 2)
+}
+
+
+class BulkFormatError(ValueError):
+    """Raised when a bulk request body cannot be parsed at all"""
+
+
+def _coerce(field: str, value):
+    """Convert a raw JSON/CSV value to the column type"""
+    if value is None or value == '':
+        return None
+    if field in INT_FIELDS:
+        if isinstance(value, bool) or isinstance(value, float) and not value.is_integer():
+            raise ValueError(f"{field} must be an integer")
+        return int(value)
+    if field in NUMERIC_LIMITS:
+        if isinstance(value, bool):
+            raise ValueError(f"{field} must be a number")
+        number = float(value)
+        limit, scale = NUMERIC_LIMITS[field]
+        if not math.isfinite(number):
+            raise ValueError(f"{field} out of range")
+        # Round the way Postgres does on insert, so 99.96 is caught as 100.0
+        number = float(Decimal(repr(number)).quantize(Decimal(1).scaleb(-scale), rounding=ROUND_HALF_UP))
+        if not 0 <= number < limit:
+            raise ValueError(f"{field} out of range")
+        return number
+    return str(value)
+
+
+def validate_game_row(game_data) -> Tuple[Optional[tuple], Optional[str]]:
+    """Validate one game record and return (row tuple, error message)"""
+    if not isinstance(game_data, dict):
+        return None, 'Row must be an object'
+    if '_parse_error' in game_data:
+        return None, game_data['_parse_error']
+    missing = [field for field in REQUIRED_FIELDS if game_data.get(field) in (None, '')]
+    if missing:
+        return None, f"Missing required fields: {', '.join(missing)}"
+    try:
+        row = tuple(_coerce(field, game_data.get(field)) for _, field in GAME_COLUMNS)
+    except (TypeError, ValueError) as e:
+        return None, f"Invalid value: {e}"
+    if len(row[0]) > 255:
+        return None, 'title is longer than 255 characters'
+    return row, None
+
+
+def iter_records(stream: IO[bytes], content_type: str) -> Iterator[Dict]:
+    """Yield game records from a JSON array, NDJSON or CSV request body.
+
+    NDJSON and CSV are read line by line, so large uploads are never held
+    in memory as a whole. A body that cannot be read past some line (bad
+    UTF-8, broken CSV quoting) raises BulkFormatError at that point.
+    """
+    mimetype = (content_type or '').split(';')[0].strip().lower()
+    if mimetype in ('application/x-ndjson', 'application/ndjson', 'application/jsonl'):
+        text = io.TextIOWrapper(stream, encoding='utf-8')
+        line_number = 0
+        try:
+            for line_number, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    # Keep the row position so the error report lines up
+                    yield {'_parse_error': f"Line {line_number}: {e}"}
+        except UnicodeDecodeError as e:
+            # Text is decoded in blocks, so the position is approximate
+            raise BulkFormatError(f"Invalid UTF-8 near line {line_number + 1}: {e.reason}")
+    elif mimetype == 'text/csv':
+        reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8', newline=''))
+        try:
+            yield from reader
+        except UnicodeDecodeError as e:
+            raise BulkFormatError(f"Invalid UTF-8 near line {reader.line_num + 1}: {e.reason}")
+        except csv.Error as e:
+            raise BulkFormatError(f"Line {reader.line_num}: {e}")
+    elif mimetype == 'application/json':
+        try:
+            records = json.load(stream)
+        except ValueError as e:
+            raise BulkFormatError(f"Invalid JSON: {e}")
+        if not isinstance(records, list):
+            raise BulkFormatError('Expected a JSON array of games')
+        yield from records
+    else:
+        raise BulkFormatError(f"Unsupported content type: {mimetype or 'none'}")
+
+
+def until_format_error(records: Iterable, errors: List[Dict]) -> Iterator:
+    """Yield records until the body turns out to be unreadable part-way through.
+
+    The BulkFormatError is then appended to errors at the index of the
+    first record that could not be read, so the rows before it are still
+    inserted and reported. An error before the first record is raised.
+    """
+    index = 0
+    try:
+        for record in records:
+            yield record
+            index += 1
+    except BulkFormatError as e:
+        if not index:
+            raise
+        errors.append({'index': index, 'error': f"{e}; the rest of the body was not read"})
+
+
+def chunked(records: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of at most size items"""
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
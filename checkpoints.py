@@ -0,0 +1,71 @@
+import json
+from psycopg2.extras import execute_values
+from typing import Dict, Iterable, List
+
+# Item states, in the order a title moves through them
+PENDING = 'pending'
+FETCHED = 'fetched'
+INSERTED = 'inserted'
+FAILED = 'failed'
+
+
+class JobCheckpoint:
+    """Per-title progress of a named loader job, stored in LoadJobItems.
+
+    All methods run on the caller's cursor and leave committing to the
+    caller, so status changes commit atomically with the game inserts.
+    """
+    def __init__(self, cursor, job_name: str):
+        self.cursor = cursor
+        self.job_name = job_name
+        cursor.execute("""
+            INSERT INTO LoadJobs (JobName) VALUES (%s)
+            ON CONFLICT (JobName) DO UPDATE SET JobName = EXCLUDED.JobName
+            RETURNING JobID
+        """, (job_name,))
+        self.job_id = cursor.fetchone()[0]
+
+    def register(self, titles: Iterable[str]):
+        """Add titles as pending, leaving already-known titles untouched"""
+        execute_values(self.cursor, """
+            INSERT INTO LoadJobItems (JobID, Title) VALUES %s
+            ON CONFLICT (JobID, Title) DO NOTHING
+        """, [(self.job_id, title) for title in dict.fromkeys(titles)], page_size=1000)
+
+    def statuses(self) -> Dict[str, str]:
+        """Current status of every title in the job"""
+        self.cursor.execute("SELECT Title, Status FROM LoadJobItems WHERE JobID = %s", (self.job_id,))
+        return dict(self.cursor.fetchall())
+
+    def fetched_payloads(self) -> Dict[str, Dict]:
+        """Game data already fetched but not yet inserted, by title"""
+        self.cursor.execute(
+            "SELECT Title, Payload FROM LoadJobItems WHERE JobID = %s AND Status = %s AND Payload IS NOT NULL",
+            (self.job_id, FETCHED)
+        )
+        return dict(self.cursor.fetchall())
+
+    def mark_fetched(self, items: List[tuple]):
+        """Record (title, game_data) pairs as fetched, keeping the payload"""
+        self._update([(title, FETCHED, None, json.dumps(game_data), None) for title, game_data in items])
+
+    def mark_inserted(self, items: List[tuple]):
+        """Record (title, game_id) pairs as inserted"""
+        self._update([(title, INSERTED, None, None, game_id) for title, game_id in items])
+
+    def mark_failed(self, items: List[tuple]):
+        """Record (title, reason) pairs as failed"""
+        self._update([(title, FAILED, reason, None, None) for title, reason in items])
+
+    def _update(self, rows: List[tuple]):
+        if not rows:
+            return
+        # Payload is kept once set, so a failed insert can be retried offline
+        execute_values(self.cursor, f"""
+            UPDATE LoadJobItems AS i
+            SET Status = v.status, Reason = v.reason,
+                Payload = COALESCE(v.payload::jsonb, i.Payload),
+                GameID = v.game_id::int, UpdatedAt = now()
+            FROM (VALUES %s) AS v (title, status, reason, payload, game_id)
+            WHERE i.JobID = {int(self.job_id)} AND i.Title = v.title
+        """, rows, page_size=1000)
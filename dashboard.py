@@ -1,8 +1,9 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import psycopg2
-from analysis import GameDataAnalyzer
+from dashboard_queries import (
+    filter_slice, genre_stats, get_analyzer, load_slice, normalize_filters, sales_by_platform
+)
 from typing import Dict, List
 import logging
 
@@ -49,7 +50,8 @@ body {
 
 class GameDashboard:
     def __init__(self):
-        self.analyzer = GameDataAnalyzer()
+        self.analyzer = get_analyzer()
+        self.slice = None
         
     def create_header(self):
         """Create dashboard header section"""
@@ -76,9 +78,11 @@ class GameDashboard:
                 1980, 2023, (2010, 2023),
                 help="Filter games by release year range"
             )
+            # One query covers the whole window; all panels aggregate this frame
+            self.slice = load_slice(self.analyzer, tuple(sorted(year_range)))
             
         with col2:
-            platforms = self._get_unique_values("Platforms", "PlatformName")
+            platforms = self._get_unique_values("PlatformName")
             selected_platforms = st.multiselect(
                 "Platforms",
                 platforms,
@@ -87,7 +91,7 @@ class GameDashboard:
             )
             
         with col3:
-            genres = self._get_unique_values("Genres", "GenreName")
+            genres = self._get_unique_values("GenreName")
             selected_genres = st.multiselect(
                 "Genres",
                 genres,
@@ -101,11 +105,9 @@ class GameDashboard:
             'genres': selected_genres
         }
         
-    def _get_unique_values(self, table: str, column: str) -> List:
-        """Get unique values from database table"""
-        query = f"SELECT DISTINCT {column} FROM {table} ORDER BY {column}"
-        df = self.analyzer.query_to_dataframe(query)
-        return df[column].tolist()
+    def _get_unique_values(self, column: str) -> List:
+        """Get unique values of a category column in the loaded slice"""
+        return sorted(self.slice[column].cat.categories.tolist())
         
     def show_sales_analysis(self, filters: Dict):
         """Display sales analysis section"""
@@ -115,22 +117,7 @@ class GameDashboard:
         </div>
         """, unsafe_allow_html=True)
         
-        query = f"""
-        SELECT 
-            p.PlatformName,
-            g.ReleaseYear,
-            SUM(g.GlobalSales) AS TotalSales
-        FROM Games g
-        JOIN Platforms p ON g.PlatformID = p.PlatformID
-        JOIN Genres gn ON g.GenreID = gn.GenreID
-        WHERE g.ReleaseYear BETWEEN {filters['year_range'][0]} AND {filters['year_range'][1]}
-            AND p.PlatformName IN ({self._format_sql_list(filters['platforms'])})
-            AND gn.GenreName IN ({self._format_sql_list(filters['genres'])})
-        GROUP BY p.PlatformName, g.ReleaseYear
-        ORDER BY g.ReleaseYear, TotalSales DESC
-        """
-        
-        df = self.analyzer.query_to_dataframe(query)
+        df = sales_by_platform(filter_slice(self.slice, normalize_filters(filters)))
         
         if not df.empty:
             tab1, tab2 = st.tabs(["Trend Chart", "Data Table"])
@@ -168,25 +155,7 @@ class GameDashboard:
         </div>
         """, unsafe_allow_html=True)
         
-        query = f"""
-        SELECT 
-            gn.GenreName,
-            g.ReleaseYear,
-            COUNT(*) AS GameCount,
-            AVG(g.MetacriticScore) AS AvgCriticScore,
-            AVG(g.UserScore) AS AvgUserScore
-        FROM Games g
-        JOIN Genres gn ON g.GenreID = gn.GenreID
-        JOIN Platforms p ON g.PlatformID = p.PlatformID
-        WHERE g.ReleaseYear BETWEEN {filters['year_range'][0]} AND {filters['year_range'][1]}
-            AND p.PlatformName IN ({self._format_sql_list(filters['platforms'])})
-            AND gn.GenreName IN ({self._format_sql_list(filters['genres'])})
-        GROUP BY gn.GenreName, g.ReleaseYear
-        HAVING COUNT(*) > 1
-        ORDER BY g.ReleaseYear, GameCount DESC
-        """
-        
-        df = self.analyzer.query_to_dataframe(query)
+        df = genre_stats(filter_slice(self.slice, normalize_filters(filters)))
         
         if not df.empty:
             col1, col2 = st.columns(2)
@@ -226,10 +195,6 @@ class GameDashboard:
         else:
             st.warning("No data available for selected filters")
             
-    def _format_sql_list(self, items: List[str]) -> str:
-        """Format list of strings for SQL IN clause"""
-        return ", ".join([f"'{item}'" for item in items])
-        
     def run(self):
         """Run the dashboard"""
         self.create_header()
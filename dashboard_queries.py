@@ -0,0 +1,131 @@
+import os
+import time
+from typing import Dict, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from analysis import GameDataAnalyzer
+
+# Seconds a cached query result stays valid
+DASHBOARD_CACHE_TTL = int(os.getenv('DASHBOARD_CACHE_TTL', 300))
+
+# Rollup rows for a year window, unfiltered by platform or genre, so any
+# platform/genre selection can be answered from the same frame
+SLICE_QUERY = """
+SELECT 
+    p.PlatformName AS "PlatformName",
+    gn.GenreName AS "GenreName",
+    r.ReleaseYear AS "ReleaseYear",
+    r.GameCount AS "GameCount",
+    r.SalesSum AS "SalesSum",
+    r.SalesCount AS "SalesCount",
+    r.CriticSum AS "CriticSum",
+    r.CriticCount AS "CriticCount",
+    r.UserSum AS "UserSum",
+    r.UserCount AS "UserCount"
+FROM GameRollups r
+JOIN Platforms p ON r.PlatformID = p.PlatformID
+JOIN Genres gn ON r.GenreID = gn.GenreID
+WHERE r.ReleaseYear BETWEEN %(year_from)s AND %(year_to)s
+"""
+
+SLICE_DTYPES = {
+    'PlatformName': 'category',
+    'GenreName': 'category',
+    'ReleaseYear': 'int16',
+    'GameCount': 'int32',
+    'SalesSum': 'float64',
+    'SalesCount': 'int32',
+    'CriticSum': 'float64',
+    'CriticCount': 'int32',
+    'UserSum': 'float64',
+    'UserCount': 'int32'
+}
+
+
+def normalize_filters(filters: Dict) -> Tuple:
+    """Canonical, hashable form of a filter set, used as the cache key"""
+    year_from, year_to = sorted(int(year) for year in filters['year_range'])
+    return (
+        (year_from, year_to),
+        tuple(sorted(set(filters['platforms']))),
+        tuple(sorted(set(filters['genres'])))
+    )
+
+
+@st.cache_resource
+def get_analyzer() -> GameDataAnalyzer:
+    """One analyzer (and database connection) shared across reruns and sessions"""
+    analyzer = GameDataAnalyzer()
+    # Read-only use: autocommit keeps a failed query from leaving the shared
+    # connection stuck in an aborted transaction
+    analyzer.conn.autocommit = True
+    return analyzer
+
+
+# Arguments starting with an underscore are not hashed by st.cache_data
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL, show_spinner=False)
+def fetch_slice(_analyzer: GameDataAnalyzer, year_from: int, year_to: int) -> pd.DataFrame:
+    """Compact, categorical-typed rollup rows for a year window"""
+    df = _analyzer.query_to_dataframe(SLICE_QUERY, {'year_from': year_from, 'year_to': year_to})
+    return df.astype(SLICE_DTYPES)
+
+
+def load_slice(analyzer: GameDataAnalyzer, year_range: Tuple) -> pd.DataFrame:
+    """Return rollup rows covering year_range, querying only when it grows.
+
+    The loaded window is kept in session state and only ever widened, so
+    narrowing or moving the range within it is answered client-side. It is
+    reloaded after DASHBOARD_CACHE_TTL so new games still show up.
+    """
+    year_from, year_to = year_range
+    loaded = st.session_state.get('dashboard_slice')
+    if loaded is not None and time.monotonic() - loaded[3] < DASHBOARD_CACHE_TTL:
+        loaded_from, loaded_to, frame, _ = loaded
+        if loaded_from <= year_from and year_to <= loaded_to:
+            return frame
+        year_from, year_to = min(year_from, loaded_from), max(year_to, loaded_to)
+    frame = fetch_slice(analyzer, year_from, year_to)
+    st.session_state['dashboard_slice'] = (year_from, year_to, frame, time.monotonic())
+    return frame
+
+
+def filter_slice(frame: pd.DataFrame, normalized: Tuple) -> pd.DataFrame:
+    """Rows of the slice matching a normalized filter set"""
+    (year_from, year_to), platforms, genres = normalized
+    mask = (
+        frame['ReleaseYear'].between(year_from, year_to)
+        & frame['PlatformName'].isin(platforms)
+        & frame['GenreName'].isin(genres)
+    )
+    return frame[mask]
+
+
+def sales_by_platform(rows: pd.DataFrame) -> pd.DataFrame:
+    """Total sales per platform and year, NULL where no game reported sales"""
+    df = rows.groupby(['PlatformName', 'ReleaseYear'], observed=True)[['SalesSum', 'SalesCount']].sum().reset_index()
+    df['TotalSales'] = df['SalesSum'].where(df['SalesCount'] > 0)
+    df['PlatformName'] = df['PlatformName'].astype(str)
+    return (
+        df[['PlatformName', 'ReleaseYear', 'TotalSales']]
+        .sort_values(['ReleaseYear', 'TotalSales'], ascending=[True, False])
+        .reset_index(drop=True)
+    )
+
+
+def genre_stats(rows: pd.DataFrame) -> pd.DataFrame:
+    """Game counts and average scores per genre and year, for groups of 2+ games"""
+    columns = ['GameCount', 'CriticSum', 'CriticCount', 'UserSum', 'UserCount']
+    df = rows.groupby(['GenreName', 'ReleaseYear'], observed=True)[columns].sum().reset_index()
+    df = df[df['GameCount'] > 1]
+    df = df.assign(
+        GenreName=df['GenreName'].astype(str),
+        AvgCriticScore=df['CriticSum'] / df['CriticCount'].where(df['CriticCount'] > 0),
+        AvgUserScore=df['UserSum'] / df['UserCount'].where(df['UserCount'] > 0)
+    )
+    return (
+        df[['GenreName', 'ReleaseYear', 'GameCount', 'AvgCriticScore', 'AvgUserScore']]
+        .sort_values(['ReleaseYear', 'GameCount'], ascending=[True, False])
+        .reset_index(drop=True)
+    )
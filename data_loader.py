@@ -1,9 +1,23 @@
 import psycopg2
-import requests
-from bs4 import BeautifulSoup
-import time
+import argparse
+import hashlib
+import json
+import os
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from typing import Optional, Dict, List
+from urllib.parse import quote
 import logging
+from http_client import HttpClient, TokenBucket
+from response_cache import ResponseCache
+from checkpoints import JobCheckpoint, INSERTED
+from dimensions import DimensionCache
+from title_search import TitleMatcher
+from metrics import REGISTRY
+from metacritic_parser import ParserPool
 
 # Database connection configuration
 DB_CONFIG = {
@@ -13,10 +27,36 @@ DB_CONFIG = {
     'password': 'postgres'
 }
 
-# API configuration
-IGDB_API_URL = "https://api.igdb.com/v4/games"
+# API configuration (overridable so the loader can run against stub servers)
+IGDB_API_URL = os.getenv('IGDB_API_URL', "https://api.igdb.com/v4/games")
+IGDB_MULTIQUERY_URL = os.getenv('IGDB_MULTIQUERY_URL', "https://api.igdb.com/v4/multiquery")
+METACRITIC_BASE_URL = os.getenv('METACRITIC_BASE_URL', "https://www.metacritic.com")
 STEAM_API_URL = "https://store.steampowered.com/api/appdetails"
 
+# Pipeline configuration
+LOADER_CONCURRENCY = int(os.getenv('LOADER_CONCURRENCY', 8))
+LOADER_BATCH_SIZE = int(os.getenv('LOADER_BATCH_SIZE', 100))
+IGDB_RATE_LIMIT = float(os.getenv('IGDB_RATE_LIMIT', 4))  # requests per second
+METACRITIC_RATE_LIMIT = float(os.getenv('METACRITIC_RATE_LIMIT', 1))
+# Titles searched per IGDB multiquery request (IGDB accepts at most 10)
+IGDB_BATCH_SIZE = min(10, int(os.getenv('IGDB_BATCH_SIZE', 10)))
+
+IGDB_HEADERS = {
+    'Client-ID': 'YOUR_CLIENT_ID',
+    'Authorization': 'Bearer YOUR_ACCESS_TOKEN'
+}
+IGDB_FIELDS = ("name, first_release_date, platforms.name, genres.name, rating, aggregated_rating, "
+               "involved_companies.company.name, involved_companies.developer, involved_companies.publisher")
+
+# Response cache configuration (set RESPONSE_CACHE_PATH to '' to disable)
+RESPONSE_CACHE_PATH = os.getenv('RESPONSE_CACHE_PATH', os.path.join('.cache', 'http_responses.sqlite'))
+RESPONSE_CACHE_MAX_MB = int(os.getenv('RESPONSE_CACHE_MAX_MB', 512))
+RESPONSE_CACHE_TTLS = {
+    'igdb': float(os.getenv('IGDB_CACHE_TTL', 7 * 24 * 3600)),
+    'metacritic': float(os.getenv('METACRITIC_CACHE_TTL', 3 * 24 * 3600))
+}
+LOADER_CACHE_ONLY = os.getenv('LOADER_CACHE_ONLY', '0') == '1'
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -24,124 +64,524 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+LOADER_GAMES = REGISTRY.counter(
+    'loader_games_total', 'Titles processed by the loader, by source or outcome', ['outcome'])
+LOADER_FETCH_SECONDS = REGISTRY.histogram(
+    'loader_fetch_duration_seconds', 'Time to fetch and normalize one title')
+LOADER_FLUSH_SECONDS = REGISTRY.histogram(
+    'loader_flush_duration_seconds', 'Time to write one batch of games')
+LOADER_IGDB_BATCH_SECONDS = REGISTRY.histogram(
+    'loader_igdb_batch_duration_seconds', 'Time for one IGDB multiquery request')
+
+# Marks the end of the fetch stage for the writer thread
+_DONE = object()
+
+
+def igdb_search_query(game_name: str) -> str:
+    """Apicalypse search for the best IGDB match of a title"""
+    escaped = game_name.replace('\\', '\\\\').replace('"', '\\"')
+    return f'search "{escaped}"; fields {IGDB_FIELDS}; limit 1;'
+
+
+def igdb_query_name(game_name: str) -> str:
+    """Multiquery sub-query name for a title, the same whatever batch it is in"""
+    return hashlib.sha1(game_name.encode('utf-8')).hexdigest()[:16]
+
+
 class GameDataLoader:
-    def __init__(self):
+    def __init__(self, concurrency: int = LOADER_CONCURRENCY, batch_size: int = LOADER_BATCH_SIZE,
+                 http_client: Optional[HttpClient] = None, cache_only: bool = LOADER_CACHE_ONLY,
+                 igdb_batch_size: int = IGDB_BATCH_SIZE):
         self.conn = psycopg2.connect(**DB_CONFIG)
         self.cursor = self.conn.cursor()
+        self.dimensions = DimensionCache(self.cursor)
+        self.dimensions.preload()
+        self.titles = TitleMatcher()
+        self.conn.commit()
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.igdb_batch_size = max(1, igdb_batch_size)
+        self.http = http_client or HttpClient(
+            rate_limits={
+                'igdb': TokenBucket(IGDB_RATE_LIMIT),
+                'metacritic': TokenBucket(METACRITIC_RATE_LIMIT)
+            },
+            pool_size=concurrency,
+            cache=ResponseCache(
+                RESPONSE_CACHE_PATH,
+                max_bytes=RESPONSE_CACHE_MAX_MB * 1024 * 1024,
+                ttls=RESPONSE_CACHE_TTLS
+            ) if RESPONSE_CACHE_PATH else None,
+            cache_only=cache_only
+        )
+        self.parser = ParserPool()
         
     def __del__(self):
+        if hasattr(self, 'parser'):
+            self.parser.close()
         if hasattr(self, 'conn'):
             self.conn.close()
 
     def fetch_from_igdb(self, game_name: str) -> Optional[Dict]:
         """Fetch game data from IGDB API"""
         try:
-            headers = {
-                'Client-ID': 'YOUR_CLIENT_ID',
-                'Authorization': 'Bearer YOUR_ACCESS_TOKEN'
-            }
-            query = f'search "{game_name}"; fields name, first_release_date, platforms.name, genres.name, rating;'
-            response = requests.post(IGDB_API_URL, headers=headers, data=query)
-            response.raise_for_status()
-            return response.json()[0] if response.json() else None
+            response = self.http.post('igdb', IGDB_API_URL, headers=IGDB_HEADERS, data=igdb_search_query(game_name))
+            results = response.json()
+            return results[0] if results else None
         except Exception as e:
             logger.error(f"IGDB API error: {e}")
             return None
 
+    @LOADER_IGDB_BATCH_SECONDS.time()
+    def fetch_from_igdb_batch(self, game_names: List[str]) -> Dict[str, Optional[Dict]]:
+        """Search IGDB for several titles with one multiquery request.
+
+        Each title gets a sub-query named after it, and answers are mapped
+        back to titles by that name. Returns the best match per title, or
+        None when IGDB has none. Titles whose sub-query is missing or
+        malformed in the response (all of them if the request fails after
+        the HTTP client's retries) are left out, so the caller can retry
+        them one by one.
+
+        The batch itself is not cached, since its body depends on which
+        titles share it; each answer is cached as the title's own
+        fetch_from_igdb response instead.
+        """
+        queries = {igdb_query_name(name): name for name in game_names}
+        body = ''.join(f'query games "{key}" {{ {igdb_search_query(name)} }};' for key, name in queries.items())
+        try:
+            response = self.http.post('igdb', IGDB_MULTIQUERY_URL, headers=IGDB_HEADERS, data=body,
+                                      use_cache=False)
+            answers = response.json()
+        except Exception as e:
+            logger.error(f"IGDB multiquery error for {len(game_names)} titles: {e}")
+            return {}
+        found = {}
+        for answer in answers if isinstance(answers, list) else []:
+            if not isinstance(answer, dict) or not isinstance(answer.get('result'), list):
+                continue
+            name = queries.get(str(answer.get('name')))
+            if name is not None:
+                found[name] = answer['result'][0] if answer['result'] else None
+                self.http.store('igdb', 'POST', IGDB_API_URL, json.dumps(answer['result']).encode('utf-8'),
+                                {'Content-Type': 'application/json'}, data=igdb_search_query(name))
+        return found
+
+    def search_igdb(self, names: List[str]) -> Dict[str, Optional[Dict]]:
+        """Batched IGDB answers for the titles of a group that aren't cached yet.
+
+        Cached titles, and titles the batch did not answer, are left out of
+        the result; fetch_game then queries them on their own, cached ones
+        without touching the network.
+        """
+        uncached = list(dict.fromkeys(
+            name for name in names
+            if not self.http.is_cached('igdb', 'POST', IGDB_API_URL, data=igdb_search_query(name))
+        ))
+        if len(uncached) < 2 or self.http.cache_only:
+            return {}
+        answered = self.fetch_from_igdb_batch(uncached)
+        if len(answered) < len(uncached):
+            LOADER_GAMES.inc(len(uncached) - len(answered), outcome='igdb_batch_retry')
+        return answered
+
     def scrape_metacritic(self, game_name: str) -> Optional[Dict]:
-        """Fallback to scraping Metacritic if API fails"""
+        """Fallback to scraping Metacritic if API fails.
+
+        Pages are parsed in the parser pool's worker processes, so fetch
+        threads only wait on I/O and on the parse result.
+        """
         try:
-            search_url = f"https://www.metacritic.com/search/game/{game_name}/results"
+            search_url = f"{METACRITIC_BASE_URL}/search/game/{quote(game_name, safe='')}/results"
             headers = {'User-Agent': 'Mozilla/5.0'}
             
-            response = requests.get(search_url, headers=headers)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            first_result = soup.find('div', class_='result_wrap')
-            if not first_result:
+            response = self.http.get('metacritic', search_url, headers=headers)
+            game_url = self.parser.search_page(response.text)
+            if not game_url:
                 return None
                 
-            game_url = first_result.find('a')['href']
-            game_response = requests.get(f"https://www.metacritic.com{game_url}", headers=headers)
-            game_soup = BeautifulSoup(game_response.text, 'html.parser')
-            
-            return {
-                'title': game_soup.find('h1').text.strip(),
-                'score': float(game_soup.find('span', itemprop='ratingValue').text),
-                'user_score': float(game_soup.find('div', class_='metascore_w user').text),
-                'platform': game_soup.find('span', class_='platform').text.strip(),
-                'release_date': game_soup.find('span', class_='release_date').text.strip()
-            }
+            game_response = self.http.get('metacritic', f"{METACRITIC_BASE_URL}{game_url}", headers=headers)
+            return self.parser.game_page(game_response.text)
         except Exception as e:
             logger.error(f"Metacritic scraping error: {e}")
             return None
 
+    def _insert_game(self, game_data: Dict) -> int:
+        """Upsert one game using the loader cursor.
+
+        Dimension IDs must already be resolved (see DimensionCache.resolve).
+        Games are keyed on title + platform + release year, so loading the
+        same title twice updates the existing row instead of duplicating it;
+        a title written differently from an existing one (case, accents,
+        punctuation) is first mapped onto that game.
+        """
+        self._merge_duplicate(game_data)
+        # Insert game data
+        self.cursor.execute("""
+            INSERT INTO Games (
+                Title, ReleaseYear, DeveloperID, PublisherID, 
+                PlatformID, GenreID, MetacriticScore, UserScore, GlobalSales
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (Title, COALESCE(PlatformID, 0), COALESCE(ReleaseYear, 0)) DO UPDATE SET
+                DeveloperID = COALESCE(EXCLUDED.DeveloperID, Games.DeveloperID),
+                PublisherID = COALESCE(EXCLUDED.PublisherID, Games.PublisherID),
+                GenreID = COALESCE(EXCLUDED.GenreID, Games.GenreID),
+                MetacriticScore = COALESCE(EXCLUDED.MetacriticScore, Games.MetacriticScore),
+                UserScore = COALESCE(EXCLUDED.UserScore, Games.UserScore),
+                GlobalSales = COALESCE(EXCLUDED.GlobalSales, Games.GlobalSales)
+            RETURNING GameID
+        """, (
+            game_data['title'],
+            game_data.get('release_year'),
+            game_data.get('developer_id'),
+            game_data.get('publisher_id'),
+            game_data.get('platform_id'),
+            game_data.get('genre_id'),
+            game_data.get('metacritic_score'),
+            game_data.get('user_score'),
+            game_data.get('sales')
+        ))
+        game_id = self.cursor.fetchone()[0]
+        self.titles.add(game_id, game_data)
+        return game_id
+
+    def _merge_duplicate(self, game_data: Dict):
+        """Adopt the title, platform and year of a catalog game this one duplicates"""
+        if not self.titles.ready:
+            self.titles.load(self.cursor)
+        match = self.titles.find_duplicate(game_data)
+        if match is None:
+            return
+        game_id, title, platform_id, release_year = match
+        if title != game_data['title']:
+            logger.info(f"Treating {game_data['title']!r} as duplicate of game {game_id} ({title!r})")
+            game_data['title'] = title
+        if game_data.get('platform_id') is None:
+            game_data['platform_id'] = platform_id
+        if game_data.get('release_year') is None:
+            game_data['release_year'] = release_year
+
+    def _rollback(self):
+        """Roll back and reload dimension IDs that may have been rolled back with it"""
+        self.conn.rollback()
+        try:
+            self.dimensions.preload()
+            self.conn.commit()
+        except Exception as e:
+            logger.error(f"Failed to reload dimension cache: {e}")
+            self.conn.rollback()
+
     def insert_game_data(self, game_data: Dict) -> bool:
         """Insert game data into database"""
         try:
-            # Check if developer exists or insert new
-            self.cursor.execute(
-                "INSERT INTO Developers (DeveloperName) VALUES (%s) ON CONFLICT DO NOTHING RETURNING DeveloperID",
-                (game_data.get('developer'),)
-            )
-            developer_id = self.cursor.fetchone()[0] if self.cursor.rowcount > 0 else None
-
-            # Similar checks for publisher, platform, genre
-            # ... (omitted for brevity)
-
-            # Insert game data
-            self.cursor.execute("""
-                INSERT INTO Games (
-                    Title, ReleaseYear, DeveloperID, PublisherID, 
-                    PlatformID, GenreID, MetacriticScore, UserScore, GlobalSales
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                game_data['title'],
-                game_data.get('release_year'),
-                developer_id,
-                game_data.get('publisher_id'),
-                game_data.get('platform_id'),
-                game_data.get('genre_id'),
-                game_data.get('metacritic_score'),
-                game_data.get('user_score'),
-                game_data.get('sales')
-            ))
-            
+            self.dimensions.resolve([game_data])
+            self._insert_game(game_data)
             self.conn.commit()
             return True
         except Exception as e:
             logger.error(f"Database insertion error: {e}")
-            self.conn.rollback()
+            self._rollback()
             return False
 
-    def load_games(self, game_names: List[str]):
-        """Main method to load multiple games"""
-        for name in game_names:
-            logger.info(f"Processing game: {name}")
-            
-            # Try API first
-            game_data = self.fetch_from_igdb(name)
-            
-            # Fallback to scraping if API fails
-            if not game_data:
-                game_data = self.scrape_metacritic(name)
+    def _insert_batch(self, games: List[Dict]) -> List[tuple]:
+        """Insert games under per-row savepoints, returning (game_id, error) per game"""
+        outcomes = []
+        for game_data in games:
+            self.cursor.execute("SAVEPOINT game_row")
+            try:
+                game_id = self._insert_game(game_data)
+                self.cursor.execute("RELEASE SAVEPOINT game_row")
+                outcomes.append((game_id, None))
+            except Exception as e:
+                self.cursor.execute("ROLLBACK TO SAVEPOINT game_row")
+                logger.warning(f"Failed to insert data for {game_data.get('title')}: {e}")
+                outcomes.append((None, str(e).strip()))
+        return outcomes
+
+    def insert_games_batch(self, games: List[Dict]) -> int:
+        """Insert a batch of games in one transaction, returning the insert count.
+
+        Each game runs under its own savepoint so one bad record does not
+        discard the rest of the batch.
+        """
+        try:
+            self.dimensions.resolve(games)
+            outcomes = self._insert_batch(games)
+            self.conn.commit()
+            return sum(1 for game_id, _ in outcomes if game_id is not None)
+        except Exception as e:
+            logger.error(f"Database batch insertion error: {e}")
+            self._rollback()
+            return 0
+
+    @staticmethod
+    def normalize_igdb(result: Dict) -> Dict:
+        """Map an IGDB game record onto the loader's game fields"""
+        release_year = None
+        if result.get('first_release_date'):
+            release_year = datetime.fromtimestamp(result['first_release_date'], tz=timezone.utc).year
+        platforms = result.get('platforms') or [{}]
+        genres = result.get('genres') or [{}]
+        companies = result.get('involved_companies') or []
+        developers = [c['company'].get('name') for c in companies if c.get('developer') and c.get('company')]
+        publishers = [c['company'].get('name') for c in companies if c.get('publisher') and c.get('company')]
+        return {
+            'title': result.get('name'),
+            'release_year': release_year,
+            'developer': developers[0] if developers else None,
+            'publisher': publishers[0] if publishers else None,
+            'platform': platforms[0].get('name'),
+            'genre': genres[0].get('name'),
+            # IGDB ratings are out of 100; UserScore is stored out of 10
+            'metacritic_score': round(result['aggregated_rating'], 1) if result.get('aggregated_rating') else None,
+            'user_score': round(result['rating'] / 10, 1) if result.get('rating') else None
+        }
+
+    @staticmethod
+    def normalize_metacritic(result: Dict) -> Dict:
+        """Map a scraped Metacritic page onto the loader's game fields"""
+        year = re.search(r'\d{4}', result.get('release_date') or '')
+        return {
+            'title': result.get('title'),
+            'release_year': int(year.group()) if year else None,
+            'platform': result.get('platform'),
+            'metacritic_score': result.get('score'),
+            'user_score': result.get('user_score')
+        }
+
+    def fetch_game(self, name: str, igdb_result: Optional[Dict] = None,
+                   igdb_searched: bool = False) -> Optional[Dict]:
+        """Fetch one game, trying the API first and falling back to scraping.
+
+        With igdb_searched, igdb_result is the title's answer from a batched
+        search and IGDB is not queried again.
+        """
+        logger.info(f"Processing game: {name}")
+        with LOADER_FETCH_SECONDS.time():
+            game_data = igdb_result if igdb_searched else self.fetch_from_igdb(name)
+            if game_data:
+                LOADER_GAMES.inc(outcome='igdb')
+                return self.normalize_igdb(game_data)
+            game_data = self.scrape_metacritic(name)
+            if game_data:
+                LOADER_GAMES.inc(outcome='metacritic')
+                return self.normalize_metacritic(game_data)
+        LOADER_GAMES.inc(outcome='not_found')
+        logger.warning(f"No data found for {name}")
+        return None
+
+    @LOADER_FLUSH_SECONDS.time()
+    def _flush(self, batch: List[tuple], stats: Dict, checkpoint: Optional[JobCheckpoint]):
+        """Insert one batch of (title, game_data) results and record their status"""
+        found = [(name, game_data) for name, game_data in batch if game_data]
+        missing = [(name, 'No data found') for name, game_data in batch if not game_data]
+        if checkpoint:
+            # Commit fetched payloads first so a failure below does not refetch them
+            checkpoint.mark_fetched(found)
+            checkpoint.mark_failed(missing)
+            self.conn.commit()
+        try:
+            # New dimension rows are committed before the games, so the cached
+            # IDs stay valid even if this batch is rolled back below
+            self.dimensions.resolve([game_data for _, game_data in found])
+            self.conn.commit()
+        except Exception as e:
+            logger.error(f"Dimension resolution error: {e}")
+            self._rollback()
+            stats['failed'] += len(found)
+            LOADER_GAMES.inc(len(found), outcome='insert_failed')
+            if checkpoint:
+                checkpoint.mark_failed([(name, f"Dimension resolution error: {e}") for name, _ in found])
+                self.conn.commit()
+            return
+        try:
+            outcomes = self._insert_batch([game_data for _, game_data in found])
+            if checkpoint:
+                checkpoint.mark_inserted([
+                    (name, game_id) for (name, _), (game_id, _) in zip(found, outcomes) if game_id is not None
+                ])
+                checkpoint.mark_failed([
+                    (name, error) for (name, _), (_, error) in zip(found, outcomes) if error
+                ])
+            self.conn.commit()
+            inserted = sum(1 for game_id, _ in outcomes if game_id is not None)
+            stats['inserted'] += inserted
+            stats['failed'] += len(outcomes) - inserted
+            LOADER_GAMES.inc(inserted, outcome='inserted')
+            LOADER_GAMES.inc(len(outcomes) - inserted, outcome='insert_failed')
+        except Exception as e:
+            logger.error(f"Database batch insertion error: {e}")
+            stats['failed'] += len(found)
+            LOADER_GAMES.inc(len(found), outcome='insert_failed')
+            self.conn.rollback()
+
+    def _write_results(self, results: queue.Queue, stats: Dict, checkpoint: Optional[JobCheckpoint],
+                       stop: threading.Event, failure: List[Exception]):
+        """Writer stage: drain fetched games and insert them in batches.
+
+        A partial batch is flushed when no new game arrives for a second,
+        so slow fetches do not hold finished work back. An error _flush
+        cannot recover from (e.g. a lost connection) is kept in failure and
+        sets stop; the queue is still drained so fetchers never block on it.
+        """
+        batch = []
+        while True:
+            try:
+                item = results.get(timeout=1.0)
+            except queue.Empty:
+                item = None
+            if item is not None and item is not _DONE:
+                batch.append(item)
+                if len(batch) < self.batch_size:
+                    continue
+            if batch and not stop.is_set():
+                try:
+                    self._flush(batch, stats, checkpoint)
+                except Exception as e:
+                    logger.error(f"Writer stopped, abandoning the load: {e}")
+                    failure.append(e)
+                    stop.set()
+            batch = []
+            if item is _DONE:
+                return
+
+    def load_games(self, game_names: List[str], job_name: Optional[str] = None,
+                   resume: bool = False) -> Dict:
+        """Main method to load multiple games.
+
+        Titles are grouped into IGDB multiquery batches of igdb_batch_size.
+        Each batch is one task on a bounded thread pool, and every title
+        then finishes as its own task: normalizing a batch answer, or its
+        own IGDB retry and Metacritic fallback. The shared keep-alive HTTP
+        client enforces per-source rate limits and retries. Fetched
+        games flow through a bounded queue to a single writer thread that
+        inserts them in batches.
+
+        With a job_name, per-title progress is checkpointed in LoadJobItems.
+        Resuming that job skips inserted titles and inserts already-fetched
+        payloads without fetching them again.
+
+        If the writer hits an error it cannot recover from, no new titles
+        are started and that error is raised once in-flight fetches finish.
+        """
+        stats = {'processed': 0, 'not_found': 0, 'inserted': 0, 'failed': 0, 'skipped': 0}
+        # Pick up games other processes added since the last load
+        self.titles.load(self.cursor)
+        self.conn.commit()
+        checkpoint = None
+        prefetched = {}
+        if job_name:
+            checkpoint = JobCheckpoint(self.cursor, job_name)
+            checkpoint.register(game_names)
+            if resume:
+                statuses = checkpoint.statuses()
+                prefetched = checkpoint.fetched_payloads()
+                remaining = [name for name in game_names if statuses.get(name) != INSERTED]
+                stats['skipped'] = len(game_names) - len(remaining)
+                game_names = remaining
+            self.conn.commit()
+            logger.info(f"Job {job_name}: {len(game_names)} titles to process, {stats['skipped']} already done")
+
+        results = queue.Queue(maxsize=self.batch_size * 2)
+        stop, failure = threading.Event(), []
+        writer = threading.Thread(target=self._write_results, args=(results, stats, checkpoint, stop, failure),
+                                  daemon=True)
+        writer.start()
+
+        # Cap in-flight titles so huge input lists are not queued up front;
+        # at least two groups' worth, so a group can always fill up
+        in_flight_limit = max(self.concurrency, self.igdb_batch_size) * 2
+        in_flight = threading.BoundedSemaphore(in_flight_limit)
+        stats_lock = threading.Lock()
+
+        def on_done(name, future):
+            try:
+                game_data = future.result()
+            except Exception as e:
+                logger.error(f"Unexpected error while fetching: {e}")
+                game_data = None
+            with stats_lock:
+                stats['processed'] += 1
                 if not game_data:
-                    logger.warning(f"No data found for {name}")
+                    stats['not_found'] += 1
+            if not stop.is_set():
+                results.put((name, game_data))
+            in_flight.release()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            def search_group(names):
+                try:
+                    answered = self.search_igdb(names)
+                except Exception as e:
+                    logger.error(f"Unexpected error in batched IGDB search: {e}")
+                    answered = {}
+                for name in names:
+                    if stop.is_set():
+                        in_flight.release()
+                        continue
+                    future = executor.submit(self.fetch_game, name, answered.get(name), name in answered)
+                    future.add_done_callback(lambda f, name=name: on_done(name, f))
+
+            group = []
+            for name in game_names:
+                if stop.is_set():
+                    break
+                if name in prefetched:
+                    with stats_lock:
+                        stats['processed'] += 1
+                    results.put((name, prefetched[name]))
                     continue
-            
-            # Process and insert data
-            if not self.insert_game_data(game_data):
-                logger.warning(f"Failed to insert data for {name}")
-            
-            # Rate limiting
-            time.sleep(1)
+                in_flight.acquire()
+                group.append(name)
+                if len(group) >= self.igdb_batch_size:
+                    executor.submit(search_group, group)
+                    group = []
+            if group:
+                executor.submit(search_group, group)
+            # Group tasks submit more tasks, so wait for every title to
+            # finish (all permits back) before the executor shuts down
+            for _ in range(in_flight_limit):
+                in_flight.acquire()
+
+        results.put(_DONE)
+        writer.join()
+        if failure:
+            raise failure[0]
+        logger.info(f"Loaded {stats['inserted']} of {stats['processed']} games "
+                    f"({stats['not_found']} not found, {stats['failed']} failed, {stats['skipped']} skipped)")
+        return stats
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load game data from IGDB/Metacritic")
+    parser.add_argument('titles_file', nargs='?', help="File with one game title per line")
+    parser.add_argument('--job', help="Job name used to checkpoint progress")
+    parser.add_argument('--resume', action='store_true', help="Skip titles the job already finished")
+    parser.add_argument('--cache-only', action='store_true', help="Use cached responses only, no network")
+    parser.add_argument('--concurrency', type=int, default=LOADER_CONCURRENCY)
+    parser.add_argument('--igdb-batch-size', type=int, default=IGDB_BATCH_SIZE,
+                        help="Titles per IGDB multiquery request (at most 10)")
+    parser.add_argument('--metrics-file', help="Write fetch/retry/insert metrics here when done "
+                                               "(Prometheus text format, e.g. for a textfile collector)")
+    args = parser.parse_args(argv)
+    if args.resume and not args.job:
+        parser.error("--resume requires --job")
+    return args
 
 if __name__ == "__main__":
-    loader = GameDataLoader()
-    games_to_load = [
-        "The Legend of Zelda: Breath of the Wild",
-        "Elden Ring",
-        "God of War Ragnarök"
-    ]
-    loader.load_games(games_to_load)
\ No newline at end of file
+    args = parse_args()
+    loader = GameDataLoader(concurrency=args.concurrency, cache_only=args.cache_only or LOADER_CACHE_ONLY,
+                            igdb_batch_size=min(10, args.igdb_batch_size))
+    if args.titles_file:
+        with open(args.titles_file, encoding='utf-8') as f:
+            games_to_load = [line.strip() for line in f if line.strip()]
+    else:
+        games_to_load = [
+            "The Legend of Zelda: Breath of the Wild",
+            "Elden Ring",
+            "God of War Ragnarök"
+        ]
+    try:
+        loader.load_games(games_to_load, job_name=args.job, resume=args.resume)
+    finally:
+        if args.metrics_file:
+            REGISTRY.write(args.metrics_file)
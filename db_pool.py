@@ -0,0 +1,198 @@
+import psycopg2
+import psycopg2.extensions
+from psycopg2 import pool as pg_pool
+import os
+import select
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the connection itself is unusable and must be replaced
+CONNECTION_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError)
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the checkout timeout"""
+
+
+class ConnectionPool:
+    """Thread-safe psycopg2 connection pool with health checks and reconnects"""
+    def __init__(self, db_config: Dict, min_size: int = 1, max_size: int = 10,
+                 checkout_timeout: float = 30.0, health_check_interval: float = 30.0):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Invalid pool size: need 0 <= min_size <= max_size and max_size >= 1")
+        self.db_config = db_config
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+        self._pool = pg_pool.ThreadedConnectionPool(min_size, max_size, **db_config)
+        # ThreadedConnectionPool raises as soon as it is exhausted; the semaphore
+        # makes callers wait for a free slot instead.
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._last_used = {}
+        self._lock = threading.Lock()
+
+    def _is_healthy(self, conn) -> bool:
+        """Check that a pooled connection is still usable"""
+        if conn.closed:
+            return False
+        with self._lock:
+            last_used = self._last_used.get(id(conn), 0)
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except CONNECTION_ERRORS:
+            return False
+
+    def getconn(self):
+        """Check out a healthy connection, reconnecting if needed"""
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            raise PoolTimeout(f"No database connection available after {self.checkout_timeout}s")
+        try:
+            conn = self._pool.getconn()
+            if not self._is_healthy(conn):
+                logger.warning("Discarding broken database connection, reconnecting")
+                self._discard(conn)
+                conn = self._pool.getconn()
+            return conn
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn, broken: bool = False):
+        """Return a connection to the pool, closing it if it is broken"""
+        try:
+            if broken or conn.closed:
+                self._discard(conn)
+            else:
+                with self._lock:
+                    self._last_used[id(conn)] = time.monotonic()
+                self._pool.putconn(conn)
+        finally:
+            self._slots.release()
+
+    def _discard(self, conn):
+        with self._lock:
+            self._last_used.pop(id(conn), None)
+        self._pool.putconn(conn, close=True)
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for one unit of work.
+
+        Commits on success and rolls back on error. Connections that fail
+        with an operational error are dropped from the pool.
+        """
+        conn = self.getconn()
+        broken = False
+        try:
+            yield conn
+            conn.commit()
+        except CONNECTION_ERRORS:
+            broken = True
+            raise
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            self.putconn(conn, broken=broken)
+
+    @contextmanager
+    def cursor(self):
+        """Yield a cursor on a pooled connection within a transaction"""
+        with self.connection() as conn:
+            with conn.cursor() as cursor:
+                yield cursor
+
+    def run(self, func: Callable, retries: int = 1):
+        """Run func(cursor) in a transaction, retrying on a fresh connection.
+
+        Only connection failures are retried, so a restarted database does
+        not fail requests; func must be safe to repeat.
+        """
+        attempt = 0
+        while True:
+            try:
+                with self.cursor() as cursor:
+                    return func(cursor)
+            except CONNECTION_ERRORS as e:
+                if attempt >= retries:
+                    raise
+                attempt += 1
+                logger.warning(f"Database connection lost ({e}), retrying on a new connection")
+
+    def close(self):
+        """Close all pooled connections"""
+        self._pool.closeall()
+
+
+def create_pool(db_config: Dict, env: Optional[Dict] = None) -> ConnectionPool:
+    """Build a pool sized from DB_POOL_* environment settings"""
+    env = env if env is not None else os.environ
+    return ConnectionPool(
+        db_config,
+        min_size=int(env.get('DB_POOL_MIN', 1)),
+        max_size=int(env.get('DB_POOL_MAX', 10)),
+        checkout_timeout=float(env.get('DB_POOL_TIMEOUT', 30)),
+        health_check_interval=float(env.get('DB_POOL_HEALTH_CHECK_INTERVAL', 30))
+    )
+
+
+class NotificationListener(threading.Thread):
+    """Background thread that delivers Postgres NOTIFY payloads to a callback.
+
+    Uses its own dedicated connection, since LISTEN needs a connection that
+    stays open outside any pooled transaction. Reconnects after failures and
+    then calls the callback with None, since notifications sent while
+    disconnected are lost.
+    """
+    def __init__(self, db_config: Dict, channel: str, callback: Callable[[Optional[str]], None],
+                 poll_interval: float = 5.0, reconnect_delay: float = 5.0):
+        super().__init__(name=f"pg-listen-{channel}", daemon=True)
+        self.db_config = db_config
+        self.channel = channel
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.reconnect_delay = reconnect_delay
+        self._stop_event = threading.Event()
+        self._reconnecting = False
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self._listen()
+            except Exception as e:
+                logger.warning(f"LISTEN {self.channel} failed ({e}), reconnecting")
+                self._stop_event.wait(self.reconnect_delay)
+
+    def _listen(self):
+        conn = psycopg2.connect(**self.db_config)
+        try:
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.channel}")
+            if self._reconnecting:
+                self.callback(None)
+            self._reconnecting = True
+            while not self._stop_event.is_set():
+                if select.select([conn], [], [], self.poll_interval) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    self.callback(notify.payload)
+        finally:
+            conn.close()
+
+    def stop(self):
+        self._stop_event.set()
@@ -0,0 +1,54 @@
+from psycopg2.extras import execute_values
+from typing import Dict, List
+
+# Game field -> (table, id column, name column, name length)
+DIMENSIONS = {
+    'developer': ('Developers', 'DeveloperID', 'DeveloperName', 100),
+    'publisher': ('Publishers', 'PublisherID', 'PublisherName', 100),
+    'platform': ('Platforms', 'PlatformID', 'PlatformName', 50),
+    'genre': ('Genres', 'GenreID', 'GenreName', 50)
+}
+
+
+class DimensionCache:
+    """In-memory name -> ID maps for the developer/publisher/platform/genre tables"""
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.ids = {dimension: {} for dimension in DIMENSIONS}
+
+    def preload(self):
+        """Load every dimension table, one query per table"""
+        for dimension, (table, id_column, name_column, _) in DIMENSIONS.items():
+            self.cursor.execute(f"SELECT {name_column}, {id_column} FROM {table}")
+            self.ids[dimension] = dict(self.cursor.fetchall())
+
+    @staticmethod
+    def _name(game_data: Dict, dimension: str):
+        name = game_data.get(dimension)
+        if not name:
+            return None
+        return str(name).strip()[:DIMENSIONS[dimension][3]] or None
+
+    def resolve(self, games: List[Dict]):
+        """Fill <dimension>_id on each game, upserting unknown names in bulk.
+
+        Misses across the whole batch cost one INSERT ... ON CONFLICT ...
+        RETURNING per dimension. IDs already set on a game are kept.
+        """
+        for dimension, (table, id_column, name_column, _) in DIMENSIONS.items():
+            known = self.ids[dimension]
+            missing = list(dict.fromkeys(
+                name for name in (self._name(game, dimension) for game in games)
+                if name and name not in known
+            ))
+            if missing:
+                rows = execute_values(self.cursor, f"""
+                    INSERT INTO {table} ({name_column}) VALUES %s
+                    ON CONFLICT ({name_column}) DO UPDATE SET {name_column} = EXCLUDED.{name_column}
+                    RETURNING {name_column}, {id_column}
+                """, [(name,) for name in missing], page_size=len(missing), fetch=True)
+                known.update(rows)
+            id_field = f"{dimension}_id"
+            for game in games:
+                if game.get(id_field) is None:
+                    game[id_field] = known.get(self._name(game, dimension))
@@ -0,0 +1,131 @@
+from itertools import product
+from typing import Dict, List, Tuple
+
+# Selectable response fields -> SQL expression. Decimals are cast so they
+# serialize as JSON numbers.
+LISTING_FIELDS = {
+    'game_id': 'g.GameID',
+    'title': 'g.Title',
+    'release_year': 'g.ReleaseYear',
+    'developer_id': 'g.DeveloperID',
+    'publisher_id': 'g.PublisherID',
+    'platform_id': 'g.PlatformID',
+    'platform': 'p.PlatformName',
+    'genre_id': 'g.GenreID',
+    'genre': 'gn.GenreName',
+    'metacritic_score': 'g.MetacriticScore::float',
+    'user_score': 'g.UserScore::float',
+    'global_sales': 'g.GlobalSales::float'
+}
+DEFAULT_FIELDS = ['game_id', 'title', 'release_year', 'platform', 'genre',
+                  'metacritic_score', 'user_score', 'global_sales']
+
+# Joins needed by fields that live in dimension tables
+FIELD_JOINS = {
+    'platform': 'LEFT JOIN Platforms p ON p.PlatformID = g.PlatformID',
+    'genre': 'LEFT JOIN Genres gn ON gn.GenreID = g.GenreID'
+}
+
+# Id filters -> column; they accept comma lists
+ID_FILTERS = {
+    'platform_id': 'g.PlatformID',
+    'genre_id': 'g.GenreID'
+}
+# Query parameter -> (SQL condition, type) for the remaining filters
+LISTING_FILTERS = {
+    'year_from': ('g.ReleaseYear >= %s', int),
+    'year_to': ('g.ReleaseYear <= %s', int),
+    'score_min': ('g.MetacriticScore >= %s', float),
+    'score_max': ('g.MetacriticScore <= %s', float)
+}
+
+
+# A multi-value id filter is split into one branch per value combination,
+# each an ordered (PlatformID/GenreID, GameID) index scan; past this many
+# branches the filter falls back to a single = ANY() scan
+MAX_KEYSET_BRANCHES = 32
+
+
+class ListingQueryError(ValueError):
+    """Raised when listing query parameters are invalid"""
+
+
+def _parse(name: str, raw: str, kind):
+    try:
+        if name in ID_FILTERS:
+            # Deduplicated, so no game can come from two branches
+            return list(dict.fromkeys(kind(value) for value in raw.split(',') if value.strip()))
+        return kind(raw)
+    except ValueError:
+        raise ListingQueryError(f"Invalid value for {name}: {raw!r}")
+
+
+def build_listing_query(args: Dict[str, str], default_limit: int = 50,
+                        max_limit: int = 500) -> Tuple[str, list, List[str], int]:
+    """Translate request arguments into (sql, params, fields, limit).
+
+    Pages are keyed on GameID: `after` is the last GameID of the previous
+    page, so each page is a range scan instead of an OFFSET that rereads
+    every earlier row. One extra row is fetched to tell whether another
+    page exists.
+
+    Platform/genre equality walks the (PlatformID/GenreID, GameID) indexes
+    from migrations/006 already in GameID order, so those pages cost the
+    same at any depth. Several values become a UNION ALL of one such scan
+    per value combination, each stopping after a page of rows. Year and
+    score filters are checked on the rows being walked, so a page costs
+    more the fewer rows they match.
+    """
+    fields = [field.strip() for field in args.get('fields', '').split(',') if field.strip()] or DEFAULT_FIELDS
+    unknown = [field for field in fields if field not in LISTING_FIELDS]
+    if unknown:
+        raise ListingQueryError(f"Unknown fields: {', '.join(unknown)}")
+    if 'game_id' not in fields:
+        # Needed to build the next cursor
+        fields = ['game_id'] + fields
+
+    limit = _parse('limit', args.get('limit', str(default_limit)), int)
+    if not 1 <= limit <= max_limit:
+        raise ListingQueryError(f"limit must be between 1 and {max_limit}")
+
+    conditions, params = [], []
+    if args.get('after'):
+        conditions.append('g.GameID > %s')
+        params.append(_parse('after', args['after'], int))
+    for name, (condition, kind) in LISTING_FILTERS.items():
+        if args.get(name):
+            conditions.append(condition)
+            params.append(_parse(name, args[name], kind))
+    id_values = {name: _parse(name, args[name], int) for name in ID_FILTERS if args.get(name)}
+    branches = list(product(*id_values.values()))
+    columns = [ID_FILTERS[name] for name in id_values]
+
+    select = (
+        f"SELECT {', '.join(LISTING_FIELDS[field] for field in fields)} "
+        f"FROM Games g {' '.join(FIELD_JOINS[field] for field in FIELD_JOINS if field in fields)}"
+    )
+    if 1 < len(branches) <= MAX_KEYSET_BRANCHES:
+        branch_sql = (
+            "(SELECT g.GameID FROM Games g WHERE "
+            f"{' AND '.join(conditions + [f'{column} = %s' for column in columns])} "
+            "ORDER BY g.GameID LIMIT %s)"
+        )
+        branch_params = []
+        for values in branches:
+            branch_params += params + list(values) + [limit + 1]
+        sql = (
+            f"{select} JOIN (SELECT GameID FROM ({' UNION ALL '.join([branch_sql] * len(branches))}) branches "
+            "ORDER BY GameID LIMIT %s) page ON page.GameID = g.GameID ORDER BY g.GameID"
+        )
+        return sql, branch_params + [limit + 1], fields, limit
+
+    if len(branches) == 1:
+        # Also the case without id filters: one empty combination
+        conditions += [f"{column} = %s" for column in columns]
+        params += list(branches[0])
+    else:
+        conditions += [f"{column} = ANY(%s)" for column in columns]
+        params += list(id_values.values())
+    sql = f"{select} {'WHERE ' + ' AND '.join(conditions) if conditions else ''} ORDER BY g.GameID LIMIT %s"
+    params.append(limit + 1)
+    return sql, params, fields, limit
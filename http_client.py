@@ -0,0 +1,175 @@
+import random
+import threading
+import time
+import logging
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from response_cache import CacheMiss, ResponseCache
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    'http_client_request_duration_seconds', 'Outbound request latency per attempt', ['source'])
+HTTP_REQUESTS = REGISTRY.counter(
+    'http_client_requests_total', 'Outbound request attempts by status (or error)', ['source', 'status'])
+HTTP_RETRIES = REGISTRY.counter(
+    'http_client_retries_total', 'Outbound requests retried after a failure', ['source'])
+HTTP_CACHE = REGISTRY.counter(
+    'http_client_cache_total', 'Response cache outcomes: hit, revalidated or miss', ['source', 'result'])
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting requests per second"""
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class HttpClient:
+    """Shared keep-alive HTTP session with per-source rate limits and retries"""
+    def __init__(self, rate_limits: Optional[Dict[str, TokenBucket]] = None,
+                 max_retries: int = 4, backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 timeout: float = 15.0, pool_size: int = 10,
+                 cache: Optional[ResponseCache] = None, cache_only: bool = False):
+        if cache_only and cache is None:
+            raise ValueError("cache_only mode needs a response cache")
+        self.rate_limits = rate_limits or {}
+        self.cache = cache
+        self.cache_only = cache_only
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """Delay before the next attempt, honouring Retry-After when given"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    @staticmethod
+    def _cache_key(source: str, method: str, url: str, kwargs: Dict) -> str:
+        return ResponseCache.make_key(source, method, url, kwargs.get('params'), kwargs.get('data'))
+
+    def is_cached(self, source: str, method: str, url: str, **kwargs) -> bool:
+        """Whether request() would answer this request without the network"""
+        if self.cache is None:
+            return False
+        cached = self.cache.get(self._cache_key(source, method, url, kwargs))
+        return cached is not None and (cached.is_fresh or self.cache_only)
+
+    def store(self, source: str, method: str, url: str, body: bytes,
+              headers: Optional[Dict] = None, **kwargs):
+        """Cache body as the response to a request that was answered another way,
+        e.g. as one part of a batched request"""
+        if self.cache is not None:
+            self.cache.put_body(self._cache_key(source, method, url, kwargs), source, url, body, headers or {})
+
+    def request(self, source: str, method: str, url: str, use_cache: bool = True,
+                **kwargs) -> requests.Response:
+        """Send a request for a source, answering from the response cache when possible.
+
+        Fresh cache entries are returned without touching the network; stale
+        entries are revalidated with If-None-Match/If-Modified-Since. In
+        cache-only mode the network is never used and missing entries raise
+        CacheMiss. With use_cache=False the cache is neither read nor written.
+        """
+        if self.cache is None or not use_cache:
+            if self.cache_only:
+                raise CacheMiss(f"Uncacheable {source} request to {url} in cache-only mode")
+            return self._send(source, method, url, **kwargs)
+
+        key = self._cache_key(source, method, url, kwargs)
+        cached = self.cache.get(key)
+        if cached is not None and (cached.is_fresh or self.cache_only):
+            HTTP_CACHE.inc(source=source, result='hit')
+            return cached.to_response()
+        if self.cache_only:
+            HTTP_CACHE.inc(source=source, result='miss')
+            raise CacheMiss(f"No cached {source} response for {url}")
+
+        if cached is not None and cached.validators:
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), **cached.validators}
+        response = self._send(source, method, url, **kwargs)
+        if response.status_code == 304 and cached is not None:
+            HTTP_CACHE.inc(source=source, result='revalidated')
+            self.cache.refresh(key, source)
+            return cached.to_response()
+        HTTP_CACHE.inc(source=source, result='miss')
+        self.cache.put(key, source, response)
+        return response
+
+    def _send(self, source: str, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request for a source, retrying on 429/5xx and connection errors.
+
+        Every attempt, retries included, takes a token from the source's
+        rate limiter. The final response is returned with raise_for_status
+        already applied.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        limiter = self.rate_limits.get(source)
+        attempt = 0
+        while True:
+            if limiter:
+                limiter.acquire()
+            response = None
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+                HTTP_REQUESTS.inc(source=source, status=response.status_code)
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    return response
+                error = requests.HTTPError(f"{response.status_code} from {source}", response=response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                HTTP_REQUESTS.inc(source=source, status=type(e).__name__)
+                error = e
+            finally:
+                HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, source=source)
+            if attempt >= self.max_retries:
+                raise error
+            delay = self._backoff(attempt, response)
+            logger.warning(f"{source} request failed ({error}), retrying in {delay:.1f}s")
+            HTTP_RETRIES.inc(source=source)
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, source: str, url: str, **kwargs) -> requests.Response:
+        return self.request(source, 'GET', url, **kwargs)
+
+    def post(self, source: str, url: str, **kwargs) -> requests.Response:
+        return self.request(source, 'POST', url, **kwargs)
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,162 @@
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional
+
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# Parse processes for scraped pages; 0 parses in the calling thread
+METACRITIC_PARSE_WORKERS = int(os.getenv('METACRITIC_PARSE_WORKERS', min(4, os.cpu_count() or 1)))
+# Characters fed to the parser per step; parsing stops once all fields are found
+FEED_CHUNK_SIZE = 16 * 1024
+
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+
+
+def _selector(tag: str, classes=(), **attributes):
+    """Compile a tag/class/attribute match into a predicate over elements"""
+    classes = frozenset(classes)
+
+    def matches(element) -> bool:
+        if element.tag != tag:
+            return False
+        if classes and not classes <= set((element.get('class') or '').split()):
+            return False
+        return all(element.get(name) == value for name, value in attributes.items())
+    return matches
+
+
+# Game page field -> selector; the first matching element wins
+GAME_SELECTORS = {
+    'title': _selector('h1'),
+    'score': _selector('span', itemprop='ratingValue'),
+    'user_score': _selector('div', ('metascore_w', 'user')),
+    'platform': _selector('span', ('platform',)),
+    'release_date': _selector('span', ('release_date',))
+}
+SEARCH_RESULT = _selector('div', ('result_wrap',))
+
+
+def _text(element) -> str:
+    return ''.join(element.itertext()).strip()
+
+
+def _number(text: str) -> Optional[float]:
+    """Scores like "87" or "8.4"; "tbd" and blanks become None"""
+    match = _NUMBER.search(text or '')
+    return float(match.group()) if match else None
+
+
+def _pull(html: str, on_end) -> None:
+    """Feed html to a pull parser in chunks until on_end(element) returns True.
+
+    Only the page prefix up to the last needed element is parsed, and
+    text is read when each element closes. A blank page has no elements.
+    """
+    if not html or html.isspace():
+        return
+    parser = etree.HTMLPullParser(events=('end',))
+    for start in range(0, len(html), FEED_CHUNK_SIZE):
+        parser.feed(html[start:start + FEED_CHUNK_SIZE])
+        for _, element in parser.read_events():
+            if on_end(element):
+                return
+    parser.close()
+    for _, element in parser.read_events():
+        if on_end(element):
+            return
+
+
+def parse_search_page(html: str) -> Optional[str]:
+    """Link of the first search result, or None when there are no results"""
+    found = []
+
+    def on_end(element) -> bool:
+        if SEARCH_RESULT(element):
+            link = element.find('.//a[@href]')
+            if link is not None:
+                found.append(link.get('href'))
+                return True
+        return False
+
+    _pull(html, on_end)
+    return found[0] if found else None
+
+
+def parse_game_page(html: str) -> Optional[Dict]:
+    """Title, scores, platform and release date from a game page.
+
+    Returns None without a title; other missing or unparseable fields
+    are None.
+    """
+    fields = {}
+
+    def on_end(element) -> bool:
+        for field, matches in GAME_SELECTORS.items():
+            if field not in fields and matches(element):
+                fields[field] = _text(element)
+        return len(fields) == len(GAME_SELECTORS)
+
+    _pull(html, on_end)
+    if not fields.get('title'):
+        return None
+    return {
+        'title': fields['title'],
+        'score': _number(fields.get('score')),
+        'user_score': _number(fields.get('user_score')),
+        'platform': fields.get('platform') or None,
+        'release_date': fields.get('release_date') or None
+    }
+
+
+class ParserPool:
+    """Runs page parsing in worker processes, apart from the fetching threads.
+
+    Fetch threads block on the result while another core parses, so
+    parsing no longer contends for the loader's GIL. The pool starts on
+    first use and is replaced if a worker dies; with workers=0 pages are
+    parsed inline.
+    """
+    def __init__(self, workers: int = METACRITIC_PARSE_WORKERS):
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _run(self, func, html: str):
+        if not self.workers:
+            return func(html)
+        executor = self._executor or self._start()
+        try:
+            return executor.submit(func, html).result()
+        except BrokenProcessPool:
+            # A dead worker breaks the whole pool; retry once on a fresh one
+            logger.warning("Metacritic parser pool broke, restarting it")
+            return self._start(broken=executor).submit(func, html).result()
+
+    def _start(self, broken: Optional[ProcessPoolExecutor] = None) -> ProcessPoolExecutor:
+        """The current executor, created if missing or if it is the broken one"""
+        with self._lock:
+            if self._executor is None or self._executor is broken:
+                if broken is not None:
+                    broken.shutdown(wait=False)
+                # Spawned workers don't inherit the loader's DB connection or threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def search_page(self, html: str) -> Optional[str]:
+        return self._run(parse_search_page, html)
+
+    def game_page(self, html: str) -> Optional[Dict]:
+        return self._run(parse_game_page, html)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,185 @@
+import bisect
+import os
+import threading
+import time
+from contextlib import ContextDecorator
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Set METRICS_ENABLED=0 to turn every observation into a no-op
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') == '1'
+
+# Seconds; covers sub-millisecond cache hits up to slow analytics queries
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        if not METRICS_ENABLED:
+            return
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in values]
+
+
+class Histogram:
+    """Bucketed distribution of observations, e.g. latencies in seconds"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last is +Inf), sum]
+        self._values: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        if not METRICS_ENABLED:
+            return
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def time(self, **labels) -> 'timed':
+        return timed(self, **labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        lines = []
+        for key, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                labels = _format_labels(self.labelnames, key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class timed(ContextDecorator):
+    """Observe elapsed seconds into a histogram, as a context manager or decorator"""
+    def __init__(self, histogram: Histogram, **labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self._start, **self.labels)
+        return False
+
+    def _recreate_cm(self):
+        # A fresh timer per decorated call, so concurrent calls don't share _start
+        return timed(self.histogram, **self.labels)
+
+
+class MetricsRegistry:
+    """Named metrics plus collectors for values read at scrape time"""
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, Dict, float]]]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets)
+
+    def register_collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, Dict, float]]]):
+        """Add a callable yielding (name, kind, help, labels, value) samples on each scrape"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def register_cache(self, cache_name: str, cache):
+        """Export a TTLCache's hit/miss counters and size"""
+        def collect():
+            stats = cache.stats()
+            labels = {'cache': cache_name}
+            yield 'cache_hits_total', 'counter', 'Cache lookups answered from the cache', labels, stats['hits']
+            yield 'cache_misses_total', 'counter', 'Cache lookups that missed', labels, stats['misses']
+            yield 'cache_entries', 'gauge', 'Entries currently cached', labels, stats['size']
+        self.register_collector(collect)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+            collectors = list(self._collectors)
+        for name, metric in metrics:
+            samples = metric.samples()
+            if samples:
+                lines.append(f"# HELP {name} {metric.help}")
+                lines.append(f"# TYPE {name} {metric.kind}")
+                lines.extend(samples)
+        collected: Dict[str, list] = {}
+        for collector in collectors:
+            for name, kind, help_text, labels, value in collector():
+                collected.setdefault(name, [kind, help_text, []])[2].append((labels, value))
+        for name, (kind, help_text, samples) in sorted(collected.items()):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str):
+        """Write render() atomically, e.g. for node_exporter's textfile collector"""
+        staging = f"{path}.tmp"
+        with open(staging, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(staging, path)
+
+
+REGISTRY = MetricsRegistry()
+
+# Metrics shared across modules
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    'db_query_duration_seconds', 'Database statement latency', ['statement'])
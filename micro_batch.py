@@ -0,0 +1,63 @@
+import queue
+import threading
+import time
+import logging
+from concurrent.futures import Future
+from typing import Any, Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Merges concurrent single-item calls into batched calls.
+
+    Items submitted from request threads are collected by one worker thread
+    for up to max_wait seconds (or until max_batch items arrive) and passed
+    to batch_func as a list. batch_func must return one result per item.
+    """
+    def __init__(self, batch_func: Callable[[List[Any]], List[Any]],
+                 max_batch: int = 64, max_wait: float = 0.005):
+        self.batch_func = batch_func
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._worker.start()
+
+    def submit(self, item: Any) -> Future:
+        """Queue an item and return a future for its result"""
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def __call__(self, item: Any, timeout: float = None) -> Any:
+        """Submit an item and wait for its result"""
+        return self.submit(item).result(timeout=timeout)
+
+    def _collect(self) -> List[tuple]:
+        """Block for the first item, then gather more until the window closes"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+            try:
+                results = self.batch_func(items)
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                logger.error(f"Batched call failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
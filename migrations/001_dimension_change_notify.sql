@@ -0,0 +1,28 @@
+-- Notify listeners whenever a dimension table changes, so API processes can
+-- invalidate their cached developer/publisher/platform/genre lists.
+CREATE OR REPLACE FUNCTION notify_dimension_change() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('dimension_changed', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS developers_changed ON Developers;
+CREATE TRIGGER developers_changed
+    AFTER INSERT OR UPDATE OR DELETE ON Developers
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_dimension_change();
+
+DROP TRIGGER IF EXISTS publishers_changed ON Publishers;
+CREATE TRIGGER publishers_changed
+    AFTER INSERT OR UPDATE OR DELETE ON Publishers
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_dimension_change();
+
+DROP TRIGGER IF EXISTS platforms_changed ON Platforms;
+CREATE TRIGGER platforms_changed
+    AFTER INSERT OR UPDATE OR DELETE ON Platforms
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_dimension_change();
+
+DROP TRIGGER IF EXISTS genres_changed ON Genres;
+CREATE TRIGGER genres_changed
+    AFTER INSERT OR UPDATE OR DELETE ON Genres
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_dimension_change();
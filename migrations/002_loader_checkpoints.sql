@@ -0,0 +1,83 @@
+-- Checkpoint tables for resumable loader runs
+CREATE TABLE IF NOT EXISTS LoadJobs (
+    JobID SERIAL PRIMARY KEY,
+    JobName VARCHAR(100) NOT NULL UNIQUE,
+    CreatedAt TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS LoadJobItems (
+    JobID INT NOT NULL REFERENCES LoadJobs(JobID) ON DELETE CASCADE,
+    Title VARCHAR(255) NOT NULL,
+    Status VARCHAR(10) NOT NULL DEFAULT 'pending'
+        CHECK (Status IN ('pending', 'fetched', 'inserted', 'failed')),
+    Reason TEXT,
+    Payload JSONB,
+    GameID INT REFERENCES Games(GameID) ON DELETE SET NULL,
+    UpdatedAt TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (JobID, Title)
+);
+
+CREATE INDEX IF NOT EXISTS loadjobitems_status ON LoadJobItems (JobID, Status);
+
+-- Games removed as duplicates of another game, kept for manual review
+CREATE TABLE IF NOT EXISTS GamesDuplicateArchive (
+    GameID INT PRIMARY KEY,
+    KeptGameID INT NOT NULL,
+    Title VARCHAR(255) NOT NULL,
+    ReleaseYear INT,
+    DeveloperID INT,
+    PublisherID INT,
+    PlatformID INT,
+    GenreID INT,
+    MetacriticScore DECIMAL(3,1),
+    UserScore DECIMAL(3,1),
+    GlobalSales DECIMAL(10,2),
+    ArchivedAt TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Archives and deletes the games listed in the temporary table
+-- duplicate_games (GameID, KeptGameID), re-pointing checkpoint rows at
+-- the kept game first. Returns how many games were archived.
+CREATE OR REPLACE FUNCTION archive_duplicate_games() RETURNS INT AS $$
+DECLARE
+    archived INT;
+BEGIN
+    INSERT INTO GamesDuplicateArchive (
+        GameID, KeptGameID, Title, ReleaseYear, DeveloperID, PublisherID,
+        PlatformID, GenreID, MetacriticScore, UserScore, GlobalSales
+    )
+    SELECT g.GameID, d.KeptGameID, g.Title, g.ReleaseYear, g.DeveloperID, g.PublisherID,
+           g.PlatformID, g.GenreID, g.MetacriticScore, g.UserScore, g.GlobalSales
+    FROM Games g
+    JOIN duplicate_games d ON d.GameID = g.GameID;
+    GET DIAGNOSTICS archived = ROW_COUNT;
+
+    UPDATE LoadJobItems i SET GameID = d.KeptGameID
+    FROM duplicate_games d
+    WHERE i.GameID = d.GameID;
+
+    DELETE FROM Games g USING duplicate_games d WHERE g.GameID = d.GameID;
+    IF archived > 0 THEN
+        RAISE NOTICE 'Archived % duplicate games in GamesDuplicateArchive', archived;
+    END IF;
+    DROP TABLE duplicate_games;
+    RETURN archived;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Natural key for idempotent re-ingestion: title + platform + release year.
+-- Resolve existing duplicates first, keeping the oldest row of each key.
+CREATE TEMPORARY TABLE duplicate_games AS
+SELECT GameID, KeptGameID
+FROM (
+    SELECT GameID, MIN(GameID) OVER (
+        PARTITION BY Title, COALESCE(PlatformID, 0), COALESCE(ReleaseYear, 0)
+    ) AS KeptGameID
+    FROM Games
+) ranked
+WHERE GameID <> KeptGameID;
+SELECT archive_duplicate_games();
+
+-- COALESCE makes rows with a missing platform or year still collide
+CREATE UNIQUE INDEX IF NOT EXISTS games_natural_key
+    ON Games (Title, COALESCE(PlatformID, 0), COALESCE(ReleaseYear, 0));
@@ -0,0 +1,52 @@
+-- Unique dimension names so the loader can resolve them with upserts.
+-- Point games at the oldest row of each duplicated name, then drop the rest.
+UPDATE Games g SET DeveloperID = keep.DeveloperID
+FROM Developers d
+JOIN (SELECT DeveloperName, MIN(DeveloperID) AS DeveloperID FROM Developers GROUP BY DeveloperName) keep
+    ON keep.DeveloperName = d.DeveloperName
+WHERE g.DeveloperID = d.DeveloperID AND d.DeveloperID <> keep.DeveloperID;
+DELETE FROM Developers d USING Developers k
+WHERE d.DeveloperName = k.DeveloperName AND d.DeveloperID > k.DeveloperID;
+CREATE UNIQUE INDEX IF NOT EXISTS developers_name_key ON Developers (DeveloperName);
+
+UPDATE Games g SET PublisherID = keep.PublisherID
+FROM Publishers p
+JOIN (SELECT PublisherName, MIN(PublisherID) AS PublisherID FROM Publishers GROUP BY PublisherName) keep
+    ON keep.PublisherName = p.PublisherName
+WHERE g.PublisherID = p.PublisherID AND p.PublisherID <> keep.PublisherID;
+DELETE FROM Publishers p USING Publishers k
+WHERE p.PublisherName = k.PublisherName AND p.PublisherID > k.PublisherID;
+CREATE UNIQUE INDEX IF NOT EXISTS publishers_name_key ON Publishers (PublisherName);
+
+-- PlatformID is part of the games_natural_key index (002), so a title
+-- loaded once under each copy of a platform name would collide once both
+-- point at the same row. Archive those games first, keeping the oldest
+-- (see archive_duplicate_games in 002), then re-point the survivors.
+CREATE TEMPORARY TABLE platform_remap AS
+SELECT p.PlatformID, keep.PlatformID AS KeptPlatformID
+FROM Platforms p
+JOIN (SELECT PlatformName, MIN(PlatformID) AS PlatformID FROM Platforms GROUP BY PlatformName) keep
+    ON keep.PlatformName = p.PlatformName
+WHERE p.PlatformID <> keep.PlatformID;
+
+CREATE TEMPORARY TABLE duplicate_games AS
+SELECT GameID, KeptGameID
+FROM (
+    SELECT g.GameID, MIN(g.GameID) OVER (
+        PARTITION BY g.Title, COALESCE(r.KeptPlatformID, g.PlatformID, 0), COALESCE(g.ReleaseYear, 0)
+    ) AS KeptGameID
+    FROM Games g
+    LEFT JOIN platform_remap r ON r.PlatformID = g.PlatformID
+) ranked
+WHERE GameID <> KeptGameID;
+SELECT archive_duplicate_games();
+
+UPDATE Games g SET PlatformID = r.KeptPlatformID
+FROM platform_remap r
+WHERE g.PlatformID = r.PlatformID;
+DROP TABLE platform_remap;
+DELETE FROM Platforms p USING Platforms k
+WHERE p.PlatformName = k.PlatformName AND p.PlatformID > k.PlatformID;
+CREATE UNIQUE INDEX IF NOT EXISTS platforms_name_key ON Platforms (PlatformName);
+
+-- GenreName is already declared UNIQUE in database_setup.sql
@@ -0,0 +1,129 @@
+-- Indexes for foreign keys and the analytics filters
+CREATE INDEX IF NOT EXISTS games_developer_id ON Games (DeveloperID);
+CREATE INDEX IF NOT EXISTS games_publisher_id ON Games (PublisherID);
+CREATE INDEX IF NOT EXISTS games_platform_id ON Games (PlatformID);
+CREATE INDEX IF NOT EXISTS games_genre_id ON Games (GenreID);
+CREATE INDEX IF NOT EXISTS games_year_platform_genre ON Games (ReleaseYear, PlatformID, GenreID);
+
+-- Pre-aggregated games per platform/genre/year. Missing platforms or genres
+-- are stored under ID 0, so they drop out of joins just like in the raw
+-- queries; games without a release year are not rolled up.
+CREATE TABLE IF NOT EXISTS GameRollups (
+    PlatformID INT NOT NULL,
+    GenreID INT NOT NULL,
+    ReleaseYear INT NOT NULL,
+    GameCount BIGINT NOT NULL DEFAULT 0,
+    SalesSum DECIMAL(16,2) NOT NULL DEFAULT 0,
+    SalesCount BIGINT NOT NULL DEFAULT 0,
+    CriticSum DECIMAL(16,1) NOT NULL DEFAULT 0,
+    CriticCount BIGINT NOT NULL DEFAULT 0,
+    UserSum DECIMAL(16,1) NOT NULL DEFAULT 0,
+    UserCount BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (PlatformID, GenreID, ReleaseYear)
+);
+
+CREATE INDEX IF NOT EXISTS gamerollups_year ON GameRollups (ReleaseYear);
+
+-- Applies the net effect of one statement's changed rows to GameRollups.
+-- Each trigger only has the transition tables for its own event, so the
+-- source of changed rows is chosen per operation and run dynamically.
+-- Deltas are applied in key order, so concurrent writers (the loader and
+-- bulk imports) lock rollup rows in the same order and cannot deadlock.
+CREATE OR REPLACE FUNCTION refresh_game_rollups() RETURNS trigger AS $$
+DECLARE
+    changes TEXT;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changes := 'SELECT 1 AS sign, * FROM new_rows';
+    ELSIF TG_OP = 'DELETE' THEN
+        changes := 'SELECT -1 AS sign, * FROM old_rows';
+    ELSE
+        changes := 'SELECT 1 AS sign, * FROM new_rows UNION ALL SELECT -1 AS sign, * FROM old_rows';
+    END IF;
+
+    EXECUTE format($sql$
+        WITH changes AS (%s),
+        deltas AS (
+            SELECT
+                COALESCE(PlatformID, 0) AS PlatformID,
+                COALESCE(GenreID, 0) AS GenreID,
+                ReleaseYear,
+                SUM(sign) AS GameCount,
+                COALESCE(SUM(sign * GlobalSales), 0) AS SalesSum,
+                COALESCE(SUM(sign) FILTER (WHERE GlobalSales IS NOT NULL), 0) AS SalesCount,
+                COALESCE(SUM(sign * MetacriticScore), 0) AS CriticSum,
+                COALESCE(SUM(sign) FILTER (WHERE MetacriticScore IS NOT NULL), 0) AS CriticCount,
+                COALESCE(SUM(sign * UserScore), 0) AS UserSum,
+                COALESCE(SUM(sign) FILTER (WHERE UserScore IS NOT NULL), 0) AS UserCount
+            FROM changes
+            WHERE ReleaseYear IS NOT NULL
+            GROUP BY 1, 2, 3
+        )
+        INSERT INTO GameRollups AS r
+        SELECT * FROM deltas
+        ORDER BY PlatformID, GenreID, ReleaseYear
+        ON CONFLICT (PlatformID, GenreID, ReleaseYear) DO UPDATE SET
+            GameCount = r.GameCount + EXCLUDED.GameCount,
+            SalesSum = r.SalesSum + EXCLUDED.SalesSum,
+            SalesCount = r.SalesCount + EXCLUDED.SalesCount,
+            CriticSum = r.CriticSum + EXCLUDED.CriticSum,
+            CriticCount = r.CriticCount + EXCLUDED.CriticCount,
+            UserSum = r.UserSum + EXCLUDED.UserSum,
+            UserCount = r.UserCount + EXCLUDED.UserCount
+    $sql$, changes);
+
+    -- Only removed rows can empty a rollup, so only their keys are checked;
+    -- those rollup rows were already locked by the upsert above
+    IF TG_OP <> 'INSERT' THEN
+        DELETE FROM GameRollups r
+        USING (
+            SELECT DISTINCT COALESCE(PlatformID, 0) AS PlatformID, COALESCE(GenreID, 0) AS GenreID, ReleaseYear
+            FROM old_rows
+            WHERE ReleaseYear IS NOT NULL
+        ) emptied
+        WHERE r.PlatformID = emptied.PlatformID
+          AND r.GenreID = emptied.GenreID
+          AND r.ReleaseYear = emptied.ReleaseYear
+          AND r.GameCount <= 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Statement-level triggers see each bulk insert as one set of rows, so a
+-- multi-row INSERT updates every rollup it touches once.
+DROP TRIGGER IF EXISTS games_rollup_insert ON Games;
+CREATE TRIGGER games_rollup_insert
+    AFTER INSERT ON Games
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION refresh_game_rollups();
+
+DROP TRIGGER IF EXISTS games_rollup_update ON Games;
+CREATE TRIGGER games_rollup_update
+    AFTER UPDATE ON Games
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION refresh_game_rollups();
+
+DROP TRIGGER IF EXISTS games_rollup_delete ON Games;
+CREATE TRIGGER games_rollup_delete
+    AFTER DELETE ON Games
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION refresh_game_rollups();
+
+-- Backfill from the existing games
+TRUNCATE GameRollups;
+INSERT INTO GameRollups
+SELECT
+    COALESCE(PlatformID, 0),
+    COALESCE(GenreID, 0),
+    ReleaseYear,
+    COUNT(*),
+    COALESCE(SUM(GlobalSales), 0),
+    COUNT(GlobalSales),
+    COALESCE(SUM(MetacriticScore), 0),
+    COUNT(MetacriticScore),
+    COALESCE(SUM(UserScore), 0),
+    COUNT(UserScore)
+FROM Games
+WHERE ReleaseYear IS NOT NULL
+GROUP BY 1, 2, 3;
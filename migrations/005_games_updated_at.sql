@@ -0,0 +1,16 @@
+-- Track when each game last changed, so exports can fingerprint their inputs
+ALTER TABLE Games ADD COLUMN IF NOT EXISTS UpdatedAt TIMESTAMPTZ NOT NULL DEFAULT now();
+
+CREATE OR REPLACE FUNCTION touch_games_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.UpdatedAt := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS games_touch_updated_at ON Games;
+CREATE TRIGGER games_touch_updated_at
+    BEFORE UPDATE ON Games
+    FOR EACH ROW EXECUTE FUNCTION touch_games_updated_at();
+
+CREATE INDEX IF NOT EXISTS games_updated_at ON Games (UpdatedAt);
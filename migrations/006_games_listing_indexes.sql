@@ -0,0 +1,13 @@
+-- Keyset pagination for GET /api/games walks GameID in order. With an
+-- equality filter on platform and/or genre, these indexes return the
+-- matching rows already ordered by GameID, so a page after any cursor is
+-- an index range scan that stops after LIMIT rows however deep it is.
+-- Lists of ids are run as one such scan per value (see game_listing.py).
+CREATE INDEX IF NOT EXISTS games_platform_game ON Games (PlatformID, GameID);
+CREATE INDEX IF NOT EXISTS games_genre_game ON Games (GenreID, GameID);
+CREATE INDEX IF NOT EXISTS games_platform_genre_game ON Games (PlatformID, GenreID, GameID);
+
+-- Score range filters; year ranges use games_year_platform_genre (004).
+-- These serve filtered queries without a keyset; on a listing page the
+-- year and score conditions filter the rows walked in GameID order.
+CREATE INDEX IF NOT EXISTS games_metacritic_score ON Games (MetacriticScore);
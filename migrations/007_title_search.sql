@@ -0,0 +1,12 @@
+-- Title search for GET /api/games/search: word matches through a
+-- tsvector column, typos and partial words through trigram similarity.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- 'simple' keeps titles unstemmed and without stop words removed, so
+-- "The Last of Us" stays searchable word for word
+ALTER TABLE Games ADD COLUMN IF NOT EXISTS TitleSearch tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple', Title)) STORED;
+
+CREATE INDEX IF NOT EXISTS games_title_search ON Games USING GIN (TitleSearch);
+-- pg_trgm folds case itself; also serves ILIKE '%...%' lookups
+CREATE INDEX IF NOT EXISTS games_title_trgm ON Games USING GIN (Title gin_trgm_ops);
@@ -0,0 +1,13 @@
+-- Notify listeners once per statement that changes Games, so API
+-- processes can drop cached analytics computed from the old rows.
+CREATE OR REPLACE FUNCTION notify_games_change() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('games_changed', TG_OP);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS games_changed ON Games;
+CREATE TRIGGER games_changed
+    AFTER INSERT OR UPDATE OR DELETE ON Games
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_games_change();
@@ -0,0 +1,112 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILENAME = 'model.joblib'
+METADATA_FILENAME = 'metadata.json'
+CURRENT_FILENAME = 'CURRENT'
+VERSION_PATTERN = re.compile(r'^[A-Za-z0-9._-]+$')
+
+
+class ModelRegistry:
+    """Directory of versioned model artifacts with an active-version pointer.
+
+    Layout::
+
+        <root>/<version>/model.joblib
+        <root>/<version>/metadata.json
+        <root>/CURRENT              (name of the active version)
+
+    Artifacts are written uncompressed so they can be loaded with
+    mmap_mode='r', letting worker processes share the model's arrays
+    through the page cache instead of each holding a copy.
+    """
+    def __init__(self, root: str):
+        # Created on first publish, so read-only deployments can use a
+        # root that does not exist yet
+        self.root = root
+
+    def versions(self) -> List[str]:
+        """All published versions, oldest first"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if not name.startswith('.') and os.path.isfile(os.path.join(self.root, name, MODEL_FILENAME))
+        )
+
+    def current_version(self) -> Optional[str]:
+        """The active version, or None if nothing has been activated"""
+        try:
+            with open(os.path.join(self.root, CURRENT_FILENAME), encoding='utf-8') as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+
+    def model_path(self, version: str) -> str:
+        self._check_version(version)
+        return os.path.join(self.root, version, MODEL_FILENAME)
+
+    def metadata(self, version: str) -> Dict:
+        try:
+            with open(os.path.join(self.root, version, METADATA_FILENAME), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def load(self, version: str, mmap: bool = True) -> Any:
+        """Load a version's model, memory-mapping its arrays when mmap is set"""
+        # joblib (and numpy with it) is only needed once a model is touched
+        import joblib
+        return joblib.load(self.model_path(version), mmap_mode='r' if mmap else None)
+
+    def publish(self, model: Any, version: Optional[str] = None, metadata: Optional[Dict] = None,
+                activate: bool = True) -> str:
+        """Write a model as a new version and optionally make it active.
+
+        The artifact is written to a temporary directory and renamed into
+        place, so readers never see a half-written version.
+        """
+        version = version or time.strftime('%Y%m%d-%H%M%S')
+        self._check_version(version)
+        target = os.path.join(self.root, version)
+        if os.path.exists(target):
+            raise ValueError(f"Model version {version} already exists")
+        import joblib
+        os.makedirs(self.root, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=f".{version}-", dir=self.root)
+        try:
+            joblib.dump(model, os.path.join(staging, MODEL_FILENAME))
+            with open(os.path.join(staging, METADATA_FILENAME), 'w', encoding='utf-8') as f:
+                json.dump({'version': version, 'created_at': time.time(), **(metadata or {})}, f, indent=2)
+            os.rename(staging, target)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        logger.info(f"Published model version {version}")
+        if activate:
+            self.activate(version)
+        return version
+
+    def activate(self, version: str):
+        """Point CURRENT at a published version, atomically"""
+        if not os.path.isfile(self.model_path(version)):
+            raise ValueError(f"Unknown model version: {version}")
+        fd, staging = tempfile.mkstemp(prefix='.CURRENT-', dir=self.root)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(version)
+        os.replace(staging, os.path.join(self.root, CURRENT_FILENAME))
+        logger.info(f"Activated model version {version}")
+
+    @staticmethod
+    def _check_version(version: str):
+        if not VERSION_PATTERN.match(version or ''):
+            raise ValueError(f"Invalid model version: {version!r}")
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+from typing import Dict, NamedTuple, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+# Response headers kept with each entry
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+class CacheMiss(Exception):
+    """Raised in cache-only mode when a request has no cached response"""
+
+
+class CachedResponse(NamedTuple):
+    url: str
+    body: bytes
+    headers: Dict
+    fetched_at: float
+    expires_at: float
+
+    @property
+    def is_fresh(self) -> bool:
+        return self.expires_at > time.time()
+
+    @property
+    def validators(self) -> Dict:
+        """Conditional-request headers for revalidating this entry"""
+        headers = {}
+        if self.headers.get('ETag'):
+            headers['If-None-Match'] = self.headers['ETag']
+        if self.headers.get('Last-Modified'):
+            headers['If-Modified-Since'] = self.headers['Last-Modified']
+        return headers
+
+    def to_response(self) -> requests.Response:
+        """Rebuild a requests.Response so callers cannot tell it was cached"""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = self.url
+        response._content = self.body
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or 'utf-8'
+        return response
+
+
+class ResponseCache:
+    """On-disk HTTP response cache backed by SQLite.
+
+    Entries are keyed by source and request, expire after a per-source TTL,
+    keep their ETag/Last-Modified for revalidation, and are evicted least
+    recently used first once the total body size exceeds max_bytes.
+    """
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024,
+                 default_ttl: float = 7 * 24 * 3600, ttls: Optional[Dict[str, float]] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttls = ttls or {}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                headers TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def make_key(source: str, method: str, url: str, params=None, data=None) -> str:
+        """Stable key for a request: source, method, URL, query and body"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        digest = hashlib.sha256()
+        for part in (source, method.upper(), url, json.dumps(params, sort_keys=True, default=str)):
+            digest.update(part.encode('utf-8') + b'\0')
+        digest.update(data or b'')
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return an entry (fresh or stale) and mark it recently used"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, body, headers, fetched_at, expires_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        url, body, headers, fetched_at, expires_at = row
+        return CachedResponse(url, body, json.loads(headers), fetched_at, expires_at)
+
+    def put(self, key: str, source: str, response: requests.Response):
+        """Store a successful response"""
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        self.put_body(key, source, response.url, response.content, headers)
+
+    def put_body(self, key: str, source: str, url: str, body: bytes, headers: Dict):
+        """Store a response body that did not come from its own request"""
+        now = time.time()
+        ttl = self.ttls.get(source, self.default_ttl)
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, source, url, body, json.dumps(headers), len(body), now, now + ttl, now)
+            )
+            self._total_bytes += len(body) - (previous[0] if previous else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def refresh(self, key: str, source: str):
+        """Extend an entry's lifetime after the server answered 304"""
+        now = time.time()
+        ttl = self.ttls.get(source, self.default_ttl)
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET fetched_at = ?, expires_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now + ttl, now, key)
+            )
+
+    def _evict(self):
+        """Delete least recently used entries until under 90% of the size cap"""
+        target = self.max_bytes * 0.9
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        doomed = []
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            doomed.append((key,))
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        logger.info(f"Evicted {len(doomed)} cached responses")
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._total_bytes = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,48 @@
+import numpy as np
+from typing import Dict, List, Tuple
+
+
+class CategoryEncoder:
+    """Maps category names to integer codes; unknown names map to -1"""
+    def __init__(self, categories: List[str]):
+        self.categories = list(categories)
+        self.codes = {name: code for code, name in enumerate(self.categories)}
+
+    def transform(self, values) -> np.ndarray:
+        codes = self.codes
+        return np.fromiter((codes.get(value, -1) for value in values), dtype=np.float32, count=len(values))
+
+
+class SalesPredictor:
+    """Sales regressor over (genre, platform, score) rows with prediction intervals.
+
+    Intervals come from split conformal calibration: residual_quantile is
+    the coverage quantile of absolute residuals on held-out rows, so
+    [prediction - q, prediction + q] covers about `coverage` of new games.
+    """
+    def __init__(self, regressor, encoders: Dict[str, CategoryEncoder],
+                 residual_quantile: float, coverage: float):
+        self.regressor = regressor
+        self.encoders = encoders
+        self.residual_quantile = residual_quantile
+        self.coverage = coverage
+
+    def encode(self, rows) -> np.ndarray:
+        """Encode rows in FEATURE_COLUMNS order (genre, platform, score) as floats"""
+        rows = np.asarray(rows, dtype=object)
+        if rows.ndim == 1:
+            rows = rows.reshape(1, -1)
+        return np.column_stack([
+            self.encoders['genre'].transform(rows[:, 0]),
+            self.encoders['platform'].transform(rows[:, 1]),
+            rows[:, 2].astype(np.float32)
+        ])
+
+    def predict(self, rows) -> np.ndarray:
+        return np.clip(self.regressor.predict(self.encode(rows)), 0, None)
+
+    def predict_interval(self, rows) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (prediction, lower bound, upper bound) arrays"""
+        predictions = self.predict(rows)
+        lower = np.clip(predictions - self.residual_quantile, 0, None)
+        return predictions, lower, predictions + self.residual_quantile
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+
+class RunningStats:
+    """Count, mean and variance of a numeric stream, updated one chunk at a time.
+
+    Chunks are merged with Chan et al.'s parallel formula, so the state is
+    three numbers no matter how many rows have been seen.
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        n = len(values)
+        if not n:
+            return
+        mean = values.mean()
+        m2 = ((values - mean) ** 2).sum()
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += m2 + delta ** 2 * self.count * n / total
+        self.count = total
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else float('nan')
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+
+class RunningCorrelation:
+    """Pearson correlation of paired values, updated one chunk at a time"""
+    def __init__(self):
+        self.x = RunningStats()
+        self.y = RunningStats()
+        self._comoment = 0.0
+
+    @property
+    def count(self) -> int:
+        return self.x.count
+
+    def update(self, x, y):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        paired = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[paired], y[paired]
+        n = len(x)
+        if not n:
+            return
+        count = self.count
+        total = count + n
+        dx = x.mean() - self.x.mean
+        dy = y.mean() - self.y.mean
+        self._comoment += ((x - x.mean()) * (y - y.mean())).sum() + dx * dy * count * n / total
+        self.x.update(x)
+        self.y.update(y)
+
+    @property
+    def correlation(self) -> float:
+        denominator = np.sqrt(self.x._m2 * self.y._m2)
+        return float(self._comoment / denominator) if denominator else float('nan')
+
+
+class ReservoirSample:
+    """Uniform random sample of at most `size` rows from a stream of DataFrames"""
+    def __init__(self, size: int, seed: Optional[int] = None):
+        self.size = size
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._sample = None
+
+    def update(self, chunk: pd.DataFrame):
+        n = len(chunk)
+        if not n:
+            return
+        fill = max(0, min(n, self.size - self.seen))
+        if fill:
+            head = chunk.iloc[:fill]
+            self._sample = (head.reset_index(drop=True) if self._sample is None
+                            else pd.concat([self._sample, head], ignore_index=True))
+        if fill < n:
+            # Algorithm R: row t replaces a random slot with probability size/(t+1)
+            positions = np.arange(self.seen + fill, self.seen + n)
+            slots = self._rng.integers(0, positions + 1)
+            for offset in np.flatnonzero(slots < self.size):
+                self._sample.iloc[slots[offset]] = chunk.iloc[fill + offset].values
+        self.seen += n
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        return self._sample if self._sample is not None else pd.DataFrame()
@@ -0,0 +1,99 @@
+import io
+import json
+
+import pytest
+
+from bulk_ingest import BulkFormatError, chunked, iter_records, until_format_error, validate_game_row
+
+GAME = {'title': 'Hades', 'release_year': 2020, 'platform_id': 1, 'genre_id': 2}
+
+
+def read(body: bytes, content_type: str) -> list:
+    return list(iter_records(io.BytesIO(body), content_type))
+
+
+def test_valid_row_is_coerced_in_column_order():
+    row, error = validate_game_row({**GAME, 'release_year': '2020', 'metacritic_score': '93',
+                                    'global_sales': 1.234})
+    assert error is None
+    assert row == ('Hades', 2020, None, None, 1, 2, 93.0, None, 1.23)
+
+
+@pytest.mark.parametrize('record, message', [
+    (['Hades'], 'Row must be an object'),
+    ({'title': 'Hades'}, 'Missing required fields: release_year, platform_id, genre_id'),
+    ({**GAME, 'title': ''}, 'Missing required fields: title'),
+    ({**GAME, 'release_year': 2020.5}, 'release_year must be an integer'),
+    ({**GAME, 'platform_id': True}, 'platform_id must be an integer'),
+    ({**GAME, 'genre_id': 'action'}, 'Invalid value'),
+    ({**GAME, 'user_score': -1}, 'user_score out of range'),
+    ({**GAME, 'metacritic_score': float('nan')}, 'metacritic_score out of range'),
+    ({**GAME, 'title': 'x' * 256}, 'longer than 255'),
+    ({'_parse_error': 'Line 3: bad JSON'}, 'Line 3: bad JSON'),
+])
+def test_invalid_rows(record, message):
+    row, error = validate_game_row(record)
+    assert row is None
+    assert message in error
+
+
+def test_scores_are_range_checked_after_rounding():
+    # DECIMAL(3,1) would round these to 100.0 and reject the whole chunk
+    assert validate_game_row({**GAME, 'user_score': 99.96})[1] == 'Invalid value: user_score out of range'
+    assert validate_game_row({**GAME, 'user_score': 99.95})[1] == 'Invalid value: user_score out of range'
+    assert validate_game_row({**GAME, 'user_score': 99.94})[0][7] == 99.9
+    assert validate_game_row({**GAME, 'global_sales': 99999999.995})[0] is None
+
+
+def test_json_array():
+    assert read(json.dumps([GAME, GAME]).encode(), 'application/json; charset=utf-8') == [GAME, GAME]
+
+
+@pytest.mark.parametrize('body, message', [
+    (b'{"title": "Hades"}', 'Expected a JSON array'),
+    (b'[{"title": ', 'Invalid JSON'),
+])
+def test_bad_json_body(body, message):
+    with pytest.raises(BulkFormatError, match=message):
+        read(body, 'application/json')
+
+
+def test_ndjson_keeps_positions_of_bad_lines():
+    body = b'{"title": "Hades"}\n\nnot json\n{"title": "Celeste"}\n'
+    records = read(body, 'application/x-ndjson')
+    assert records[0] == {'title': 'Hades'}
+    assert records[1]['_parse_error'].startswith('Line 3:')
+    assert records[2] == {'title': 'Celeste'}
+
+
+def test_csv():
+    body = 'title,release_year,platform_id,genre_id\n"Pokémon, Let\'s Go",2018,4,5\n'.encode()
+    assert read(body, 'text/csv') == [
+        {'title': "Pokémon, Let's Go", 'release_year': '2018', 'platform_id': '4', 'genre_id': '5'}
+    ]
+
+
+def test_unsupported_content_type():
+    with pytest.raises(BulkFormatError, match='Unsupported content type: text/plain'):
+        read(b'Hades', 'text/plain')
+
+
+def test_unreadable_body_keeps_earlier_records():
+    # Text is decoded in blocks, so the good part must span more than one
+    body = b'{"title": "Hades"}\n' * 10000 + b'\xff' * 10
+    errors = []
+    records = list(until_format_error(iter_records(io.BytesIO(body), 'application/x-ndjson'), errors))
+    assert records and all(record == {'title': 'Hades'} for record in records)
+    assert len(errors) == 1
+    assert errors[0]['index'] == len(records)
+    assert 'Invalid UTF-8' in errors[0]['error']
+
+
+def test_unreadable_body_from_the_start_raises():
+    with pytest.raises(BulkFormatError):
+        list(until_format_error(iter_records(io.BytesIO(b'\xff\xfe'), 'text/csv'), []))
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 2)) == []
@@ -0,0 +1,46 @@
+import gzip
+import json
+
+import pytest
+
+pytest.importorskip('flask_compress')
+api = pytest.importorskip('app')
+
+GENRES = [{'id': i, 'name': f"Genre {i}"} for i in range(200)]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # No background warmup: these tests never touch the database
+    monkeypatch.setattr(api, 'start_warmup', lambda: None)
+    monkeypatch.setitem(api.LOOKUP_LOADERS, 'genres', lambda: GENRES)
+    api.lookup_cache.invalidate()
+    yield api.app.test_client()
+    api.lookup_cache.invalidate()
+
+
+def test_compressed_etag_revalidates(client):
+    first = client.get('/api/genres', headers={'Accept-Encoding': 'gzip'})
+    assert first.status_code == 200
+    assert first.headers['Content-Encoding'] == 'gzip'
+    etag = first.headers['ETag']
+    assert etag.endswith(':gzip"')
+
+    second = client.get('/api/genres', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.data == b''
+
+
+def test_uncompressed_etag_revalidates(client):
+    first = client.get('/api/genres', headers={'Accept-Encoding': 'identity'})
+    assert first.status_code == 200
+    assert 'Content-Encoding' not in first.headers
+
+    second = client.get('/api/genres', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 304
+
+
+def test_stale_etag_gets_full_body(client):
+    response = client.get('/api/genres', headers={'Accept-Encoding': 'gzip', 'If-None-Match': '"stale:gzip"'})
+    assert response.status_code == 200
+    assert json.loads(gzip.decompress(response.data)) == GENRES
@@ -0,0 +1,86 @@
+import pytest
+
+from game_listing import MAX_KEYSET_BRANCHES, ListingQueryError, build_listing_query
+
+
+def build(**args):
+    sql, params, fields, limit = build_listing_query(args)
+    # Every placeholder gets exactly one parameter, in order
+    assert sql.count('%s') == len(params)
+    return sql, params, fields, limit
+
+
+def test_defaults():
+    sql, params, fields, limit = build()
+    assert 'WHERE' not in sql
+    assert sql.endswith('ORDER BY g.GameID LIMIT %s')
+    assert params == [51]
+    assert fields[0] == 'game_id'
+    assert limit == 50
+
+
+def test_fields_always_include_game_id():
+    sql, _, fields, _ = build(fields='title,platform')
+    assert fields == ['game_id', 'title', 'platform']
+    assert 'LEFT JOIN Platforms p' in sql
+    assert 'LEFT JOIN Genres' not in sql
+
+
+def test_single_id_uses_equality():
+    sql, params, _, _ = build(platform_id='3', limit='10')
+    assert 'g.PlatformID = %s' in sql
+    assert 'UNION ALL' not in sql
+    assert params == [3, 11]
+
+
+def test_after_with_filters():
+    sql, params, _, _ = build(after='100', year_from='2010', score_min='80.5', genre_id='2', limit='5')
+    assert 'g.GameID > %s AND g.ReleaseYear >= %s AND g.MetacriticScore >= %s AND g.GenreID = %s' in sql
+    assert params == [100, 2010, 80.5, 2, 6]
+
+
+def test_multi_value_ids_become_one_branch_per_combination():
+    sql, params, _, _ = build(after='7', year_to='2020', platform_id='1,2', genre_id='5,6', limit='10')
+    assert sql.count('UNION ALL') == 3
+    branch_params = [
+        [7, 2020, platform_id, genre_id, 11]
+        for platform_id, genre_id in [(1, 5), (1, 6), (2, 5), (2, 6)]
+    ]
+    assert params == sum(branch_params, []) + [11]
+
+
+def test_duplicate_ids_are_dropped():
+    sql, params, _, _ = build(platform_id='4,4, 4', limit='10')
+    assert 'UNION ALL' not in sql
+    assert params == [4, 11]
+
+    _, params, _, _ = build(platform_id='4,9,4', limit='10')
+    assert params == [4, 11, 9, 11, 11]
+
+
+def test_too_many_branches_fall_back_to_any():
+    values = ','.join(str(value) for value in range(MAX_KEYSET_BRANCHES + 1))
+    sql, params, _, _ = build(after='3', platform_id=values, genre_id='1', limit='10')
+    assert 'UNION ALL' not in sql
+    assert 'g.PlatformID = ANY(%s) AND g.GenreID = ANY(%s)' in sql
+    assert params == [3, list(range(MAX_KEYSET_BRANCHES + 1)), [1], 11]
+
+
+def test_empty_id_list_matches_nothing():
+    sql, params, _, _ = build(platform_id=',')
+    assert 'g.PlatformID = ANY(%s)' in sql
+    assert params == [[], 51]
+
+
+@pytest.mark.parametrize('args, message', [
+    ({'limit': '0'}, 'limit must be between'),
+    ({'limit': '501'}, 'limit must be between'),
+    ({'limit': 'ten'}, 'Invalid value for limit'),
+    ({'after': 'abc'}, 'Invalid value for after'),
+    ({'score_min': 'high'}, 'Invalid value for score_min'),
+    ({'platform_id': '1,x'}, 'Invalid value for platform_id'),
+    ({'fields': 'title,secret'}, 'Unknown fields: secret'),
+])
+def test_invalid_arguments(args, message):
+    with pytest.raises(ListingQueryError, match=message):
+        build_listing_query(args)
@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+pytest.importorskip('lxml')
+
+from metacritic_parser import ParserPool, parse_game_page, parse_search_page
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures')
+
+
+def fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_game_page():
+    assert parse_game_page(fixture('metacritic_game.html')) == {
+        'title': 'The Witcher 3: Wild Hunt',
+        'score': 93.0,
+        'user_score': 9.3,
+        'platform': 'PC',
+        'release_date': 'May 19, 2015'
+    }
+
+
+def test_game_page_missing_fields():
+    html = '<html><body><h1>Hades</h1><div class="metascore_w user">tbd</div></body></html>'
+    assert parse_game_page(html) == {
+        'title': 'Hades', 'score': None, 'user_score': None, 'platform': None, 'release_date': None
+    }
+
+
+@pytest.mark.parametrize('html', ['', '   \n', '<html><body><p>Not found</p></body></html>'])
+def test_game_page_without_title(html):
+    assert parse_game_page(html) is None
+
+
+def test_search_page():
+    assert parse_search_page(fixture('metacritic_search.html')) == '/game/pc/the-witcher-3-wild-hunt'
+
+
+@pytest.mark.parametrize('html', ['', '<html><body><div class="result_wrap">No link</div></body></html>'])
+def test_search_page_without_results(html):
+    assert parse_search_page(html) is None
+
+
+def test_inline_pool():
+    pool = ParserPool(workers=0)
+    assert pool.game_page(fixture('metacritic_game.html'))['score'] == 93.0
+    assert pool.search_page(fixture('metacritic_search.html')) == '/game/pc/the-witcher-3-wild-hunt'
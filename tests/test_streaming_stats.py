@@ -0,0 +1,87 @@
+import math
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pd = pytest.importorskip('pandas')
+
+from streaming_stats import ReservoirSample, RunningCorrelation, RunningStats
+
+
+def chunks(values, size):
+    return [values[start:start + size] for start in range(0, len(values), size)]
+
+
+def test_running_stats_match_whole_array():
+    values = np.random.default_rng(1).normal(50, 10, 1000)
+    stats = RunningStats()
+    for chunk in chunks(values, 97):
+        stats.update(chunk)
+    assert stats.count == 1000
+    assert stats.mean == pytest.approx(values.mean())
+    assert stats.variance == pytest.approx(values.var(ddof=1))
+    assert stats.std == pytest.approx(values.std(ddof=1))
+
+
+def test_running_stats_skip_nan_and_empty_chunks():
+    stats = RunningStats()
+    stats.update([])
+    stats.update([1.0, float('nan'), 3.0])
+    assert stats.count == 2
+    assert stats.mean == 2.0
+    assert stats.variance == 2.0
+
+
+def test_running_stats_variance_needs_two_values():
+    stats = RunningStats()
+    stats.update([5.0])
+    assert math.isnan(stats.variance)
+
+
+def test_running_correlation_matches_corrcoef():
+    rng = np.random.default_rng(2)
+    x = rng.normal(size=500)
+    y = 0.6 * x + rng.normal(size=500)
+    correlation = RunningCorrelation()
+    for x_chunk, y_chunk in zip(chunks(x, 64), chunks(y, 64)):
+        correlation.update(x_chunk, y_chunk)
+    assert correlation.count == 500
+    assert correlation.correlation == pytest.approx(np.corrcoef(x, y)[0, 1])
+
+
+def test_running_correlation_drops_unpaired_values():
+    correlation = RunningCorrelation()
+    correlation.update([1.0, 2.0, float('nan'), 3.0], [2.0, 4.0, 5.0, float('nan')])
+    correlation.update([4.0], [8.0])
+    assert correlation.count == 3
+    assert correlation.correlation == pytest.approx(1.0)
+
+
+def test_running_correlation_of_constant_is_nan():
+    correlation = RunningCorrelation()
+    correlation.update([1.0, 1.0], [2.0, 3.0])
+    assert math.isnan(correlation.correlation)
+
+
+def test_reservoir_keeps_everything_below_size():
+    sample = ReservoirSample(10, seed=0)
+    sample.update(pd.DataFrame({'a': [1, 2, 3]}, index=[7, 8, 9]))
+    assert sample.seen == 3
+    assert sample.frame['a'].tolist() == [1, 2, 3]
+
+
+def test_reservoir_is_bounded_and_drawn_from_the_stream():
+    sample = ReservoirSample(50, seed=0)
+    for start in range(0, 1000, 128):
+        sample.update(pd.DataFrame({'a': range(start, min(start + 128, 1000))}))
+    assert sample.seen == 1000
+    assert len(sample.frame) == 50
+    values = sample.frame['a'].tolist()
+    assert len(set(values)) == 50
+    assert all(0 <= value < 1000 for value in values)
+    # Later rows must be able to replace the first ones
+    assert max(values) >= 50
+
+
+def test_empty_reservoir():
+    assert ReservoirSample(5).frame.empty
@@ -0,0 +1,126 @@
+import datetime
+
+from title_search import TitleIndex, TitleMatcher, normalize_title
+
+UPDATED = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def titles(results):
+    return [result['title'] for result in results]
+
+
+def make_index():
+    index = TitleIndex()
+    index.build([
+        (1, 'The Witcher 3: Wild Hunt', 1, 2015),
+        (2, 'Witcher 2', 1, 2011),
+        (3, 'Pokémon: Let\'s Go, Pikachu!', 4, 2018),
+        (4, 'Wild Arms', 2, 1996),
+    ])
+    return index
+
+
+def test_normalize_title():
+    assert normalize_title("Pokémon: Let's Go, Pikachu!") == 'pokemon lets go pikachu'
+    assert normalize_title(None) == ''
+
+
+def test_complete_ranks_title_starts_first():
+    index = make_index()
+    assert titles(index.complete('wit')) == ['Witcher 2', 'The Witcher 3: Wild Hunt']
+    assert titles(index.complete('wild')) == ['Wild Arms', 'The Witcher 3: Wild Hunt']
+
+
+def test_complete_matches_any_word_and_ignores_accents():
+    index = make_index()
+    assert titles(index.complete('pika')) == ["Pokémon: Let's Go, Pikachu!"]
+    assert titles(index.complete('POKEMON le')) == ["Pokémon: Let's Go, Pikachu!"]
+
+
+def test_complete_limit_and_empty_prefix():
+    index = make_index()
+    assert len(index.complete('w', limit=1)) == 1
+    assert index.complete('  ') == []
+    assert index.complete('zelda') == []
+
+
+def test_add_and_add_many():
+    index = make_index()
+    index.add(5, 'Hades', 1, 2020)
+    index.add(5, 'Ignored', 1, 2020)
+    index.add_many([(6, 'Hades II', 1, 2024), (7, 'Hollow Knight', 1, 2017)])
+    assert len(index) == 7
+    assert titles(index.complete('ha')) == ['Hades', 'Hades II']
+    assert titles(index.complete('ho')) == ['Hollow Knight']
+
+
+def test_add_many_reindexes_changed_titles():
+    index = make_index()
+    index.add_many([(2, 'The Witcher 2: Assassins of Kings', 1, 2011)])
+    assert len(index) == 4
+    assert titles(index.complete('assassins')) == ['The Witcher 2: Assassins of Kings']
+    assert index.same_title('witcher 2') == []
+    assert index.same_title('the witcher 2 assassins of kings') == [
+        (2, 'The Witcher 2: Assassins of Kings', 1, 2011)]
+
+
+class FakeCursor:
+    """Answers the matcher's queries from a list of Games rows"""
+    def __init__(self, rows, on_fetch=None):
+        self.rows = rows
+        self.on_fetch = on_fetch
+        self.params = None
+
+    def execute(self, sql, params=None):
+        self.params = params
+
+    def fetchall(self):
+        if self.on_fetch:
+            self.on_fetch()
+        if self.params is None:
+            return list(self.rows)
+        since = self.params['since']
+        return [row for row in self.rows
+                if row[0] > self.params['game_id'] or since is not None and row[4] > since]
+
+
+def test_find_duplicate():
+    matcher = TitleMatcher()
+    matcher.load(FakeCursor([(1, 'The Witcher 3: Wild Hunt', 1, 2015, UPDATED)]))
+    assert matcher.find_duplicate({'title': 'the witcher 3 wild hunt', 'platform_id': 1})[0] == 1
+    assert matcher.find_duplicate({'title': 'The Witcher 3: Wild Hunt', 'platform_id': 2}) is None
+
+
+def test_load_is_incremental_after_the_first():
+    rows = [(1, 'Hades', 1, 2020, UPDATED)]
+    cursor = FakeCursor(rows)
+    matcher = TitleMatcher()
+    matcher.load(cursor)
+    assert matcher.ready
+
+    rows.append((2, 'Celeste', 1, 2018, UPDATED))
+    rows[0] = (1, 'Hades II', 1, 2024, UPDATED + datetime.timedelta(hours=1))
+    matcher.load(cursor)
+    assert cursor.params['game_id'] == 1
+    assert titles(matcher.complete('hades')) == ['Hades II']
+    assert titles(matcher.complete('cel')) == ['Celeste']
+
+
+def test_full_load_keeps_games_added_while_reading():
+    matcher = TitleMatcher()
+    cursor = FakeCursor([(1, 'Hades', 1, 2020, UPDATED)],
+                        on_fetch=lambda: matcher.add(2, {'title': 'Celeste', 'platform_id': 1}))
+    matcher.load(cursor)
+    assert titles(matcher.complete('cel')) == ['Celeste']
+
+
+def test_invalidate_rebuilds_without_deleted_games():
+    rows = [(1, 'Hades', 1, 2020, UPDATED), (2, 'Celeste', 1, 2018, UPDATED)]
+    cursor = FakeCursor(rows)
+    matcher = TitleMatcher()
+    matcher.load(cursor)
+    del rows[1]
+    matcher.invalidate()
+    matcher.load(cursor)
+    assert matcher.complete('cel') == []
+    assert len(matcher.index) == 1
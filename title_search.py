@@ -0,0 +1,258 @@
+import bisect
+import datetime
+import re
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+# Full-text matches rank above trigram-only ones; both use the indexes
+# from migrations/007
+SEARCH_QUERY = """
+SELECT GameID, Title, ReleaseYear, PlatformID,
+       TitleSearch @@ plainto_tsquery('simple', %(q)s) AS word_match,
+       similarity(Title, %(q)s) AS score
+FROM Games
+WHERE TitleSearch @@ plainto_tsquery('simple', %(q)s) OR Title %% %(q)s
+ORDER BY word_match DESC, score DESC, GameID
+LIMIT %(limit)s
+"""
+
+# Incremental refreshes re-read rows updated up to REFRESH_OVERLAP before the
+# newest one already seen: UpdatedAt is the writing transaction's start time,
+# so a long transaction can commit rows older than that
+REFRESH_QUERY = """
+SELECT GameID, Title, PlatformID, ReleaseYear, UpdatedAt
+FROM Games
+WHERE GameID > %(game_id)s OR UpdatedAt > %(since)s
+"""
+REFRESH_OVERLAP = datetime.timedelta(minutes=1)
+
+
+def normalize_title(title: str) -> str:
+    """Case-, accent- and punctuation-insensitive form of a title.
+
+    "Pokémon: Let's Go, Pikachu!" and "pokemon lets go pikachu" normalize
+    to the same string.
+    """
+    title = unicodedata.normalize('NFKD', title or '')
+    title = ''.join(char for char in title if not unicodedata.combining(char))
+    title = title.casefold().replace("'", '')
+    return _NON_ALNUM.sub(' ', title).strip()
+
+
+class TitleIndex:
+    """Sorted in-memory index for title prefix lookups.
+
+    Every word of a normalized title starts a key, so "wit" completes
+    "The Witcher 3". Lookups are a binary search plus a short scan.
+    """
+    def __init__(self):
+        self._keys: List[Tuple[str, int]] = []
+        self._games: Dict[int, Tuple[str, Optional[int], Optional[int]]] = {}
+        self._by_title: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    @staticmethod
+    def _word_keys(normalized: str) -> List[str]:
+        return [normalized[match.start():] for match in re.finditer(r'\S+', normalized)]
+
+    def build(self, rows: Iterable[tuple]):
+        """Index (game_id, title, platform_id, release_year) rows, replacing the contents"""
+        keys, games, by_title = [], {}, {}
+        for game_id, title, platform_id, release_year in rows:
+            normalized = normalize_title(title)
+            games[game_id] = (title, platform_id, release_year)
+            by_title.setdefault(normalized, []).append(game_id)
+            keys.extend((key, game_id) for key in self._word_keys(normalized))
+        keys.sort()
+        self._keys, self._games, self._by_title = keys, games, by_title
+
+    def add(self, game_id: int, title: str, platform_id: Optional[int] = None,
+            release_year: Optional[int] = None):
+        if game_id in self._games:
+            return
+        normalized = normalize_title(title)
+        self._games[game_id] = (title, platform_id, release_year)
+        self._by_title.setdefault(normalized, []).append(game_id)
+        for key in self._word_keys(normalized):
+            bisect.insort(self._keys, (key, game_id))
+
+    def add_many(self, rows: Iterable[tuple]):
+        """Index or re-index (game_id, title, platform_id, release_year) rows with a single merge of the keys"""
+        new_keys, stale_keys = [], set()
+        for game_id, title, platform_id, release_year in rows:
+            entry = (title, platform_id, release_year)
+            old = self._games.get(game_id)
+            if old == entry:
+                continue
+            if old is not None:
+                old_normalized = normalize_title(old[0])
+                self._by_title[old_normalized].remove(game_id)
+                if not self._by_title[old_normalized]:
+                    del self._by_title[old_normalized]
+                stale_keys.update((key, game_id) for key in self._word_keys(old_normalized))
+            normalized = normalize_title(title)
+            self._games[game_id] = entry
+            self._by_title.setdefault(normalized, []).append(game_id)
+            new_keys.extend((key, game_id) for key in self._word_keys(normalized))
+        if new_keys:
+            # Sort a copy and swap it in: list.sort empties the list while it
+            # runs, which concurrent complete() calls would see
+            keys = [key for key in self._keys if key not in stale_keys] if stale_keys else self._keys[:]
+            keys.extend(new_keys)
+            keys.sort()
+            self._keys = keys
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Dict]:
+        """Titles with a word starting with prefix; title-start matches first"""
+        prefix = normalize_title(prefix)
+        if not prefix:
+            return []
+        keys = self._keys
+        position = bisect.bisect_left(keys, (prefix,))
+        # Scan a bounded window so very common prefixes stay cheap
+        candidates = {}
+        while position < len(keys) and len(candidates) < limit * 5:
+            key, game_id = keys[position]
+            if not key.startswith(prefix):
+                break
+            title = self._games[game_id][0]
+            starts_title = normalize_title(title) == key
+            candidates[game_id] = max(candidates.get(game_id, False), starts_title)
+            position += 1
+        ranked = sorted(candidates, key=lambda game_id: (
+            not candidates[game_id], len(self._games[game_id][0]), game_id))
+        return [{'game_id': game_id, 'title': self._games[game_id][0]} for game_id in ranked[:limit]]
+
+    def same_title(self, title: str) -> List[Tuple[int, str, Optional[int], Optional[int]]]:
+        """Indexed games whose normalized title equals this one's"""
+        return [(game_id, *self._games[game_id]) for game_id in self._by_title.get(normalize_title(title), [])]
+
+
+class TitleMatcher:
+    """Catalog title lookups shared by the API and the loader.
+
+    Typeahead and duplicate checks use the in-process TitleIndex;
+    ranked full-text/fuzzy search runs against Postgres.
+    """
+    def __init__(self):
+        self.index = TitleIndex()
+        self.loaded_at: Optional[float] = None
+        self._loading = threading.Lock()
+        self._refreshing = threading.Lock()
+        # Guards changes to the index; while a rebuild reads the table, adds
+        # are also kept in _replay and applied to the new index before the swap
+        self._lock = threading.Lock()
+        self._replay: Optional[List[tuple]] = None
+        self._rebuild = True
+        self._last_game_id = 0
+        self._last_updated: Optional[datetime.datetime] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.loaded_at is not None
+
+    def invalidate(self):
+        """Rebuild the whole index on the next load, e.g. after games were deleted"""
+        self._rebuild = True
+
+    def load(self, cursor):
+        """Bring the index up to date with the Games table.
+
+        The first load (and the first after invalidate) reads every game;
+        later ones only read games added or updated since.
+        """
+        with self._refreshing:
+            started = time.time()
+            if self._rebuild:
+                self._load_all(cursor)
+            else:
+                since = self._last_updated - REFRESH_OVERLAP if self._last_updated else None
+                cursor.execute(REFRESH_QUERY, {'game_id': self._last_game_id, 'since': since})
+                rows = cursor.fetchall()
+                with self._lock:
+                    self.index.add_many(row[:4] for row in rows)
+                self._track(rows)
+            self.loaded_at = started
+
+    def _load_all(self, cursor):
+        with self._lock:
+            self._replay = []
+        try:
+            cursor.execute("SELECT GameID, Title, PlatformID, ReleaseYear, UpdatedAt FROM Games")
+            rows = cursor.fetchall()
+            index = TitleIndex()
+            index.build(row[:4] for row in rows)
+        except Exception:
+            with self._lock:
+                self._replay = None
+            raise
+        with self._lock:
+            index.add_many(self._replay)
+            self.index, self._replay = index, None
+            self._rebuild = False
+        self._last_game_id, self._last_updated = 0, None
+        self._track(rows)
+
+    def _track(self, rows: List[tuple]):
+        """Advance the refresh watermarks past these rows"""
+        for game_id, _, _, _, updated_at in rows:
+            self._last_game_id = max(self._last_game_id, game_id)
+            if self._last_updated is None or updated_at > self._last_updated:
+                self._last_updated = updated_at
+
+    def load_in_background(self, run):
+        """Refresh via run(load) on a thread, unless a refresh is already running"""
+        if not self._loading.acquire(blocking=False):
+            return
+        def target():
+            try:
+                run(self.load)
+            finally:
+                self._loading.release()
+        threading.Thread(target=target, daemon=True).start()
+
+    @staticmethod
+    def search(cursor, q: str, limit: int = 20) -> List[Dict]:
+        """Ranked full-text and trigram search over the catalog"""
+        cursor.execute(SEARCH_QUERY, {'q': q, 'limit': limit})
+        return [
+            {'game_id': game_id, 'title': title, 'release_year': release_year,
+             'platform_id': platform_id, 'score': round(float(score), 3)}
+            for game_id, title, release_year, platform_id, _, score in cursor.fetchall()
+        ]
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Dict]:
+        return self.index.complete(prefix, limit)
+
+    def find_duplicate(self, game_data: Dict) -> Optional[Tuple[int, str, Optional[int], Optional[int]]]:
+        """An indexed (game_id, title, platform_id, release_year) that is the same game.
+
+        Games match when their normalized titles are equal and platform and
+        release year agree, a missing value on either side matching anything.
+        """
+        wanted = (game_data.get('platform_id'), game_data.get('release_year'))
+        for match in self.index.same_title(game_data.get('title')):
+            if all(mine is None or theirs is None or mine == theirs
+                   for mine, theirs in zip(wanted, match[2:])):
+                return match
+        return None
+
+    def add(self, game_id: int, game_data: Dict):
+        self.add_many([(game_id, game_data)])
+
+    def add_many(self, games: Iterable[Tuple[int, Dict]]):
+        rows = [(game_id, game_data['title'], game_data.get('platform_id'), game_data.get('release_year'))
+                for game_id, game_data in games]
+        with self._lock:
+            if len(rows) == 1:
+                self.index.add(*rows[0])
+            else:
+                self.index.add_many(rows)
+            if self._replay is not None:
+                self._replay.extend(rows)
@@ -0,0 +1,223 @@
+import argparse
+import json
+import logging
+import os
+import resource
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import numpy as np
+import psycopg2
+from dotenv import load_dotenv
+from sklearn.ensemble import RandomForestRegressor
+
+from model_registry import ModelRegistry
+from sales_model import CategoryEncoder, SalesPredictor
+
+# Load environment variables
+load_dotenv()
+
+# Database connection configuration
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'database': os.getenv('DB_NAME', 'gamedb'),
+    'user': os.getenv('DB_USER', 'postgres'),
+    'password': os.getenv('DB_PASSWORD', 'postgres')
+}
+
+MODEL_REGISTRY_DIR = os.getenv('MODEL_REGISTRY_DIR', os.path.join(os.path.dirname(__file__), 'models', 'registry'))
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+TRAINING_QUERY = """
+SELECT
+    gn.GenreName,
+    p.PlatformName,
+    g.MetacriticScore,
+    g.GlobalSales
+FROM Games g
+JOIN Genres gn ON g.GenreID = gn.GenreID
+JOIN Platforms p ON g.PlatformID = p.PlatformID
+WHERE g.GlobalSales IS NOT NULL
+AND g.MetacriticScore IS NOT NULL
+"""
+
+
+def peak_memory_mb() -> float:
+    """Peak resident set size of this process in MiB"""
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class TrainingReport:
+    """Collects per-stage wall time and peak memory for a training run"""
+    def __init__(self):
+        self.stages = {}
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        yield
+        self.stages[name] = {
+            'seconds': round(time.perf_counter() - start, 3),
+            'peak_memory_mb': round(peak_memory_mb(), 1)
+        }
+        logger.info(f"{name}: {self.stages[name]['seconds']}s, peak RSS {self.stages[name]['peak_memory_mb']} MiB")
+
+    def as_dict(self) -> Dict:
+        return {
+            'stages': self.stages,
+            'total_seconds': round(time.perf_counter() - self.started, 3),
+            'peak_memory_mb': round(peak_memory_mb(), 1)
+        }
+
+
+class ModelTrainer:
+    """Trains the sales predictor from the Games table and publishes it to the registry"""
+    def __init__(self, chunk_size: int = 50000, n_estimators: int = 200, max_depth: Optional[int] = 16,
+                 max_samples: Optional[float] = None, n_jobs: int = -1, coverage: float = 0.9,
+                 holdout: float = 0.1, seed: int = 42):
+        self.conn = psycopg2.connect(**DB_CONFIG)
+        self.chunk_size = chunk_size
+        self.n_estimators = n_estimators
+        self.max_depth = max_depth
+        self.max_samples = max_samples
+        self.n_jobs = n_jobs
+        self.coverage = coverage
+        self.holdout = holdout
+        self.seed = seed
+        self.report = TrainingReport()
+
+    def __del__(self):
+        if hasattr(self, 'conn'):
+            self.conn.close()
+
+    def load_encoders(self) -> Dict[str, CategoryEncoder]:
+        """Build category encoders from the dimension tables, one query each"""
+        with self.conn.cursor() as cursor:
+            cursor.execute("SELECT GenreName FROM Genres ORDER BY GenreID")
+            genres = [row[0] for row in cursor.fetchall()]
+            cursor.execute("SELECT PlatformName FROM Platforms ORDER BY PlatformID")
+            platforms = [row[0] for row in cursor.fetchall()]
+        return {'genre': CategoryEncoder(genres), 'platform': CategoryEncoder(platforms)}
+
+    def load_training_data(self, encoders: Dict[str, CategoryEncoder]):
+        """Stream training rows in server-side cursor chunks into float arrays.
+
+        Each chunk is encoded as soon as it arrives, so memory holds the
+        compact float32 matrix rather than Python rows for the whole table.
+        """
+        features, targets = [], []
+        with self.conn.cursor(name='training_rows') as cursor:
+            cursor.itersize = self.chunk_size
+            cursor.execute(TRAINING_QUERY)
+            while True:
+                rows = cursor.fetchmany(self.chunk_size)
+                if not rows:
+                    break
+                columns = list(zip(*rows))
+                features.append(np.column_stack([
+                    encoders['genre'].transform(columns[0]),
+                    encoders['platform'].transform(columns[1]),
+                    np.asarray(columns[2], dtype=np.float32)
+                ]))
+                targets.append(np.asarray(columns[3], dtype=np.float32))
+        self.conn.rollback()
+        if not features:
+            raise ValueError("No scored games with sales to train on")
+        return np.concatenate(features), np.concatenate(targets)
+
+    def train(self, publish: bool = True, activate: bool = True) -> Dict:
+        """Run the full pipeline and return the report (with the new version)"""
+        with self.report.stage('load_encoders'):
+            encoders = self.load_encoders()
+        with self.report.stage('load_data'):
+            X, y = self.load_training_data(encoders)
+        logger.info(f"Training on {len(y)} games")
+
+        with self.report.stage('split'):
+            rng = np.random.default_rng(self.seed)
+            order = rng.permutation(len(y))
+            n_holdout = max(1, int(len(y) * self.holdout)) if len(y) > 1 else 0
+            calibration, training = order[:n_holdout], order[n_holdout:]
+
+        with self.report.stage('fit'):
+            regressor = RandomForestRegressor(
+                n_estimators=self.n_estimators,
+                max_depth=self.max_depth,
+                max_samples=self.max_samples,
+                n_jobs=self.n_jobs,
+                random_state=self.seed
+            )
+            regressor.fit(X[training], y[training])
+
+        with self.report.stage('calibrate'):
+            if n_holdout:
+                residuals = np.abs(y[calibration] - np.clip(regressor.predict(X[calibration]), 0, None))
+                residual_quantile = float(np.quantile(residuals, self.coverage))
+            else:
+                residual_quantile = 0.0
+            # Sequential predictions after the parallel fit
+            regressor.set_params(n_jobs=1)
+
+        predictor = SalesPredictor(regressor, encoders, residual_quantile, self.coverage)
+        report = {
+            'rows': int(len(y)),
+            'holdout_rows': int(n_holdout),
+            'coverage': self.coverage,
+            'residual_quantile': residual_quantile,
+            'params': {
+                'n_estimators': self.n_estimators,
+                'max_depth': self.max_depth,
+                'max_samples': self.max_samples,
+                'n_jobs': self.n_jobs
+            }
+        }
+        if publish:
+            with self.report.stage('publish'):
+                registry = ModelRegistry(MODEL_REGISTRY_DIR)
+                report['version'] = registry.publish(
+                    predictor,
+                    metadata={'training': {**report, 'timing': self.report.as_dict()}},
+                    activate=activate
+                )
+        report['timing'] = self.report.as_dict()
+        return report
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Train the sales predictor from the Games table")
+    parser.add_argument('--chunk-size', type=int, default=50000, help="Rows per server-side cursor fetch")
+    parser.add_argument('--n-estimators', type=int, default=200)
+    parser.add_argument('--max-depth', type=int, default=16)
+    parser.add_argument('--max-samples', type=float, default=None,
+                        help="Fraction of rows drawn per tree; lowers fit time on large tables")
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    parser.add_argument('--coverage', type=float, default=0.9, help="Prediction interval coverage")
+    parser.add_argument('--no-activate', action='store_true', help="Publish without making it the active model")
+    parser.add_argument('--report', help="Also write the timing/memory report to this JSON file")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    trainer = ModelTrainer(
+        chunk_size=args.chunk_size,
+        n_estimators=args.n_estimators,
+        max_depth=args.max_depth,
+        max_samples=args.max_samples,
+        n_jobs=args.n_jobs,
+        coverage=args.coverage
+    )
+    training_report = trainer.train(activate=not args.no_activate)
+    print(json.dumps(training_report, indent=2))
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(training_report, f, indent=2)